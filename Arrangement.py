@@ -0,0 +1,216 @@
+from math import floor, hypot
+from BentleyOttmann import intersectionsList
+
+class Arrangement(object):
+	'''
+	This class represents a set of segments along with the
+	intersections between them, which is kept up to date as segments
+	are added and removed, without sweeping the whole set again.
+
+	Segments are identified by their id, and indexed by x-range : the
+	x-axis is split into intervals of cell_size, and each segment is
+	recorded in the intervals its x-span covers. Adding a segment only
+	tests it against the segments sharing one of its intervals, and
+	removing a segment only visits the ones it intersects, so an edit
+	costs time depending on the density around the edited segment,
+	not on the size of the set.
+
+	By default, cell_size is the average length of the segments : it is
+	computed again, and the segments are bucketed again, when the
+	number of segments has doubled since the last bucketing and the
+	average length has drifted by more than a factor 2. A segment whose
+	x-span covers more than max_cells intervals is not bucketed, but
+	kept apart and tested against every added segment, so a segment
+	much longer than the others does not create a number of intervals
+	growing with its length.
+	'''
+
+	def __init__(self, segments=(), cell_size=None, max_cells=64):
+		'''
+		Initializes an arrangement of a list of ComparableSegments,
+		whose intersections are computed by intersectionsList.
+		'''
+		segments = list(segments)
+		self.cell_size = cell_size
+		self.max_cells = max_cells
+		# Whether cell_size was given, rather than following the
+		# average length of the segments
+		self._fixed = cell_size != None
+		# Total length of the segments
+		self._length = 0
+		# Number of segments at the last bucketing
+		self._bucketed = 0
+		# Segments, indexed by id
+		self.segments = {}
+		# Intersections of each segment, as dicts mapping the id of
+		# the other segment to the intersection, indexed by id
+		self.intersections = {}
+		# Segments whose x-span covers each interval, as dicts indexed
+		# by id, indexed by the number of the interval
+		self.cells = {}
+		# Segments covering more than max_cells intervals, indexed by id
+		self.long = {}
+		for seg in segments:
+			self._insert(seg)
+		if not self._fixed:
+			self._bucket()
+		for (seg, other), inter in intersectionsList(segments):
+			self._link(seg, other, inter)
+
+	def __len__(self):
+		'''
+		Returns the number of segments of the arrangement.
+		'''
+		return len(self.segments)
+
+	def __iter__(self):
+		'''
+		Iterates over the segments of the arrangement.
+		'''
+		return iter(self.segments.values())
+
+	def __contains__(self, seg):
+		'''
+		Returns true if and only if seg itself is in the arrangement.
+		'''
+		return id(seg) in self.segments
+
+	def add(self, seg):
+		'''
+		Adds seg to the arrangement, and returns the list of its
+		intersections with the other segments, as tuples
+		((seg, other), inter).
+		Raises a ValueError if seg is already in the arrangement.
+		'''
+		cells = self._cellRange(seg)
+		if cells == None:
+			candidates = dict(self.segments)
+		else:
+			candidates = dict(self.long)
+			for i in cells:
+				candidates.update(self.cells.get(i, {}))
+		self._insert(seg)
+		if (not self._fixed and len(self.segments) >= 2 * self._bucketed and
+			not self.cell_size / 2 <= self._average() <= 2 * self.cell_size):
+				self._bucket()
+		ymin, ymax = min(seg.y1, seg.y2), max(seg.y1, seg.y2)
+		res = []
+		for other in candidates.values():
+			# Skips segments whose bounding box does not meet seg's
+			if (other.x2 < seg.x1 or seg.x2 < other.x1 or
+				max(other.y1, other.y2) < ymin or min(other.y1, other.y2) > ymax):
+					continue
+			inter = seg.intersectionWith(other)
+			if inter != None:
+				self._link(seg, other, inter)
+				res.append(((seg, other), inter))
+		return res
+
+	def remove(self, seg):
+		'''
+		Removes seg from the arrangement, along with its intersections.
+		Raises a ValueError if seg is not in the arrangement.
+		'''
+		if id(seg) not in self.segments:
+			raise ValueError('{} is not in the arrangement'.format(seg))
+		for other in self.intersections.pop(id(seg)):
+			del self.intersections[other][id(seg)]
+		del self.segments[id(seg)]
+		self._length -= hypot(seg.x2 - seg.x1, seg.y2 - seg.y1)
+		if len(self.segments) == 0:
+			self._length = 0
+		self._unfile(seg)
+
+	def intersectionsOf(self, seg):
+		'''
+		Returns the list of the intersections of seg, which must be in
+		the arrangement, as tuples (other, inter).
+		'''
+		return [(self.segments[other], inter)
+				for other, inter in self.intersections[id(seg)].items()]
+
+	def intersectionsList(self):
+		'''
+		Returns the list of all the intersections between the segments
+		of the arrangement, as tuples ((seg, other), inter), each pair
+		of intersecting segments appearing once.
+		'''
+		return [((self.segments[s], self.segments[o]), inter)
+				for s, links in self.intersections.items()
+				for o, inter in links.items() if s < o]
+
+	def _insert(self, seg):
+		'''
+		Records seg, without any intersection.
+		'''
+		if id(seg) in self.segments:
+			raise ValueError('{} is already in the arrangement'.format(seg))
+		self.segments[id(seg)] = seg
+		self.intersections[id(seg)] = {}
+		self._length += hypot(seg.x2 - seg.x1, seg.y2 - seg.y1)
+		if self.cell_size != None:
+			self._file(seg)
+
+	def _file(self, seg):
+		'''
+		Records seg in the intervals its x-span covers, or apart if
+		there are more than max_cells of them.
+		'''
+		cells = self._cellRange(seg)
+		if cells == None:
+			self.long[id(seg)] = seg
+		else:
+			for i in cells:
+				self.cells.setdefault(i, {})[id(seg)] = seg
+
+	def _unfile(self, seg):
+		'''
+		Removes seg from the intervals it was recorded in.
+		'''
+		cells = self._cellRange(seg)
+		if cells == None:
+			del self.long[id(seg)]
+			return
+		for i in cells:
+			cell = self.cells[i]
+			del cell[id(seg)]
+			if len(cell) == 0:
+				del self.cells[i]
+
+	def _average(self):
+		'''
+		Returns the average length of the segments.
+		'''
+		return self._length / len(self.segments)
+
+	def _bucket(self):
+		'''
+		Records again all the segments in the intervals, after setting
+		cell_size to their average length unless it was given.
+		'''
+		if not self.segments:
+			return
+		if not self._fixed:
+			self.cell_size = self._average()
+		self.cells, self.long = {}, {}
+		for seg in self.segments.values():
+			self._file(seg)
+		self._bucketed = len(self.segments)
+
+	def _link(self, seg, other, inter):
+		'''
+		Records that seg and other intersect at inter.
+		'''
+		self.intersections[id(seg)][id(other)] = inter
+		self.intersections[id(other)][id(seg)] = inter
+
+	def _cellRange(self, seg):
+		'''
+		Returns the range of the numbers of the intervals covered by
+		seg's x-span, or None if there are more than max_cells of them.
+		'''
+		if self.cell_size == None:
+			self.cell_size = hypot(seg.x2 - seg.x1, seg.y2 - seg.y1)
+		cells = range(floor(seg.x1 / self.cell_size),
+					  floor(seg.x2 / self.cell_size) + 1)
+		return cells if len(cells) <= self.max_cells else None
@@ -1,23 +1,703 @@
+from array import array
 from Segment import Segment
 from ComparableSegment import ComparableSegment
 from Event import Event
 from EventQueue import EventQueue
 from SweepLine import SweepLine
+from VerticalSegments import VerticalSegments
+from SegmentArray import SegmentArray
+from GridIntersections import iterGridIntersections, preferGrid
 
-def intersectionsList(segments):
+def intersectionsList(segments, engine='sweep', stats=None, snap=None,
+					  sweep_line=None):
+	'''
+	Returns the list of all the intersections between segments, as
+	tuples ((seg, other), inter) where inter is either a point (x, y)
+	or a Segment.
+
+	segments can either be a list of ComparableSegments, or a
+	SegmentArray, in which case seg and other are replaced by their
+	indices in the SegmentArray. The sweep then reads the rows of the
+	SegmentArray as it reaches them, and only holds ComparableSegments
+	for the rows which the sweep line crosses (see EventQueue).
+
+	engine selects the algorithm computing the intersections :
+	- 'sweep' : the Bentley-Ottmann sweep, the default
+	- 'grid' : a uniform grid, see GridIntersections
+	- 'parallel' : the sweep, split over several processes, see 
+	ParallelSweep
+	- 'auto' : the grid for many short segments, the sweep otherwise,
+	see GridIntersections.preferGrid
+
+	stats is either None, or a SweepStats collecting statistics about
+	the run. Statistics are only collected by the sweep, which is then
+	used by engine='auto'.
+
+	snap is either None, or the size of the pixels of a grid to which
+	the sweep snaps segments and intersections (see _sweep), which is
+	then used by engine='auto'.
+
+	sweep_line is either None, or the class of the sweep line of the
+	sweep : SweepLine (the default), SkipListSweepLine, or any class
+	with the same interface. The sweep is then used by engine='auto'.
+	'''
+	return list(iterIntersections(segments, engine, stats, snap, sweep_line))
+
+def iterIntersections(segments, engine='sweep', stats=None, snap=None,
+					  sweep_line=None):
+	'''
+	Generator version of intersectionsList : yields the same tuples
+	((seg, other), inter), each of them as soon as the event which
+	discovers it has been processed, instead of collecting them in a
+	list.
+
+	Note that the sweep relies on ComparableSegment.currentX, so two
+	of these generators must not be consumed in an interleaved way.
+	'''
+	if isinstance(segments, SegmentArray):
+		for (seg, other), inter in _run(segments, engine, stats, snap, sweep_line):
+			yield ((seg.row, other.row), inter)
+	else:
+		yield from _run(segments, engine, stats, snap, sweep_line)
+
+def _run(segments, engine, stats=None, snap=None, sweep_line=None):
+	'''
+	Returns an iterator over the intersections of segments, computed 
+	by the given engine. segments is either a SegmentArray, whose rows
+	are then reported as RowSegments, or an iterable of
+	ComparableSegments.
+	'''
+	segments = _rowsOrList(segments)
+	if engine == 'auto':
+		engine = _autoEngine(segments, stats, snap, sweep_line)
+	if stats != None and engine != 'sweep':
+		raise ValueError('Statistics are only collected by the sweep')
+	if snap != None and engine != 'sweep':
+		raise ValueError('Only the sweep snaps intersections')
+	if sweep_line != None and engine != 'sweep':
+		raise ValueError('Only the sweep uses a sweep line')
+	if engine == 'sweep':
+		return _iterSweep(segments, stats, snap, sweep_line)
+	segments = _segmentList(segments)
+	if engine == 'grid':
+		return iterGridIntersections(segments)
+	elif engine == 'parallel':
+		from ParallelSweep import parallelIntersectionsList
+		return iter(parallelIntersectionsList(segments))
+	else:
+		raise ValueError('Unknown engine {}'.format(engine))
+
+def _rowsOrList(segments):
+	'''
+	Returns segments if it is a SegmentArray, or the list of its
+	elements otherwise.
+	'''
+	if isinstance(segments, SegmentArray):
+		return segments
+	return list(segments)
+
+def _segmentList(segments):
+	'''
+	Returns the list of the RowSegments of the rows of segments if it
+	is a SegmentArray, or the list of its elements otherwise.
+	'''
+	if isinstance(segments, SegmentArray):
+		return [segments.rowSegment(i) for i in range(len(segments))]
+	return list(segments)
+
+def _indexer(segments):
+	'''
+	Returns a function returning the index in segments (a SegmentArray
+	or a list) of the segments reported by the engines.
+	'''
+	if isinstance(segments, SegmentArray):
+		return lambda seg: seg.row
+	position = {id(s): i for i, s in enumerate(segments)}
+	return lambda seg: position[id(seg)]
+
+def _autoEngine(segments, stats=None, snap=None, sweep_line=None):
+	'''
+	Returns the name of the engine picked by engine='auto' for a list
+	of segments.
+	'''
+	if stats != None or snap != None or sweep_line != None:
+		return 'sweep'
+	return 'grid' if preferGrid(segments) else 'sweep'
+
+def countIntersections(segments, per_segment=False, engine='sweep', stats=None,
+					   snap=None, sweep_line=None):
+	'''
+	Returns the number of intersections between segments, i.e. the
+	length of intersectionsList(segments, engine), or if per_segment is
+	true, an array whose i-th element is the number of intersections
+	the i-th segment is involved in.
+
+	With the sweep, intersections only increment counters, so memory
+	does not depend on the number of intersections.
+
+	segments can either be a list of ComparableSegments, or a
+	SegmentArray. stats, snap and sweep_line are as for
+	intersectionsList.
+	'''
+	segments = _rowsOrList(segments)
+	if engine == 'auto':
+		engine = _autoEngine(segments, stats, snap, sweep_line)
+	if per_segment:
+		position = _indexer(segments)
+		counts = array('q', [0]) * len(segments)
+		def report(seg, other, inter):
+			counts[position(seg)] += 1
+			counts[position(other)] += 1
+	else:
+		counts = array('q', [0])
+		def report(seg, other, inter):
+			counts[0] += 1
+	if engine == 'sweep':
+		for _ in _sweep(segments, report, stats=stats, snap=snap,
+						sweep_line=sweep_line):
+			pass
+	else:
+		for (seg, other), inter in _run(segments, engine, stats, snap, sweep_line):
+			report(seg, other, inter)
+	return counts if per_segment else counts[0]
+
+# Kinds of the rows of intersectionsArray
+POINT, OVERLAP = 0, 1
+
+def intersectionsArray(segments, engine='sweep', stats=None, snap=None,
+					   sweep_line=None):
+	'''
+	Returns the intersections between segments as a NumPy structured
+	array, with a row per intersection of intersectionsList, in the
+	same order, and fields :
+	- i, j : indices of the segments in segments (int64)
+	- kind : POINT or OVERLAP (uint8)
+	- x, y : the intersection point, or the first endpoint of the
+	overlap (float64)
+	- x2, y2 : the second endpoint of the overlap, NaN for points
+	(float64)
+
+	This costs 49 bytes per intersection, where intersectionsList
+	allocates a few Python objects. Rows are appended to typed arrays
+	as the intersections are found, and only gathered in the NumPy
+	array at the end.
+
+	segments can either be a list of ComparableSegments, or a
+	SegmentArray. engine, stats, snap and sweep_line are as for
+	intersectionsList.
+	'''
+	import numpy as np
+	segments = _rowsOrList(segments)
+	position = _indexer(segments)
+	i, j, kind = array('q'), array('q'), array('B')
+	x, y, x2, y2 = array('d'), array('d'), array('d'), array('d')
+	nan = float('nan')
+	def report(seg, other, inter):
+		i.append(position(seg))
+		j.append(position(other))
+		if isinstance(inter, Segment):
+			kind.append(OVERLAP)
+			x.append(inter.x1)
+			y.append(inter.y1)
+			x2.append(inter.x2)
+			y2.append(inter.y2)
+		else:
+			kind.append(POINT)
+			x.append(inter[0])
+			y.append(inter[1])
+			x2.append(nan)
+			y2.append(nan)
+	if engine == 'auto':
+		engine = _autoEngine(segments, stats, snap, sweep_line)
+	if engine == 'sweep':
+		for _ in _sweep(segments, report, stats=stats, snap=snap,
+						sweep_line=sweep_line):
+			pass
+	else:
+		for (seg, other), inter in _run(segments, engine, stats, snap, sweep_line):
+			report(seg, other, inter)
+	columns = (('i', i), ('j', j), ('kind', kind), ('x', x), ('y', y),
+			   ('x2', x2), ('y2', y2))
+	res = np.empty(len(i), dtype=[(name, c.typecode) for name, c in columns])
+	for name, c in columns:
+		res[name] = np.frombuffer(c, dtype=c.typecode)
+	return res
+
+def intersectionsBetween(red, blue):
+	'''
+	Returns the list of the intersections between a segment of red and
+	a segment of blue, as tuples ((r, b), inter), r being a segment of
+	red and b a segment of blue. Intersections between 2 segments of
+	red, or 2 segments of blue, are not reported.
+
+	red and blue can either be lists of ComparableSegments, or
+	SegmentArrays, in which case r (resp. b) is replaced by its index
+	in red (resp. blue).
+	'''
+	layers = (list(red), list(blue))
+	colour = {}
+	for tag, layer in enumerate(layers):
+		for s in layer:
+			colour[id(s)] = tag
+	if len(colour) != len(layers[0]) + len(layers[1]):
+		raise ValueError('Segments must be distinct objects, and cannot be both red and blue')
+	res = []
+	def report(seg, other, inter):
+		if colour[id(seg)] == 1:
+			seg, other = other, seg
+		res.append(((seg, other), inter))
+	for _ in _sweep(layers[0] + layers[1], report, colour):
+		pass
+	for tag, layer in enumerate((red, blue)):
+		if isinstance(layer, SegmentArray):
+			index = {id(s): i for i, s in enumerate(layers[tag])}
+			for k, (pair, inter) in enumerate(res):
+				pair = list(pair)
+				pair[tag] = index[id(pair[tag])]
+				res[k] = (tuple(pair), inter)
+	return res
+
+def hasIntersection(segments, ignore_shared_endpoints=True, sweep_line=None):
+	'''
+	Returns the first intersection found between segments, as a tuple
+	((seg, other), inter) like those of intersectionsList, or None if
+	no segments intersect. This answers whether a polygon ring or a
+	polyline is simple.
+
+	If ignore_shared_endpoints is true, 2 segments which only touch at
+	an endpoint of both, such as consecutive edges of a polygon, are
+	not considered to intersect. They still do if they overlap.
+
+	segments can either be a list of ComparableSegments, or a
+	SegmentArray, in which case seg and other are replaced by their
+	indices in the SegmentArray.
+
+	This is the Shamos-Hoey sweep : segments are only tested against
+	their neighbours in the sweep line, and no crossing is ever
+	scheduled, so it runs in O(N*log(N)) and stops at the first
+	intersection.
+
+	sweep_line is either None, or the class of the sweep line, as for
+	intersectionsList.
+	'''
+	found = _firstIntersection(_rowsOrList(segments), ignore_shared_endpoints,
+							   sweep_line)
+	if found != None and isinstance(segments, SegmentArray):
+		(seg, other), inter = found
+		found = ((seg.row, other.row), inter)
+	return found
+
+def _firstIntersection(segments, ignore_shared_endpoints, sweep_line=None):
+	'''
+	Runs the Shamos-Hoey sweep of hasIntersection over a list of
+	ComparableSegments, or a SegmentArray, sweep_line being None or the
+	class of the sweep line.
+	'''
+	rounding = segments[0].rounding if segments else 0
+	tolerance = lambda x, y: rounding*max(abs(x), abs(y), 1)
+
+	def conflict(seg, other):
+		'''
+		Returns the intersection of seg and other, or None if it is
+		empty or ignored.
+		'''
+		if seg == None or other == None:
+			return None
+		inter = seg.intersectionWith(other)
+		if inter == None or not ignore_shared_endpoints:
+			return inter
+		# Segments sharing an endpoint only meet there, unless they
+		# overlap, i.e. they are collinear and go the same way from it.
+		seg_ends = ((seg.x1, seg.y1), (seg.x2, seg.y2))
+		other_ends = ((other.x1, other.y1), (other.x2, other.y2))
+		shared = [(i, j) for i in range(2) for j in range(2)
+				  if seg_ends[i] == other_ends[j]]
+		if shared == []:
+			return inter
+		if isinstance(inter, Segment):
+			for i, j in shared:
+				(px, py), (ax, ay) = seg_ends[i], seg_ends[1 - i]
+				bx, by = other_ends[1 - j]
+				if (ax - px)*(bx - px) + (ay - py)*(by - py) > 0:
+					return inter
+		return None
 
-	# Initializes sorted event queue 
 	event_queue = EventQueue(segments)
+	sweep_line = (sweep_line or SweepLine)()
+	vertical_segments = VerticalSegments()
+
+	while not event_queue.isEmpty():
+		event = event_queue.nextEvent()
+		x, y = event.x, event.y
+		pairs = []
+
+		# Endpoints may lie on vertical segments
+		for seg in event.right + event.left:
+			pairs.extend((seg, v) for v in vertical_segments.overlapping(x, y, y))
+
+		# Segments ending at the event are removed, and their neighbours
+		# become adjacent.
+		for seg in event.right:
+			sweep_line.removeSegment(seg)
+		if event.right != []:
+			pairs.append(sweep_line.segmentsAround(y, x))
+			if event.left != []:
+				pairs.append((event.right[0], event.left[0]))
+
+		# Segments starting at the event are inserted, and tested
+		# against their neighbours.
+		for seg in event.left:
+			seg.pin(x, y)
+			sweep_line.addSegment(seg, x)
+		for seg in event.left:
+			pairs.append((seg, sweep_line.segmentBelow(seg)))
+			pairs.append((seg, sweep_line.segmentAbove(seg)))
+
+		# Vertical segments are tested against all the segments they
+		# meet, which intersect them unless they only share an endpoint.
+		for seg in event.low:
+			y_inf = seg.y1 - tolerance(seg.x1, seg.y1)
+			y_sup = seg.y2 + tolerance(seg.x2, seg.y2)
+			for others in (sweep_line.betweenY(y_inf, y_sup, x), event.right,
+						   vertical_segments.overlapping(x, y_inf, y_sup)):
+				pairs.extend((seg, other) for other in others)
+			vertical_segments.add(seg)
+
+		for seg, other in pairs:
+			inter = conflict(seg, other)
+			if inter != None:
+				return ((seg, other), inter)
+
+		for seg in event.high:
+			vertical_segments.remove(seg)
+	return None
+
+def _iterSweep(segments, stats=None, snap=None, sweep_line=None):
+	'''
+	Runs the Bentley-Ottmann sweep over a list of ComparableSegments,
+	or a SegmentArray, and yields the intersections found by each event
+	once it has been processed.
+	'''
+	found = []
+	def report(seg, other, inter):
+		found.append(((seg, other), inter))
+	for _ in _sweep(segments, report, stats=stats, snap=snap,
+					sweep_line=sweep_line):
+		yield from found
+		found.clear()
+
+def _sweep(segments, report, colour=None, stats=None, snap=None,
+		   sweep_line=None):
+	'''
+	Runs the Bentley-Ottmann sweep over a list of ComparableSegments,
+	calling report(seg, other, inter) for each intersection found.
+	This is a generator, which yields once each event is processed.
+
+	segments can also be a SegmentArray, in which case seg and other
+	are the RowSegments of its rows.
+
+	colour is either None, or a dict mapping the id of each segment to
+	its colour, in which case only intersections between segments of
+	different colours are reported. Intersections between segments of
+	the same colour are then only computed when the sweep line needs
+	them, i.e. to schedule their crossing.
+
+	stats is either None, or a SweepStats observing the sweep. When it
+	is None, the sweep runs uninstrumented. Otherwise, the sweep runs
+	over counting copies of the segments (see SweepStats.counted),
+	created all at once, even for the rows of a SegmentArray.
+
+	snap is either None, or the size of the pixels of a grid whose
+	centers are the points (k*snap, l*snap), k and l being integers.
+	The sweep then runs in tolerance mode : the endpoints of segments
+	are snapped to the centers of their pixels, so that all the
+	endpoints in a pixel share a single event, and intersections are
+	reported at the centers of their pixels, with the original
+	segments. Segments whose endpoints are in the same pixel are
+	ignored.
+
+	Crossings are merged by hot pixel : the crossings found in a pixel
+	before the sweep reaches it share a single event, at the middle of
+	its left side, or at its center once the sweep went past it (see
+	EventQueue.crossingPoint). At this event, the segments going
+	through the pixel are rerouted through it, as in snap rounding :
+	they continue from the event, and all the pairs of them are
+	reported. Noisy lines crossing near a single point thus make one
+	event per pixel of their crossings, and near misses in a pixel
+	become intersections. Rerouted segments are moved by at most about
+	a pixel at each hot pixel they go through, so intersections are
+	those of the snapped segments up to these moves.
+
+	sweep_line is either None, or the class of the sweep line, which
+	is SweepLine by default.
+	'''
+	segments = _rowsOrList(segments)
+	if snap != None:
+		if not snap > 0:
+			raise ValueError('Invalid pixel size {}'.format(snap))
+		segments, report, colour = _snapSegments(_segmentList(segments),
+												 report, colour, snap)
+	if stats == None:
+		yield from _sweepEvents(segments, report, colour, None, sweep_line, snap)
+		return
+	# The sweep runs over copies of the segments counting their
+	# comparisons and intersection tests, reported with the segments
+	segments, original = stats.counted(_segmentList(segments))
+	if colour != None:
+		colour = {id(s): colour[id(original[id(s)])] for s in segments}
+	def counted(seg, other, inter):
+		stats.intersections += 1
+		report(original[id(seg)], original[id(other)], inter)
+	stats.start()
+	try:
+		yield from _sweepEvents(segments, counted, colour, stats, sweep_line,
+								snap)
+	finally:
+		stats.stop()
+
+def _snapPoint(x, y, snap):
+	'''
+	Returns the center of the pixel of size snap containing (x, y).
+	'''
+	return (round(x / snap) * snap, round(y / snap) * snap)
+
+def _snapSegments(segments, report, colour, snap):
+	'''
+	Returns the segments snapped to the grid of pixels of size snap,
+	and the report function and colours to sweep them with, so that
+	report is called with the original segments and with intersections
+	snapped to the centers of their pixels.
+	'''
+	snapped, original = [], {}
+	for seg in segments:
+		first = _snapPoint(seg.x1, seg.y1, snap)
+		second = _snapPoint(seg.x2, seg.y2, snap)
+		if first != second:
+			s = type(seg)(*first, *second)
+			original[id(s)] = seg
+			snapped.append(s)
+	if colour != None:
+		colour = {id(s): colour[id(original[id(s)])] for s in snapped}
+	def snappedReport(seg, other, inter):
+		if isinstance(inter, Segment):
+			first = _snapPoint(inter.x1, inter.y1, snap)
+			second = _snapPoint(inter.x2, inter.y2, snap)
+			inter = first if first == second else Segment(*first, *second)
+		else:
+			inter = _snapPoint(inter[0], inter[1], snap)
+		report(original[id(seg)], original[id(other)], inter)
+	return snapped, snappedReport, colour
+
+def _sweepEvents(segments, report, colour, stats, sweep_line, snap=None):
+	'''
+	Main loop of _sweep, stats being None or a started SweepStats,
+	sweep_line None or the class of the sweep line, and snap None or
+	the size of the pixels to which the segments were snapped.
+	'''
+	if snap != None:
+		# Segments rerouted through hot pixels are replaced in the sweep
+		# line by fragments (see reroute), reported as their segments.
+		# Rerouted segments may meet more than once, but each pair is
+		# only reported the first time, the ids of the reported pairs
+		# being kept in met.
+		root, met = {}, set()
+		segmentOf = lambda s: root.get(id(s), s)
+		reportSegments = report
+		def report(seg, other, inter):
+			seg, other = segmentOf(seg), segmentOf(other)
+			pair = (id(seg), id(other)) if id(seg) < id(other) else (id(other), id(seg))
+			if pair not in met:
+				met.add(pair)
+				reportSegments(seg, other, inter)
+	if colour == None:
+		mixed = lambda seg, other: True
+	elif snap != None:
+		mixed = lambda seg, other: (colour[id(segmentOf(seg))] !=
+									colour[id(segmentOf(other))])
+	else:
+		mixed = lambda seg, other: colour[id(seg)] != colour[id(other)]
+
+	# Segments whose y-coordinate at the x-coordinate of a point is this
+	# close to the point's are considered to go through it
+	rounding = segments[0].rounding if segments else 0
+	tolerance = lambda x, y: rounding*max(abs(x), abs(y), 1)
+
+	# Initializes sorted event queue 
+	event_queue = EventQueue(segments, snap)
 	# Initializes empty sweep line
-	sweep_line = SweepLine()
-	# Initializes empty output intersection list
-	intersections = []
-	# Initializes empty list of vertical segments being swept
-	vertical_segments = []
+	sweep_line = (sweep_line or SweepLine)()
+	# Initializes empty set of vertical segments being swept
+	vertical_segments = VerticalSegments()
+	# Collinear runs : sets of ids of segments with the same gradient,
+	# each pair of which was examined, indexed by the ids of their
+	# segments. A segment leaves its run at its right endpoint.
+	runs = {}
+	# Ids of the segments with the same gradient as a segment, examined
+	# with it outside of a run, indexed by its id. A segment's entries
+	# are dropped once it leaves the sweep line, as its pairs can no
+	# longer be adjacent.
+	overlapping = {}
 
+	def reportOverlap(seg, other, record=True):
+		'''
+		Reports the intersection of 2 segments with the same gradient,
+		unless they were already examined. It is either an overlap, or a
+		single point when rounding errors make them barely collinear.
+		If record is true, the pair is recorded in overlapping.
+		'''
+		if (id(other) in runs.get(id(seg), ()) or
+			id(other) in overlapping.get(id(seg), ())):
+				return
+		inter = seg.intersectionWith(other)
+		if inter != None and record:
+			overlapping.setdefault(id(seg), set()).add(id(other))
+			overlapping.setdefault(id(other), set()).add(id(seg))
+		if inter != None and mixed(seg, other):
+			report(seg, other, inter)
+
+	def reportCollinear(group):
+		'''
+		Reports the intersections between the segments of group, which
+		have the same gradient and go through the event, examining only
+		the pairs of segments from different runs. The runs which are
+		entirely in group are then merged in a single run, with the
+		segments of group without run, so that each pair of collinear
+		segments is examined once, whatever the number of events they
+		go through together.
+		'''
+		buckets = {}
+		for seg in group:
+			run = runs.get(id(seg))
+			buckets.setdefault(id(seg) if run == None else id(run), []).append(seg)
+		buckets = list(buckets.values())
+		complete = [runs.get(id(b[0])) == None or len(runs[id(b[0])]) == len(b)
+					for b in buckets]
+		for a in range(len(buckets)):
+			for b in range(a + 1, len(buckets)):
+				record = not (complete[a] and complete[b])
+				for seg in buckets[a]:
+					for other in buckets[b]:
+						reportOverlap(seg, other, record)
+		merged = [b for b, c in zip(buckets, complete) if c]
+		if len(merged) < 2:
+			return
+		largest = max(merged, key=len)
+		run = runs.get(id(largest[0]))
+		if run == None:
+			run = set()
+		for b in merged:
+			if b is largest and len(run) > 0:
+				continue
+			for seg in b:
+				run.add(id(seg))
+				runs[id(seg)] = run
+
+	def forgetOverlaps(seg):
+		'''
+		Removes seg from its run, and drops its pairs from overlapping,
+		seg having left the sweep line.
+		'''
+		runs.pop(id(seg), set()).discard(id(seg))
+		for other in overlapping.pop(id(seg), ()):
+			others = overlapping[other]
+			others.discard(id(seg))
+			if not others:
+				del overlapping[other]
+
+	def crossing(seg, other):
+		'''
+		Returns the point where seg and other cross, seg being just 
+		below other in the sweep line, if they converge (i.e. if they
+		may cross after the sweep line), None otherwise.
+		'''
+		if seg == None or other == None or seg.gradient() <= other.gradient():
+			return None
+		inter = seg.intersectionWith(other)
+		if inter == None:
+			return None
+		# If a right endpoint lies on the other segment, it is the
+		# crossing, which must be found only once at this endpoint.
+		for s, t in ((seg, other), (other, seg)):
+			y = t.yAtX(s.x2)
+			if y != None and abs(y - s.y2) <= tolerance(s.x2, s.y2):
+				inter = (s.x2, s.y2)
+		# The crossing must also be reached while both segments are in
+		# the sweep line, i.e. at the latest at their right endpoints.
+		return min(inter, (seg.x2, seg.y2), (other.x2, other.y2))
+
+	def reroute(seg, x, y):
+		'''
+		Returns the fragment of seg after the hot pixel of center (x, y),
+		i.e. the segment from (x, y) to the right endpoint of seg, which
+		replaces seg in the sweep, or seg itself if it goes through
+		(x, y) up to rounding errors, or ends in the column of the pixel.
+		'''
+		if seg.x2 <= x or abs(seg.yAtX(x) - y) <= tolerance(x, y):
+			return seg
+		fragment = type(seg)(x, y, seg.x2, seg.y2)
+		root[id(fragment)] = root.pop(id(seg), seg)
+		event_queue.replaceSegment(seg, fragment)
+		forgetOverlaps(seg)
+		return fragment
+
+	def entering(y, h, x_sup, known):
+		'''
+		Returns the segments of the sweep line, outside known, which are
+		just below or above the hot pixel [y - h, y + h] at
+		ComparableSegment.currentX, and enter it before x_sup : they
+		are rerouted with the segments going through it.
+		'''
+		def enters(seg):
+			if seg.x2 <= x:
+				return False
+			ends = (seg.currentY(), seg.yAtX(min(seg.x2, x_sup)))
+			return min(ends) <= y + h and max(ends) >= y - h
+		res = []
+		x = ComparableSegment.currentX
+		seg = sweep_line.segmentsAround(y - h, x)[0]
+		while seg != None and (id(seg) in known or enters(seg)):
+			if id(seg) not in known:
+				res.append(seg)
+			seg = sweep_line.segmentBelow(seg)
+		seg = sweep_line.segmentsAround(y + h, x)[1]
+		while seg != None and seg.currentY() <= y + h:
+			seg = sweep_line.segmentAbove(seg)
+		while seg != None and (id(seg) in known or enters(seg)):
+			if id(seg) not in known:
+				res.append(seg)
+			seg = sweep_line.segmentAbove(seg)
+		return res
+
+	def schedule(seg, other, inter, point):
+		'''
+		Handles 2 segments which just became adjacent in the sweep line
+		after the event at point, seg being just below other, and inter
+		being crossing(seg, other).
+		'''
+		if inter != None:
+			event_queue.addCrossing(seg, other, inter[0], inter[1])
+		elif seg == None or other == None:
+			return
+		elif seg.gradient() == other.gradient():
+			reportOverlap(seg, other)
+		elif (seg.x1, seg.y1) == point or (other.x1, other.y1) == point:
+			# A left endpoint which lies on a segment, but was not found
+			# in the sweep line because of rounding errors
+			inter = seg.intersectionWith(other)
+			if inter != None and mixed(seg, other):
+				report(seg, other, inter)
 
 	while not event_queue.isEmpty():
 		event = event_queue.nextEvent()
+		point = (event.x, event.y)
+		# In snap mode, the intersections found at the event of a hot
+		# pixel are reported at its center
+		center = event_queue.hotPixel(event.x, event.y)
+		hot = center != None
+		at = center if hot else point
+		if stats != None:
+			stats.lap('queue')
+			stats.startEvent(event)
 
 		################## Handles vertical low endpoints ################
 		# It this event contains a vertical low endpoints, the 
@@ -31,141 +711,203 @@ def intersectionsList(segments):
 		# 
 		for seg in event.low:
 			# Computes intersections
-			for other in (vertical_segments +
-						  sweep_line.betweenY(seg.y1, seg.y2, seg.x1)):
-				inter = seg.intersectionWith(other)
-				if inter != None:
-					intersections.append(((seg, other), inter))
-					#print("appened inter 1")
+			y_inf = seg.y1 - tolerance(seg.x1, seg.y1)
+			y_sup = seg.y2 + tolerance(seg.x2, seg.y2)
+			for others in (vertical_segments.overlapping(seg.x1, y_inf, y_sup),
+						   sweep_line.betweenY(y_inf, y_sup, seg.x1)):
+				for other in others:
+					if not mixed(seg, other):
+						continue
+					inter = seg.intersectionWith(other)
+					if inter != None:
+						report(seg, other, inter)
 			# adds to vertical lines
-			vertical_segments.append(seg)
-
-		#################### Handles right endpoints #####################
-		# It this event contains right endpoints, the corresponding 
-		# segments must be removed from the sweep line.
-		# These segments intersects with :
-		# - all segments in vertical_segments (dealt with while adding them)
-		# - all segments in event.left
-		# - all segments in event.inner_inter
-		# - each other 
+			vertical_segments.add(seg)
+		if stats != None:
+			stats.lap('vertical')
+
+		############ Finds segments passing through the event ############
+		# The non vertical segments containing the event are :
+		# - the segments in event.right
+		# - the segments in event.inner_inter, whose crossing was
+		# scheduled at this event
+		# - the segments of the sweep line whose y-coordinate at event.x
+		# is event.y up to rounding errors, but which were not known to
+		# contain the event, e.g. when a left endpoint lies on them
+		# - the segments in event.left
 		#
-		for i in range(len(event.right)):
-			seg = event.right[i]
-			# Adds intersections
-			for other in event.left:
-				intersections.append(((seg, other), (event.x, event.y)))
-				#print("appened inter 2")
-			for j in range(i+1, len(event.right)):
-				other = event.right[j]
-				intersections.append(((seg, other), (event.x, event.y)))
-				#print("appened inter 3")
-			for other in event.inner_inter:
-				intersections.append(((seg, other), (event.x, event.y)))
-				#print("appened inter 4")
-			# removes it to the sweep line
-			sweep_line.removeSegment(seg)
-		
-		# ############## Handles non vertical intersections ###############
-		# It this event contains inner intersection points, the order of
-		# the corresponding segments in the sweep line but me reversed
-		# (to express the crossing of the segments)
+		# At a hot pixel, the segments going through the pixel, and the
+		# segments of event.inner_inter, are rerouted through its center :
+		# they continue after the event as fragments (see reroute), which
+		# replace them in passing and containing, passing still being
+		# ordered as the segments in the sweep line. A segment of
+		# event.inner_inter outside the pixel (a steep one) jumps to it
+		# along the column, meeting the segments in between where they
+		# are, and its neighbours become adjacent once it is removed :
+		# they are kept in gaps.
+		known = set(map(id, event.right))
+		known.update(map(id, event.inner_inter))
+		h = snap / 2 if hot else tolerance(event.x, event.y)
+		through = [s for s in sweep_line.betweenY(event.y - h, event.y + h, event.x)
+				   if id(s) not in known and (not hot or s.x2 > event.x)]
+		if hot:
+			through += entering(event.y, h, center[0] + h, known)
+		passing = sweep_line.order(event.right + event.inner_inter + through)
+		removed = passing
+		gaps = []
+		if hot:
+			ComparableSegment.currentX = event.x
+			ids = set(map(id, passing))
+			jumpers = [s for s in event.inner_inter if abs(s.currentY() - event.y) > h]
+			for seg in jumpers:
+				up = seg.currentY() < event.y
+				step = sweep_line.segmentAbove if up else sweep_line.segmentBelow
+				other = step(seg)
+				while other != None and (other.currentY() < event.y - h if up
+										 else other.currentY() > event.y + h):
+					if id(other) not in ids and mixed(seg, other):
+						report(seg, other, (at[0], other.currentY()))
+					other = step(other)
+			for seg in (passing if jumpers != [] else []):
+				below = sweep_line.segmentBelow(seg)
+				if below == None or id(below) not in ids:
+					above = sweep_line.segmentAbove(seg)
+					while above != None and id(above) in ids:
+						above = sweep_line.segmentAbove(above)
+					gaps.append((below, above))
+			fragments = {id(s): reroute(s, event.x, event.y)
+						 for s in event.inner_inter + through}
+			passing = [fragments.get(id(s), s) for s in passing]
+			through = [fragments[id(s)] for s in through]
+			event.inner_inter[:] = [fragments[id(s)] for s in event.inner_inter]
+		containing = passing + event.left
+
+		# Each pair of them intersects at the event, unless they have the 
+		# same gradient, in which case they are collinear and may
+		# overlap : they are grouped by gradient, so that pairs of
+		# collinear segments are only examined once (see
+		# reportCollinear).
+		# Segments of passing, which are ordered as in the sweep line,
+		# cross at the event if they converge. Otherwise, rounding errors
+		# made them cross just before the event, and they were reported
+		# then. At a hot pixel, they all meet in the pixel.
+		groups = {}
+		for seg in containing:
+			groups.setdefault(seg.gradient(), []).append(seg)
+		groups = list(groups.values())
+		for group in groups:
+			if len(group) > 1:
+				reportCollinear(group)
+		if len(groups) > 1:
+			position = {id(s): i for i, s in enumerate(containing)}
+			pairs = []
+			for g in range(len(groups)):
+				for other_group in groups[g + 1:]:
+					for s in groups[g]:
+						for t in other_group:
+							i, j = position[id(s)], position[id(t)]
+							pairs.append((i, j) if i < j else (j, i))
+			pairs.sort()
+			for i, j in pairs:
+				seg, other = containing[i], containing[j]
+				if not hot and j < len(passing) and seg.gradient() < other.gradient():
+					continue
+				if mixed(seg, other):
+					report(seg, other, at)
+
+		# Left endpoints also intersect with the segments of
+		# vertical_segments going through the event, as do the segments
+		# rerouted through a hot pixel.
+		for seg in (event.left + event.inner_inter + through if hot else event.left):
+			for other in vertical_segments.overlapping(event.x, event.y, event.y):
+				if mixed(seg, other):
+					report(seg, other, at)
+		if stats != None:
+			stats.lap('report')
+
+		##################### Updates the sweep line #####################
+		# The segments passing through the event are removed from the
+		# sweep line, and those which continue after it are inserted back
+		# with new left endpoints. As they all are at event.y at event.x,
+		# they are inserted ordered by gradient, which is their order
+		# just after the event.
 		# 
-		# Also these segments intersects with :
-		# - all segments in vertical_segments (dealt with while adding them)
-		# - all segments in event.right (dealt with when removing them)
-		# - all segments in event.left
-		# - each other 
-		for i in range(len(event.inner_inter)):
-			seg = event.inner_inter[i]
-			for other in event.left:
-				inter = seg.intersectionWith(other)
-				if inter != None:
-					intersections.append(((seg, other), inter))
-					#print("appened inter 5")
-			for j in range(i+1, len(event.inner_inter)):
-				other = event.inner_inter[j]
-				intersections.append(((seg, other), (event.x, event.y)))
-				#print("appened inter 6")
-
-		# Inverses the order of intersections segments in the sweep line
-		if event.inner_inter != []:
-			sweep_line.revertOrder(event.x, event.inner_inter)
-		
-		# #################### Handles left endpoints #####################
-		# It this event contains left endpoints, the corresponding 
-		# segments must be added to the sweep line.
-		# These segments intersects with :
-		# - all segments in vertical_segments
-		# - all segments in event.right (already delt with)
-		# - all segments in event.inner_inter (already delt with)
-		# - each other
-		#
-		for i in range(len(event.left)):
-			seg = event.left[i]
-			# Adds it to the sweep line
-			sweep_line.addSegment(seg)
-			# Adds sure intersections
-			for other in vertical_segments:
-				intersections.append(((seg, other), (seg.x1, seg.y1)))
-				#print("appened inter 7")
-			for j in range(i+1, len(event.left)):
-				other = event.left[j]
-				inter = seg.intersectionWith(other)
-				if inter != None:
-					intersections.append(((seg, other), inter))
-					#print("appened inter 8")
-			
-		
+		# The crossings scheduled for pairs of segments which stop being
+		# adjacent are cancelled.
+		for seg in removed:
+			event_queue.cancelCrossings(seg)
+		sweep_line.removeSegments(removed)
+		if passing == [] and event.left != []:
+			below, above = sweep_line.segmentsAround(event.y, event.x)
+			if below != None and above != None:
+				event_queue.cancelCrossing(below, above)
+		inserted = event.inner_inter + through + event.left
+		for seg in inserted:
+			seg.pin(event.x, event.y)
+			sweep_line.addSegment(seg, event.x)
+		if stats != None:
+			stats.lap('update')
+
 		# ############# Computes following intersections ################
-		# Now that we've added new segments, and removed some segments,
-		# the segments with highest gradient of event.left + even.inner_inter
-		# might intersect with the segments just above in the sweep line
-		# and the segments with lowest gradient might intersect with the
-		# segments below in the sweep line
-		greatest = None
-		if event.left != []:
-			greatest = event.left[-1]
-		if ((event.inner_inter != []) and 
-			(greatest == None or greatest < event.inner_inter[-1])):
-				greatest = event.inner_inter[-1]
-		if greatest != None:
-			highest_segments = sweep_line.sameLevelAs(greatest)
-			above_segments = sweep_line.aboveSegments(greatest)
-			for seg in highest_segments:
-				for other in above_segments:
-					inter = seg.intersectionWith(other)
-					if (isinstance(inter, Segment) or
-						inter == (event.x, event.y)):
-							intersections.append(((seg, other), inter))
-							#print("appened inter 9")
-					elif inter != None:
-						x, y = inter
-						#print("found new inner inter above")
-						event_queue.addIntersectingSegment(seg, x, y)
-						event_queue.addIntersectingSegment(other, x, y)
-		smallest = None
-		if event.left != []:
-			smallest = event.left[0]
-		if ((event.inner_inter != []) and 
-			(smallest == None or smallest < event.inner_inter[-1])):
-				smallest = event.inner_inter[0]
-		if smallest != None:
-			lowest_segments = sweep_line.sameLevelAs(smallest)
-			below_segments = sweep_line.belowSegments(smallest)
-			for seg in lowest_segments:
-				for other in below_segments:
-					inter = seg.intersectionWith(other)
-					if (isinstance(inter, Segment) or
-						inter == (event.x, event.y)):
-							intersections.append(((seg, other), inter))
-							#print("appened inter 10")
-					elif inter != None:
-						x, y = inter
-						#print("found new inner inter below")
-						event_queue.addIntersectingSegment(seg, x, y)
-						event_queue.addIntersectingSegment(other, x, y)
-
-		
+		# Only the segments which just became adjacent can cross after
+		# the event : the lowest and highest inserted segments, and the
+		# segments just below and above them. If no segment was inserted,
+		# the segments which were just below and above the removed ones.
+		#
+		# Because of rounding errors, such segments may be found to cross
+		# before the event, while their crossing was never reached. They
+		# are then considered to go through the event : they are moved 
+		# to the inserted segments, crossing those with which their order
+		# changes.
+		block = set(map(id, containing))
+		while True:
+			ComparableSegment.currentX = event.x
+			if inserted != []:
+				# Equal segments may be in any order, so the lowest and
+				# highest inserted segments are checked in the sweep line
+				lowest, highest = min(inserted), max(inserted)
+				below = sweep_line.segmentBelow(lowest)
+				while below != None and id(below) in block:
+					lowest, below = below, sweep_line.segmentBelow(below)
+				above = sweep_line.segmentAbove(highest)
+				while above != None and id(above) in block:
+					highest, above = above, sweep_line.segmentAbove(above)
+				pairs = [(below, lowest), (highest, above)]
+			elif passing != []:
+				pairs = [sweep_line.segmentsAround(event.y, event.x)]
+			else:
+				pairs = []
+			pairs = [(seg, other, crossing(seg, other)) for seg, other in pairs]
+			late = [(seg, other) for seg, other, inter in pairs if inter != None and
+					event_queue.crossingPoint(seg, other, *inter) <= point]
+			if late == []:
+				break
+			for seg, other in late:
+				for s, below in ((seg, True), (other, False)):
+					if id(s) in block:
+						continue
+					for t in inserted:
+						if (mixed(s, t) and s.gradient() != t.gradient() and
+							(s.gradient() > t.gradient()) == below):
+								report(s, t, at)
+					block.add(id(s))
+					event_queue.cancelCrossings(s)
+					sweep_line.removeSegment(s)
+					s.pin(event.x, event.y)
+					sweep_line.addSegment(s, event.x)
+					inserted.append(s)
+		for seg, other, inter in pairs:
+			schedule(seg, other, inter, point)
+		for seg, other in gaps:
+			if seg != None and sweep_line.segmentAbove(seg) is other:
+				inter = crossing(seg, other)
+				if inter == None or event_queue.crossingPoint(seg, other, *inter) > point:
+					schedule(seg, other, inter, point)
+		for seg in event.right:
+			forgetOverlaps(seg)
+			if snap != None:
+				root.pop(id(seg), None)
+
 		################# Handles vertical high endpoints ################
 		# It this event contains a vertical high endpoints, the 
 		# corresponding segment must removed from vertical_segments 
@@ -173,5 +915,10 @@ def intersectionsList(segments):
 		# with it have been computed.,
 		for seg in event.high:
 			vertical_segments.remove(seg)
+		if stats != None:
+			stats.lap('schedule')
+			stats.endEvent(len(event_queue), len(sweep_line))
 
-	return intersections
+		yield
+		if stats != None:
+			stats.lap('output')
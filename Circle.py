@@ -62,6 +62,90 @@ class Circle(object):
 				res.append((x,y))
 		return res
 
+	@staticmethod
+	def intersectSegments(circles, segments, eps=0.001):
+		'''
+		Computes the intersections between every circle of circles and
+		every segment of segments, with NumPy. circles can be a list of
+		Circles or an array of rows (xc, yc, r), and segments a list of
+		Segments or a SegmentArray.
+
+		Returns a tuple of NumPy arrays (circle, segment, x, y), where
+		(x[k], y[k]) is an intersection point between circles[circle[k]]
+		and segments[segment[k]]. Points are sorted by circle, then by
+		segment, then in the order intersectionWithSegment returns them,
+		and are the ones it returns with the same eps, up to rounding
+		errors : NumPy squares numbers with correct rounding, which
+		Python's ** operator does not always do.
+
+		Pairs are prefiltered with bounding boxes : segments are sorted
+		by x-coordinate, so that only the segments close enough to a
+		circle along the x-axis are tested against its bounding box,
+		and quadratics are only solved for the remaining pairs.
+		'''
+		import numpy as np
+		if isinstance(circles, np.ndarray):
+			xc, yc, r = (np.asarray(circles, dtype=np.float64).reshape(-1, 3)[:, k]
+						 for k in range(3))
+		else:
+			xc, yc, r = (np.array([getattr(c, a) for c in circles],
+								  dtype=np.float64) for a in ('xc', 'yc', 'r'))
+		x1, y1, x2, y2 = Segment._batchColumns(segments)
+
+		# A point where delta is only greater than -eps can be up to
+		# sqrt(eps/(4*A)) further than r from the center, so bounding
+		# boxes of segments are widened by this margin.
+		A = (x1-x2)**2 + (y1-y2)**2
+		with np.errstate(divide='ignore', invalid='ignore'):
+			margin = np.sqrt(max(eps, 0) / (4*A))
+		xmin = np.minimum(x1, x2) - margin
+		xmax = np.maximum(x1, x2) + margin
+		ymin = np.minimum(y1, y2) - margin
+		ymax = np.maximum(y1, y2) + margin
+		valid = A > 0
+		order = np.argsort(np.where(valid, xmin, np.inf), kind='stable')
+		order = order[:np.count_nonzero(valid)]
+		sorted_xmin = xmin[order]
+		width = (xmax - xmin)[order].max() if len(order) else 0
+
+		# Candidate pairs, as the segments of the sorted slice whose
+		# bounding box meets the circle's
+		pairs_c, pairs_s = [], []
+		for i in range(len(xc)):
+			lo = np.searchsorted(sorted_xmin, xc[i] - r[i] - width, 'left')
+			hi = np.searchsorted(sorted_xmin, xc[i] + r[i], 'right')
+			window = order[lo:hi]
+			hit = window[(xmax[window] >= xc[i] - r[i]) &
+						 (ymin[window] <= yc[i] + r[i]) &
+						 (ymax[window] >= yc[i] - r[i])]
+			pairs_c.append(np.full(len(hit), i, dtype=np.intp))
+			pairs_s.append(np.sort(hit))
+		ci = np.concatenate(pairs_c) if pairs_c else np.zeros(0, np.intp)
+		si = np.concatenate(pairs_s) if pairs_s else np.zeros(0, np.intp)
+
+		# Solves A*alpha^2 + B*alpha + C = 0 for each pair, as
+		# intersectionWithSegment does
+		sx1, sy1, sx2, sy2 = x1[si], y1[si], x2[si], y2[si]
+		cx, cy, cr = xc[ci], yc[ci], r[ci]
+		a = A[si]
+		B = 2*((sx2-cx)*(sx1-sx2) + (sy2-cy)*(sy1-sy2))
+		C = (sx2-cx)**2 + (sy2-cy)**2 - cr**2
+		delta = B**2 - 4*a*C
+		two = delta > eps
+		one = ~two & (delta > -eps)
+		sqrt_delta = np.sqrt(np.where(two, delta, 0))
+		first = np.where(two, (sqrt_delta - B)/(2*a), -B/(2*a))
+		second = (-sqrt_delta - B)/(2*a)
+		# Interleaves both roots of each pair, keeping the valid ones
+		alpha = np.stack((first, second), axis=1).ravel()
+		keep = np.stack((two | one, two), axis=1).ravel()
+		keep &= (0 <= alpha) & (alpha <= 1)
+		alpha = alpha[keep]
+		pair = np.repeat(np.arange(len(si)), 2)[keep]
+		sx1, sy1, sx2, sy2 = sx1[pair], sy1[pair], sx2[pair], sy2[pair]
+		return (ci[pair], si[pair],
+				alpha*sx1 + (1-alpha)*sx2, alpha*sy1 + (1-alpha)*sy2)
+
 	############################################
 	# DEPRECIATED USE INTERSECTIONWITH INSTEAD #
 	############################################
@@ -70,7 +154,7 @@ class Circle(object):
 	@staticmethod
 	def compareIntersectionMethods():
 		from random import random
-		from time import clock
+		from time import perf_counter
 		# Initializes 100 random segments in [0,1]x[0,1]
 		segments = []
 		for i in range(100):
@@ -83,17 +167,17 @@ class Circle(object):
 			xc, yc, r = random(), random(), random()
 			circles.append(Circle(xc, yc, r))
 		# Times the old intersection function
-		start = clock()
+		start = perf_counter()
 		for s in segments:
 			for c in circles:
 				inter = c.oldIntersectionWithSegment(s)
-		old = clock()-start
+		old = perf_counter()-start
 		# Times the new intersection function
-		start = clock()
+		start = perf_counter()
 		for s in segments:
 			for c in circles:
 				inter = c.intersectionWithSegment(s)
-		new = clock()-start
+		new = perf_counter()-start
 		print("Computing the intersections between 100 random segments"+
 			  " in [0,1]x[0,1].\n"+
 			  " and 100 random circles in [0,1]x[0,1] of radius at most 1\n"
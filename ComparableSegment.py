@@ -4,43 +4,112 @@ class ComparableSegment(Segment):
 	'''
 	This class represents segments that are compared in a special way
 	to be sorted in a Sweep Line.
+
+	As segments are compared over and over while being sorted, the parts
+	of the comparison key which do not depend on currentX (gradient,
+	y-intercept and endpoints) are computed once and for all when the
+	segment is initialized, and the y-coordinate at currentX is memoized
+	until currentX changes. Hence a ComparableSegment must not be
+	modified once initialized.
+
+	Like Segment, ComparableSegment only has slots, so that a segment
+	costs no __dict__.
 	'''
 
+	__slots__ = ('_ends', '_x', '_y', '_gradient', '_yIntercept')
+
 	# X-coordinate used to compare 2 segments
 	currentX = 0
 
+	# Relative rounding error on y-coordinates computed by yAtX. The
+	# sweep considers that segments passing this close to a point go
+	# through it.
+	rounding = 1e-12
+
+	def __init__(self, x1, y1, x2, y2):
+		'''
+		See Segment.__init__
+		'''
+		Segment.__init__(self, x1, y1, x2, y2)
+		# Last part of the comparison key
+		self._ends = (self.x1, self.y1, self.x2, self.y2)
+		# Memoized y-coordinate at x-coordinate self._x
+		self._x, self._y = None, None
+		if self.isVertical():
+			self._gradient, self._yIntercept = None, None
+		else:
+			self._gradient = Segment.gradient(self)
+			self._yIntercept = self.y1 - self._gradient*self.x1
+
+	def gradient(self):
+		'''
+		See Segment.gradient
+		'''
+		if self._gradient is None:
+			return Segment.gradient(self)
+		return self._gradient
+
+	def yIntercept(self):
+		'''
+		See Segment.yIntercept
+		'''
+		if self._yIntercept is None:
+			return Segment.yIntercept(self)
+		return self._yIntercept
+
+	def currentY(self):
+		'''
+		Returns self.yAtX(ComparableSegment.currentX), which is only
+		computed once per value of currentX.
+		'''
+		x = ComparableSegment.currentX
+		if x != self._x:
+			self._x, self._y = x, self.yAtX(x)
+		return self._y
+
+	def pin(self, x, y):
+		'''
+		Records that self goes through point (x, y), so that
+		self.currentY() returns exactly y when currentX is x, whatever
+		the rounding errors of yAtX. Segments going through the same
+		point are then only ordered by gradient at this point.
+		'''
+		self._x, self._y = x, y
+
 	def __lt__(self, other):
 		'''
 		Returns true if and only if self < other.
-		s1 < s2 if : 
+		s1 < s2 if :
 		- s1's y-coordinate < s2's y-coordinate at currentX
-		- s1's y-coordinate = s2's y-coordinate at currentX 
+		- s1's y-coordinate = s2's y-coordinate at currentX
 		and s1.gradient < s2.gradient
-		- s1's y-coordinate = s2's y-coordinate at currentX 
+		- s1's y-coordinate = s2's y-coordinate at currentX
 		, s1.gradient = s2.gradient
 		and (s1.x1, s1.y1, s1.x2, s1.y2) < (s2.x1, s2.y1, s2.x2, s2.y2)
 
-		WARNING : this method raises ZeroDivisionError when called 
+		WARNING : this method raises ZeroDivisionError when called
 		on a vertical segment.
 		'''
-		self_y = self.yAtX(ComparableSegment.currentX)
-		other_y = other.yAtX(ComparableSegment.currentX)
-
-		return ((self_y, self.gradient(), self.x1, self.y1, self.x2, self.y2) < 
-				(other_y, other.gradient(), other.x1, other.y1, other.x2, other.y2))
+		self_y, other_y = self.currentY(), other.currentY()
+		if self_y != other_y:
+			return self_y < other_y
+		self_gradient, other_gradient = self.gradient(), other.gradient()
+		if self_gradient != other_gradient:
+			return self_gradient < other_gradient
+		return self._ends < other._ends
 
 	def isBelow(self, other):
 		'''
 		Returns true if and only if self is below other.
-		A segment s1 is below a segment s2 if : 
+		A segment s1 is below a segment s2 if :
 		- s1's y-coordinate < s2's y-coordinate at currentX
-		- s1's y-coordinate = s2's y-coordinate at currentX 
+		- s1's y-coordinate = s2's y-coordinate at currentX
 		and s1.gradient < s2.gradient
-		
-		WARNING : this method raises ZeroDivisionError when called 
+
+		WARNING : this method raises ZeroDivisionError when called
 		on a vertical segment.
 		'''
-		self_y = self.yAtX(ComparableSegment.currentX)
-		other_y = other.yAtX(ComparableSegment.currentX)
-
-		return (self_y, self.gradient()) < (other_y, other.gradient())
+		self_y, other_y = self.currentY(), other.currentY()
+		if self_y != other_y:
+			return self_y < other_y
+		return self.gradient() < other.gradient()
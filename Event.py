@@ -31,29 +31,63 @@ class Event(object):
 	heapq module, which allows insertion in O(lg(N))
 	- vertical segments lists are not ordered, so insertion is 
 	in O(lg(N))
+	- most events only contain some kinds of segments, so each list
+	is only created when it is first accessed (see __getattr__), and
+	events only have slots : an event waiting in the queue costs no
+	empty lists and no __dict__. peek and isEmpty do not create the
+	lists.
 	'''
 
+	# Names of the lists of segments
+	LISTS = ('left', 'right', 'inner_inter', 'low', 'high')
+
+	__slots__ = ('x', 'y') + LISTS
+
 	def __init__(self, x, y):
 		'''
 		Initializes a new Event with coordinates (x, y),
 		and an empty set of segment
 		'''
 		self.x, self.y = x, y
-		self.left, self.right = [], []
-		self.inner_inter = []
-		self.low, self.high = [],[]
+
+	def __getattr__(self, name):
+		'''
+		Only called for the lists of segments which were never
+		accessed : creates them empty.
+		'''
+		if name not in Event.LISTS:
+			raise AttributeError(name)
+		res = []
+		setattr(self, name, res)
+		return res
+
+	def peek(self, name):
+		'''
+		Returns the list of segments name of self, or an empty tuple if
+		it was never accessed, without creating it.
+		'''
+		try:
+			return object.__getattribute__(self, name)
+		except AttributeError:
+			return ()
 
 	def __eq__(self, other):
 		'''
 		Returns true if and only if self and other are equals.
 		Two events are equals if they have the exact same coordinates.
+		An event is never equal to an object which is not an Event.
 		'''
-		if other == None:
+		if other is None:
 			return False
 		elif not isinstance(other, Event):
-			raise TypeError()
-		else:
-			return (self.x, self.y) == (other.x, other.y)
+			return NotImplemented
+		return (self.x, self.y) == (other.x, other.y)
+
+	def __hash__(self):
+		'''
+		Returns the hash of the coordinates of self.
+		'''
+		return hash((self.x, self.y))
 
 	def __lt__(self, other):
 		'''
@@ -77,6 +111,12 @@ class Event(object):
 		', '.join([str(s) for s in self.high]))
 			
 
+	def isEmpty(self):
+		'''
+		Returns true if and only if self contains no segment.
+		'''
+		return not any(map(self.peek, Event.LISTS))
+
 	def addSegment(self, segment):
 		'''
 		Adds segment to the right list of segments.
@@ -98,4 +138,18 @@ class Event(object):
 				else:
 					heapq.heappush(self.right, segment)
 			else:
-				heapq.heappush(self.inner_inter, segment)
\ No newline at end of file
+				heapq.heappush(self.inner_inter, segment)
+
+	def removeInnerSegment(self, segment):
+		'''
+		Removes segment from the inner intersecting segments of self,
+		looking for the segment object itself rather than an equal one.
+		Raises ValueError if it is not there.
+		'''
+		for i, s in enumerate(self.peek('inner_inter')):
+			if s is segment:
+				del self.inner_inter[i]
+				ComparableSegment.currentX = self.x
+				heapq.heapify(self.inner_inter)
+				return
+		raise ValueError('Segment is not an inner intersecting segment of the event')
@@ -1,4 +1,8 @@
 import heapq
+from array import array
+from operator import itemgetter
+from ComparableSegment import ComparableSegment
+from SegmentArray import SegmentArray
 from Event import Event
 
 class EventQueue(object):
@@ -7,29 +11,174 @@ class EventQueue(object):
 	maintained ordered throughout the execution of the Bentley-Ottmann
 	algorithm.
 
-	It relies on the python heapq module, which allows insertion in
-	O(lg(S)) (where S is the current size of the queue), and access to
-	the smallest element (i.e. the next Event) in O(1).
+	Events are of 2 kinds :
+	- endpoint events, which are all known beforehand. They are sorted
+	once when the queue is initialized, and kept in the array events,
+	the next one being events[next] ;
+	- inner intersection events, which are discovered during the sweep.
+	They are kept in the heap queue, relying on the python heapq module,
+	which allows insertion in O(lg(S)) (where S is the current size of
+	the heap), and access to the smallest element in O(1).
+	The next Event is the smallest of both.
 
-	Note : when computing the intersections of a set of N segments,
-	at any moment the size of the queue is S <= 2*N + N^2
-	2*N events being the endpoints of the N segments and
-	N^2 events being the N^2 potential intersection points. 
+	Inner intersection events are only scheduled for pairs of segments
+	which are adjacent in the sweep line (see addCrossing), and are
+	cancelled as soon as the segments stop being adjacent (see
+	cancelCrossing). As there are at most N-1 pairs of adjacent
+	segments at any moment, when computing the intersections of a set
+	of N segments, the size of the queue is S <= 2*N + N - 1 (2*N
+	events being the endpoints of the N segments), plus cancelled
+	events which are lazily dropped from the heap, and never outnumber
+	the others.
+
+	When the segments are the rows of a SegmentArray, endpoint events
+	are not created beforehand : the endpoints are sorted as indices
+	of rows, read from the columns, and each endpoint event is only
+	created when it is the next one. The RowSegment of a row is created
+	at its left endpoint, and forgotten by the queue at its right
+	endpoint, so the segments held during the sweep are only the ones
+	which the sweep line crosses.
+
+	When snap is not None, it is the size of the pixels of a grid whose
+	centers are the points (k*snap, l*snap), k and l being integers,
+	the endpoints of the segments being such centers. The crossings
+	scheduled in a pixel then share a single event, i.e. the pixel is a
+	hot pixel (see crossingPoint and hotPixel).
 	'''
 
-	def __init__(self, segments):
+	def __init__(self, segments, snap=None):
 		'''
 		Initializes the list of events corresponding to a list of 
-		ComparableSegments
+		ComparableSegments, or to a SegmentArray
 		'''
+		self.snap = snap
+		# Coordinates of the last event returned by nextEvent
+		self.point = None
 		self.event_finder = {}
+		self.events, self.next = [], 0
 		self.queue = []
-		# Adds endpoints one by one, creating a new Event when needed
+		# Crossings scheduled for each segment, as lists of (other, event)
+		# indexed by the id of the segment
+		self.crossings = {}
+		# Number of crossings (and calls to addIntersectingSegment) for
+		# which a segment is in the inner intersecting segments of an
+		# event, indexed by (id(seg), id(e))
+		self.references = {}
+		# Number of cancelled events which are still in the heap
+		self.cancelled = 0
+		# SegmentArray whose rows are the segments, if any
+		self.rows = None
+		if isinstance(segments, SegmentArray):
+			self._sortRows(segments)
+			return
+		# Sorts all endpoints at once, then groups equal ones in events
+		# in a single pass. Each endpoint is (point, side, segment),
+		# side being 0 for left or low endpoints, and 1 for right or
+		# high endpoints.
+		endpoints = []
+		append = endpoints.append
 		for s in segments:
-			e1 = self.getOrCreate(s.x1, s.y1)
-			e1.addSegment(s)
-			e2 = self.getOrCreate(s.x2, s.y2)
-			e2.addSegment(s)
+			append(((s.x1, s.y1), 0, s))
+			append(((s.x2, s.y2), 1, s))
+		endpoints.sort(key=itemgetter(0))
+		events, event_finder = self.events, self.event_finder
+		last = None
+		for point, side, s in endpoints:
+			if point != last:
+				last = point
+				e = Event(point[0], point[1])
+				events.append(e)
+				event_finder[point] = e
+			if s.x1 == s.x2:
+				(e.high if side else e.low).append(s)
+			else:
+				(e.right if side else e.left).append(s)
+		# Sorts the non vertical segments lists of each event, without
+		# creating the lists it does not have
+		for e in self.events:
+			if len(e.peek('left')) > 1 or len(e.peek('right')) > 1:
+				ComparableSegment.currentX = e.x
+				e.left.sort()
+				e.right.sort()
+
+	def _sortRows(self, rows):
+		'''
+		Initializes the queue for the rows of a SegmentArray. Endpoints
+		are numbered k = i for the left endpoint of the i-th row, and
+		k = N + i for its right endpoint, and sorted in order, the array
+		of their numbers being the only per endpoint data the queue
+		keeps.
+		'''
+		self.rows = rows
+		# RowSegments whose left endpoint was reached, but not their
+		# right endpoint, indexed by row
+		self.active = {}
+		n = len(rows)
+		x1, y1, x2, y2 = rows.columns()
+		# Sorts by y, then by x, the sort being stable
+		keys = array('d', y1)
+		keys.extend(y2)
+		order = sorted(range(2*n), key=keys.__getitem__)
+		keys = array('d', x1)
+		keys.extend(x2)
+		order.sort(key=keys.__getitem__)
+		del keys
+		self.order = array('q', order)
+		del order
+		# Counts the endpoint events, i.e. the distinct endpoints
+		self.endpoint_events, last = 0, None
+		for k in self.order:
+			point = self._endpoint(k)
+			if point != last:
+				self.endpoint_events += 1
+				last = point
+
+	def _endpoint(self, k):
+		'''
+		Returns the endpoint numbered k of the rows (see _sortRows).
+		'''
+		n = len(self.rows)
+		if k < n:
+			return (self.rows.x1[k], self.rows.y1[k])
+		return (self.rows.x2[k - n], self.rows.y2[k - n])
+
+	def _nextRowEvent(self):
+		'''
+		Removes the next Event from the queue and returns it, when the
+		segments are the rows of a SegmentArray. An inner intersection
+		event at the next endpoint is completed with the segments of
+		this endpoint.
+		'''
+		order = self.order
+		point = self._endpoint(order[self.next]) if self.next < len(order) else None
+		if self.queue:
+			first = (self.queue[0].x, self.queue[0].y)
+			if point == None or first < point:
+				return heapq.heappop(self.queue)
+		if self.queue and first == point:
+			e = heapq.heappop(self.queue)
+		else:
+			e = Event(point[0], point[1])
+		self.endpoint_events -= 1
+		n = len(self.rows)
+		while self.next < len(order):
+			k = order[self.next]
+			if self._endpoint(k) != point:
+				break
+			self.next += 1
+			if k < n:
+				s = self.active[k] = self.rows.rowSegment(k)
+			else:
+				s = self.active.pop(k - n)
+			if s.x1 == s.x2:
+				(e.high if k >= n else e.low).append(s)
+			else:
+				(e.right if k >= n else e.left).append(s)
+		if len(e.peek('left')) > 1 or len(e.peek('right')) > 1:
+			ComparableSegment.currentX = e.x
+			e.left.sort()
+			e.right.sort()
+		return e
 
 	def getOrCreate(self, x, y):
 		'''
@@ -48,7 +197,9 @@ class EventQueue(object):
 		Let e be the event of coordinates (x, y) in the queue,
 		newly created if necessary.
 		If seg is not already in the inner intersecting segments
-		of this event, adds it to the list.
+		of this event, adds it to the list. The segment is looked up in
+		self.references, so this runs in O(1), and it stays in the
+		event even if crossings at the event are cancelled.
 
 		Raises ValueError if one of segment's endpoints
 		is (x, y).
@@ -57,19 +208,183 @@ class EventQueue(object):
 			raise ValueError('One of this segment\'s endpoints belong to the event')
 		else:
 			e = self.getOrCreate(x, y)
-			if seg not in e.inner_inter:
+			key = (id(seg), id(e))
+			count = self.references.get(key, 0)
+			if count == 0:
 				e.addSegment(seg)
+			self.references[key] = count + 1
+
+	def addCrossing(self, seg, other, x, y):
+		'''
+		Schedules the crossing of 2 segments adjacent in the sweep line
+		at (x, y) : each of them is added to the inner intersecting
+		segments of the event of coordinates (x, y), newly created if
+		necessary, unless (x, y) is one of its endpoints.
+
+		When snap is not None, the event is the one of
+		crossingPoint(seg, other, x, y) instead.
+
+		The crossing must be cancelled with cancelCrossing once seg and
+		other stop being adjacent before reaching it.
+		'''
+		x, y = self.crossingPoint(seg, other, x, y)
+		e = self.getOrCreate(x, y)
+		for s in (seg, other):
+			if (x, y) != (s.x1, s.y1) and (x, y) != (s.x2, s.y2):
+				key = (id(s), id(e))
+				count = self.references.get(key, 0)
+				if count == 0:
+					e.addSegment(s)
+				self.references[key] = count + 1
+		self.crossings.setdefault(id(seg), []).append((other, e))
+		self.crossings.setdefault(id(other), []).append((seg, e))
+
+	def crossingPoint(self, seg, other, x, y):
+		'''
+		Returns the coordinates of the event at which addCrossing
+		schedules the crossing of seg and other at (x, y).
+
+		This is (x, y) when snap is None. Otherwise, crossings in the
+		same pixel share the event at the middle of its left side, which
+		is reached before any of them, so that the segments can be
+		rerouted through it without crossing after it. If the sweep
+		already reached this point, the event is the center of the
+		pixel, provided that it is not after (x, y), and otherwise the
+		crossing keeps its own event at (x, y).
+		'''
+		if self.snap == None:
+			return (x, y)
+		k, l = round(x / self.snap), round(y / self.snap)
+		for point in (((k - 0.5) * self.snap, l * self.snap),
+					  (k * self.snap, l * self.snap)):
+			if (self.point == None or point > self.point) and point <= (x, y):
+				return point
+		return (x, y)
+
+	def hotPixel(self, x, y):
+		'''
+		Returns the center of the pixel whose crossings share the event
+		of coordinates (x, y), i.e. the center or the middle of the left
+		side of the pixel (see crossingPoint), or None if snap is None
+		or (x, y) is neither.
+		'''
+		if self.snap == None:
+			return None
+		k, l = round(x / self.snap + 0.5), round(y / self.snap)
+		center = (k * self.snap, l * self.snap)
+		if (x, y) == ((k - 0.5) * self.snap, center[1]):
+			return center
+		k = round(x / self.snap)
+		center = (k * self.snap, l * self.snap)
+		return center if (x, y) == center else None
+
+	def replaceSegment(self, seg, other):
+		'''
+		Replaces seg by other, which has the same right endpoint, in the
+		event of this endpoint, which has not been reached yet. The
+		segments must not be the rows of a SegmentArray.
+		'''
+		right = self.event_finder[(seg.x2, seg.y2)].right
+		for i, s in enumerate(right):
+			if s is seg:
+				right[i] = other
+				return
+
+	def cancelCrossing(self, seg, other):
+		'''
+		Cancels the crossing of seg and other scheduled by addCrossing,
+		if it has not been reached yet.
+		'''
+		for i, (s, e) in enumerate(self.crossings.get(id(seg), ())):
+			if s is other:
+				del self.crossings[id(seg)][i]
+				self._forget(other, seg, e)
+				return
+
+	def cancelCrossings(self, seg):
+		'''
+		Cancels all the crossings of seg scheduled by addCrossing which
+		have not been reached yet.
+		'''
+		for other, e in self.crossings.pop(id(seg), ()):
+			self._forget(other, seg, e)
+
+	def _forget(self, seg, other, e):
+		'''
+		Removes the crossing of seg and other at e from the crossings
+		of seg, and from e if it has not been reached yet. An event
+		left empty is cancelled.
+		'''
+		crossings = self.crossings.get(id(seg), [])
+		for i, (s, f) in enumerate(crossings):
+			if s is other and f is e:
+				del crossings[i]
+				break
+		if not crossings:
+			self.crossings.pop(id(seg), None)
+		if not self._isLive(e):
+			return
+		for s in (seg, other):
+			key = (id(s), id(e))
+			count = self.references.get(key)
+			if count == 1:
+				del self.references[key]
+				e.removeInnerSegment(s)
+			elif count != None:
+				self.references[key] = count - 1
+		if e.isEmpty():
+			# Only inner intersection events can be left empty
+			del self.event_finder[(e.x, e.y)]
+			self.cancelled += 1
+			if 2*self.cancelled > len(self.queue):
+				self.queue = [f for f in self.queue if self._isLive(f)]
+				heapq.heapify(self.queue)
+				self.cancelled = 0
+
+	def _isLive(self, e):
+		'''
+		Returns true if and only if e is an event of the queue which has
+		not been cancelled.
+		'''
+		return self.event_finder.get((e.x, e.y)) is e
 
 	def nextEvent(self):
 		'''
 		Removes the next Event from the queue and returns it.
 		'''
-		e = heapq.heappop(self.queue)
-		del self.event_finder[(e.x, e.y)]
+		# Drops cancelled events
+		while self.queue and not self._isLive(self.queue[0]):
+			heapq.heappop(self.queue)
+			self.cancelled -= 1
+		if self.rows != None:
+			e = self._nextRowEvent()
+		elif self.queue and (self.next == len(self.events) or
+						   self.queue[0] < self.events[self.next]):
+			e = heapq.heappop(self.queue)
+		else:
+			e = self.events[self.next]
+			# Releases the event, which the queue no longer needs
+			self.events[self.next] = None
+			self.next += 1
+		self.point = (e.x, e.y)
+		# Endpoint events of rows are not in event_finder
+		self.event_finder.pop((e.x, e.y), None)
+		for s in e.peek('inner_inter'):
+			self.references.pop((id(s), id(e)), None)
 		return e
 
 	def isEmpty(self):
 		'''
 		Returns true if and only if the queue is empty.
 		'''
-		return len(self.queue) == 0
\ No newline at end of file
+		return len(self) == 0
+
+	def __len__(self):
+		'''
+		Returns the number of Events left in the queue.
+		'''
+		if self.rows != None:
+			endpoint_events = self.endpoint_events
+		else:
+			endpoint_events = len(self.events) - self.next
+		return endpoint_events + len(self.queue) - self.cancelled
\ No newline at end of file
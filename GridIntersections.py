@@ -0,0 +1,105 @@
+from math import floor, hypot
+from statistics import median
+
+def iterGridIntersections(segments, cell_size=None):
+	'''
+	Yields the intersections between segments as intersectionsList
+	does, as tuples ((seg, other), inter), seg being before other in
+	segments.
+
+	Instead of sweeping, segments are bucketed into the cells of a
+	uniform grid (by default, the size of a cell is the median length
+	of the segments, which a few long segments do not inflate), and
+	only the pairs of segments sharing a cell are
+	tested with Segment.intersectionWith. This is faster than the sweep
+	for a lot of short segments with few intersections each, such as
+	street networks.
+
+	A pair of segments sharing several cells is only tested in the cell
+	containing the lower left corner of the intersection of their
+	bounding boxes, so that it is reported only once.
+	'''
+	segments = list(segments)
+	if len(segments) == 0:
+		return
+	if cell_size == None:
+		cell_size = medianLength(segments)
+	x0 = min(s.x1 for s in segments)
+	y0 = min(min(s.y1, s.y2) for s in segments)
+	cell = lambda x, y: (floor((x - x0) / cell_size),
+						 floor((y - y0) / cell_size))
+
+	# Buckets segments in the cells covering their bounding box
+	grid = {}
+	for i, s in enumerate(segments):
+		(i1, j1), (i2, j2) = (cell(s.x1, min(s.y1, s.y2)),
+							  cell(s.x2, max(s.y1, s.y2)))
+		for ci in range(i1, i2 + 1):
+			for cj in range(j1, j2 + 1):
+				grid.setdefault((ci, cj), []).append(i)
+
+	# Tests pairs of segments sharing a cell
+	for key, indices in grid.items():
+		for a in range(len(indices)):
+			seg = segments[indices[a]]
+			seg_ymin, seg_ymax = min(seg.y1, seg.y2), max(seg.y1, seg.y2)
+			for b in range(a + 1, len(indices)):
+				other = segments[indices[b]]
+				other_ymin = min(other.y1, other.y2)
+				other_ymax = max(other.y1, other.y2)
+				# Skips pairs whose bounding boxes do not intersect
+				if (seg.x2 < other.x1 or other.x2 < seg.x1 or
+					seg_ymax < other_ymin or other_ymax < seg_ymin):
+						continue
+				# Skips pairs which are tested in another cell
+				if cell(max(seg.x1, other.x1),
+						max(seg_ymin, other_ymin)) != key:
+					continue
+				inter = seg.intersectionWith(other)
+				if inter != None:
+					yield ((seg, other), inter)
+
+def gridIntersectionsList(segments, cell_size=None):
+	'''
+	Returns the list of intersections yielded by iterGridIntersections.
+	'''
+	return list(iterGridIntersections(segments, cell_size))
+
+def averageLength(segments):
+	'''
+	Returns the average length of a non empty list of segments.
+	'''
+	return sum(hypot(s.x2 - s.x1, s.y2 - s.y1) for s in segments) / len(segments)
+
+def medianLength(segments):
+	'''
+	Returns the median length of a non empty list of segments.
+	'''
+	return median(hypot(s.x2 - s.x1, s.y2 - s.y1) for s in segments)
+
+def preferGrid(segments, min_size=64, max_occupancy=16, max_cells=64):
+	'''
+	Returns true if and only if iterGridIntersections is expected to be
+	faster than the sweep on a list of segments, i.e. if there are at
+	least min_size segments, if a grid of cells of the size of the
+	median segment would hold less than max_occupancy segments per
+	non empty cell on average, and if the bounding box of no segment
+	covers more than max_cells cells. Long segments compared to the
+	extent of the set make cells crowded, and a segment much longer
+	than the others is bucketed in a number of cells growing with the
+	square of its length : the sweep is then preferred.
+	'''
+	if len(segments) < min_size:
+		return False
+	length = medianLength(segments)
+	if length == 0:
+		return False
+	for s in segments:
+		if ((s.x2 - s.x1) / length + 1) * (abs(s.y2 - s.y1) / length + 1) > max_cells:
+			return False
+	width = max(s.x2 for s in segments) - min(s.x1 for s in segments)
+	height = (max(max(s.y1, s.y2) for s in segments) -
+			  min(min(s.y1, s.y2) for s in segments))
+	cells = (max(width, length) / length) * (max(height, length) / length)
+	# A segment covers up to 4 cells of its own size
+	return 4 * len(segments) / min(cells, 4 * len(segments)) <= max_occupancy
@@ -0,0 +1,179 @@
+from numbers import Integral
+from fractions import Fraction
+from Segment import Segment
+from ComparableSegment import ComparableSegment
+
+def _rational(numerator, denominator):
+	'''
+	Returns numerator / denominator as an int if it is an integer,
+	as a Fraction otherwise.
+	'''
+	if numerator % denominator == 0:
+		return numerator // denominator
+	else:
+		return Fraction(numerator, denominator)
+
+def _orientation(ax, ay, bx, by, cx, cy):
+	'''
+	Returns the cross product (b - a) x (c - a), which is positive if
+	a, b, c turn counterclockwise, negative if they turn clockwise and
+	null if they are collinear.
+	'''
+	return (bx-ax)*(cy-ay) - (by-ay)*(cx-ax)
+
+class IntegerSegment(ComparableSegment):
+	'''
+	This class represents ComparableSegments whose endpoints have
+	integer coordinates, compared and intersected exactly.
+
+	Comparisons and intersection tests only rely on integer cross
+	products, so no division is performed unless an intersection point
+	is actually found. Intersection points and y-coordinates are
+	represented by exact rationals (ints when possible, Fractions
+	otherwise), so the same point reached from different pairs of
+	segments always gets the same event in the EventQueue.
+
+	ComparableSegment.currentX can then be an int or a Fraction.
+	IntegerSegments must only be compared with IntegerSegments.
+	'''
+
+	__slots__ = ('_dx', '_dy', '_levelX', '_levelY')
+
+	# Computations are exact
+	rounding = 0
+
+	def __init__(self, x1, y1, x2, y2):
+		'''
+		x1, y1, x2, y2 must be integers, otherwise a TypeError will be
+		raised.
+		'''
+		for c in (x1, y1, x2, y2):
+			if not isinstance(c, Integral):
+				raise TypeError('IntegerSegment coordinates must be integers')
+		Segment.__init__(self, x1, y1, x2, y2)
+		self._ends = (self.x1, self.y1, self.x2, self.y2)
+		self._dx, self._dy = self.x2 - self.x1, self.y2 - self.y1
+		# Memoized y-coordinate at x-coordinate self._x
+		self._x, self._y = None, None
+		# Memoized numerator of the y-coordinate at self._levelX,
+		# see _level
+		self._levelX, self._levelY = None, None
+
+	def gradient(self):
+		'''
+		Returns the exact gradient of self.
+
+		WARNING : this method raises ZeroDivisionError when called
+		on a vertical segment.
+		'''
+		return Fraction(self._dy, self._dx)
+
+	def yIntercept(self):
+		'''
+		Returns the exact y-intercept of the line containing self.
+
+		WARNING : this method raises ZeroDivisionError when called
+		on a vertical segment
+		'''
+		return _rational(self.y1*self._dx - self._dy*self.x1, self._dx)
+
+	def yAtX(self, x):
+		'''
+		Returns the exact y-coordinate of self's point of x-coordinate
+		x, or None if it does not exist.
+
+		WARNING : this method raises ZeroDivisionError when called
+		on a vertical segment
+		'''
+		if self._dx == 0:
+			raise ZeroDivisionError('Vertical segment')
+		elif self.x1 <= x <= self.x2:
+			x = Fraction(x)
+			p, q = x.numerator, x.denominator
+			return _rational(self.y1*self._dx*q + self._dy*(p - self.x1*q),
+							 self._dx*q)
+		else:
+			return None
+
+	def _level(self):
+		'''
+		Returns the integer self._dx*q*y, where y is self's y-coordinate
+		at ComparableSegment.currentX = p/q.
+		Comparing y-coordinates of 2 segments at the same x then only
+		takes integer multiplications (see __lt__).
+		'''
+		x = ComparableSegment.currentX
+		if x != self._levelX:
+			if self._dx == 0:
+				raise ZeroDivisionError('Vertical segment')
+			p, q = x.numerator, x.denominator
+			self._levelX = x
+			self._levelY = self.y1*self._dx*q + self._dy*(p - self.x1*q)
+		return self._levelY
+
+	def __lt__(self, other):
+		'''
+		See ComparableSegment.__lt__
+		'''
+		self_y, other_y = self._level()*other._dx, other._level()*self._dx
+		if self_y != other_y:
+			return self_y < other_y
+		self_gradient, other_gradient = (self._dy*other._dx,
+										 other._dy*self._dx)
+		if self_gradient != other_gradient:
+			return self_gradient < other_gradient
+		return self._ends < other._ends
+
+	def isBelow(self, other):
+		'''
+		See ComparableSegment.isBelow
+		'''
+		self_y, other_y = self._level()*other._dx, other._level()*self._dx
+		if self_y != other_y:
+			return self_y < other_y
+		return self._dy*other._dx < other._dy*self._dx
+
+	def intersectionWith(self, other):
+		'''
+		Computes the exact intersection between self and another
+		IntegerSegment, which can be :
+		- None if the intersection is empty
+		- a point of coordinates (x, y)
+		- a Segment [(x1,y1);(x2;y2)]
+		'''
+		x1, y1, x2, y2 = self.x1, self.y1, self.x2, self.y2
+		x3, y3, x4, y4 = other.x1, other.y1, other.x2, other.y2
+		o1 = _orientation(x1, y1, x2, y2, x3, y3)
+		o2 = _orientation(x1, y1, x2, y2, x4, y4)
+		# If the segments are on the same line, their intersection is
+		# between the greatest left endpoint and the lowest right one.
+		if o1 == 0 and o2 == 0:
+			start = max((x1, y1), (x3, y3))
+			end = min((x2, y2), (x4, y4))
+			if start > end:
+				return None
+			elif start == end:
+				return start
+			else:
+				return Segment(start[0], start[1], end[0], end[1])
+		o3 = _orientation(x3, y3, x4, y4, x1, y1)
+		o4 = _orientation(x3, y3, x4, y4, x2, y2)
+		# Each segment must have its endpoints on both sides of the
+		# other one's line.
+		if (o1 > 0 and o2 > 0) or (o1 < 0 and o2 < 0):
+			return None
+		if (o3 > 0 and o4 > 0) or (o3 < 0 and o4 < 0):
+			return None
+		# Only now computes the intersection point.
+		if o1 == 0:
+			return (x3, y3)
+		elif o2 == 0:
+			return (x4, y4)
+		elif o3 == 0:
+			return (x1, y1)
+		elif o4 == 0:
+			return (x2, y2)
+		denominator = (x2-x1)*(y4-y3) - (y2-y1)*(x4-x3)
+		t = (x3-x1)*(y4-y3) - (y3-y1)*(x4-x3)
+		return (_rational(x1*denominator + (x2-x1)*t, denominator),
+				_rational(y1*denominator + (y2-y1)*t, denominator))
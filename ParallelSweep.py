@@ -0,0 +1,204 @@
+import os
+from math import hypot
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from SegmentArray import SegmentArray, RowSegment
+from BentleyOttmann import iterIntersections
+
+def parallelIntersectionsList(segments, workers=None, slabs=None):
+	'''
+	Returns the same intersections as intersectionsList(segments), up
+	to their order, computed by several processes.
+
+	The x-range of the segments is split into vertical slabs, each slab
+	containing about the same number of endpoints. Segments are clipped
+	to each slab they cross, and the sweep of each slab runs in a pool
+	of workers processes (os.cpu_count() by default). There are slabs
+	slabs, workers by default.
+
+	Workers find candidate pairs among the clipped parts, with the
+	tolerance of the sweep, as clipping rounds the clipped endpoints,
+	and compute their intersections from the original segments with
+	intersectionWith. A pair found in several slabs (when it intersects
+	on a slab boundary, or overlaps across it) is only reported once.
+	'''
+	if isinstance(segments, SegmentArray):
+		objects = list(segments)
+		return [((i, j), inter) for (i, j), inter
+				in _parallelIntersections(objects, workers, slabs)]
+	else:
+		return [((segments[i], segments[j]), inter) for (i, j), inter
+				in _parallelIntersections(segments, workers, slabs)]
+
+def _parallelIntersections(segments, workers, slabs):
+	'''
+	Computes the intersections of a list of segments, and returns them
+	as tuples ((i, j), inter), i and j being indices in the list.
+	'''
+	workers = workers or os.cpu_count() or 1
+	slabs = slabs or workers
+	bounds = slabBoundaries(segments, slabs)
+	tasks = _slabTasks(segments, bounds)
+	if workers == 1 or len(tasks) == 1:
+		found = list(map(_slabIntersections, tasks))
+	else:
+		with ProcessPoolExecutor(workers) as pool:
+			found = list(pool.map(_slabIntersections, tasks))
+	intersections = {}
+	for slab in found:
+		intersections.update(slab)
+	for i, j in _boundaryPairs(segments, bounds[1:-1]):
+		if (i, j) not in intersections:
+			inter = segments[i].intersectionWith(segments[j])
+			if inter != None:
+				intersections[(i, j)] = inter
+	return sorted(intersections.items(), key=itemgetter(0))
+
+def slabBoundaries(segments, slabs):
+	'''
+	Returns the sorted list of the x-coordinates of the boundaries of
+	at most slabs slabs, chosen so that each slab contains about the
+	same number of endpoints. The first and last boundaries are the
+	smallest and greatest x-coordinates of the segments.
+	'''
+	xs = sorted([s.x1 for s in segments] + [s.x2 for s in segments])
+	if len(xs) == 0:
+		return [0, 0]
+	bounds = [xs[0]]
+	for k in range(1, slabs):
+		x = xs[k*len(xs) // slabs]
+		if bounds[-1] < x < xs[-1]:
+			bounds.append(x)
+	bounds.append(xs[-1])
+	return bounds
+
+def clipToSlab(segments, lo, hi):
+	'''
+	Returns the parts of segments which are inside the slab
+	lo <= x <= hi, as tuples (i, x1, y1, x2, y2), i being the index of
+	the segment the part belongs to.
+	Vertical segments on a boundary belong to both slabs, while a
+	segment which only touches the slab at an endpoint is left out.
+	'''
+	res = []
+	for i, s in enumerate(segments):
+		if s.isVertical():
+			if lo <= s.x1 <= hi:
+				res.append((i, s.x1, s.y1, s.x2, s.y2))
+		elif s.x1 < hi and s.x2 > lo:
+			res.append(_clip(i, s, lo, hi))
+	return res
+
+def _clip(i, s, lo, hi):
+	'''
+	Returns the part of the non vertical segment s of index i inside
+	the slab lo <= x <= hi, as a tuple (i, x1, y1, x2, y2). Endpoints
+	inside the slab, and horizontal segments, are kept exact.
+	'''
+	x1, y1, x2, y2 = s.x1, s.y1, s.x2, s.y2
+	if x1 < lo:
+		x1, y1 = lo, y1 if s.y1 == s.y2 else s.yAtX(lo)
+	if x2 > hi:
+		x2, y2 = hi, y2 if s.y1 == s.y2 else s.yAtX(hi)
+	return (i, x1, y1, x2, y2)
+
+def _slabTasks(segments, bounds):
+	'''
+	Returns the tasks of the slabs delimited by bounds, as tuples
+	(parts, originals), parts being the list of the parts of segments
+	in the slab, as returned by clipToSlab, and originals a dict of the
+	segments they belong to, indexed by their indices.
+	Segments are clipped in a single pass, each of them to the range
+	of slabs it crosses, found by bisection.
+	'''
+	slabs = len(bounds) - 1
+	tasks = [([], {}) for k in range(slabs)]
+	for i, s in enumerate(segments):
+		if s.isVertical():
+			first = max(bisect_left(bounds, s.x1) - 1, 0)
+			last = min(bisect_right(bounds, s.x1), slabs)
+		else:
+			first = max(bisect_right(bounds, s.x1) - 1, 0)
+			last = min(bisect_left(bounds, s.x2), slabs)
+		for k in range(first, last):
+			parts, originals = tasks[k]
+			if s.isVertical():
+				parts.append((i, s.x1, s.y1, s.x2, s.y2))
+			else:
+				parts.append(_clip(i, s, bounds[k], bounds[k + 1]))
+			originals[i] = s
+	return tasks
+
+class _Part(RowSegment):
+	'''
+	This class represents the part of a segment clipped to a slab, row
+	being the index of the segment.
+
+	Clipped endpoints are rounded, so a part may miss a segment which
+	the original one touches. Parts are thus considered to intersect
+	as soon as an endpoint of one of them is within the tolerance of
+	the sweep (see ComparableSegment.rounding) of the other : they are
+	only candidates, whose intersection is computed from the original
+	segments.
+	'''
+
+	__slots__ = ()
+
+	def intersectionWith(self, other):
+		'''
+		Returns the intersection of self and other, or an endpoint of
+		one of them within the tolerance of the sweep of the other, or
+		None.
+		'''
+		inter = RowSegment.intersectionWith(self, other)
+		if inter != None:
+			return inter
+		for s, t in ((self, other), (other, self)):
+			for x, y in ((s.x1, s.y1), (s.x2, s.y2)):
+				tolerance = self.rounding*max(abs(x), abs(y), 1)
+				closest = t.orthogonalProjectionOf((x, y))
+				if closest == None:
+					closest = min((t.x1, t.y1), (t.x2, t.y2),
+								  key=lambda q: hypot(x - q[0], y - q[1]))
+				if hypot(x - closest[0], y - closest[1]) <= tolerance:
+					return (x, y)
+		return None
+
+def _slabIntersections(task):
+	'''
+	Runs the sweep on the parts of segments of a slab returned by
+	_slabTasks, and returns the intersections of the original segments
+	whose parts were found to intersect, as a dict indexed by the pairs
+	(i, j), i < j, of their indices.
+	'''
+	parts, originals = task
+	objects = [_Part(x1, y1, x2, y2, i) for i, x1, y1, x2, y2 in parts]
+	res = {}
+	for (seg, other), inter in iterIntersections(objects, 'sweep'):
+		i, j = min(seg.row, other.row), max(seg.row, other.row)
+		if i != j and (i, j) not in res:
+			res[(i, j)] = originals[i].intersectionWith(originals[j])
+	return {pair: inter for pair, inter in res.items() if inter != None}
+
+def _boundaryPairs(segments, boundaries):
+	'''
+	Returns the pairs of segments which only meet on a slab boundary,
+	at the right endpoint of one and the left endpoint of the other :
+	they never are in the same slab.
+	'''
+	boundaries = set(boundaries)
+	ending, starting = {}, {}
+	for i, s in enumerate(segments):
+		if s.isVertical():
+			continue
+		if s.x2 in boundaries:
+			ending.setdefault((s.x2, s.y2), []).append(i)
+		if s.x1 in boundaries:
+			starting.setdefault((s.x1, s.y1), []).append(i)
+	pairs = set()
+	for point, indices in ending.items():
+		for i in indices:
+			for j in starting.get(point, []):
+				pairs.add((min(i, j), max(i, j)))
+	return pairs
@@ -0,0 +1,149 @@
+import os
+import hashlib
+import tempfile
+from ComparableSegment import ComparableSegment
+from SegmentArray import SegmentArray
+from SegmentFile import writeIntersections, readIntersections
+from BentleyOttmann import intersectionsList
+
+# Version of the layout of the entries, part of their keys
+_VERSION = b'1'
+# Extension of the files of the entries
+_SUFFIX = '.ints'
+
+class ResultCache(object):
+	'''
+	This class represents an on-disk cache of the results of
+	intersectionsList, so that computing the intersections of a set of
+	segments already seen only costs reading a file.
+
+	Entries are intersection files (see SegmentFile) named after a
+	SHA-256 hash of the normalized coordinates of the segments, in
+	order, and of the options of the computation, so identical inputs
+	hit the same entry whichever process computed it. They store the
+	indices of the segments, which are mapped back to the segments of
+	the input on a hit.
+
+	When the entries take more than max_size bytes, the least recently
+	used ones are removed, their last use being the modification time
+	of their files.
+
+	hits and misses count the lookups which found an entry or not. If
+	bypass is true, the cache is neither read nor written, e.g. to
+	rule it out when debugging.
+
+	Only sets of ComparableSegments (or SegmentArrays) are cached, as
+	intersection files store coordinates as float64 : the exact results
+	of IntegerSegments, or of subclasses, are always computed.
+	'''
+
+	def __init__(self, directory, max_size=1 << 30, bypass=False):
+		'''
+		Initializes a cache storing its entries in directory, which is
+		created if needed.
+		'''
+		os.makedirs(directory, exist_ok=True)
+		self.directory, self.max_size = directory, max_size
+		self.bypass = bypass
+		self.hits, self.misses = 0, 0
+
+	def intersectionsList(self, segments, engine='sweep', snap=None):
+		'''
+		Returns intersectionsList(segments, engine, snap=snap), read
+		from the cache if it holds it, computed and stored otherwise.
+		'''
+		if self.bypass:
+			return intersectionsList(segments, engine, snap=snap)
+		# A SegmentArray is hashed and computed as is, the segments of a
+		# list are only copied into one
+		if isinstance(segments, SegmentArray):
+			array, objects = segments, None
+		else:
+			objects = list(segments)
+			if any(type(s) is not ComparableSegment for s in objects):
+				return intersectionsList(segments, engine, snap=snap)
+			array = SegmentArray.fromSegments(objects)
+		path = self.path(array, engine, snap)
+		# The entry may be evicted by another process between the read
+		# and the update of its time, which is then a miss
+		try:
+			res = readIntersections(path)
+			os.utime(path)
+		except (OSError, ValueError):
+			res = None
+		if res != None:
+			self.hits += 1
+		else:
+			self.misses += 1
+			res = intersectionsList(array, engine, snap=snap)
+			self._store(path, res)
+		if objects != None:
+			res = [((objects[i], objects[j]), inter) for (i, j), inter in res]
+		return res
+
+	def path(self, segments, engine='sweep', snap=None):
+		'''
+		Returns the path of the entry of a SegmentArray, or of a list of
+		ComparableSegments, and options.
+		'''
+		key = hashlib.sha256(b'\0'.join((_VERSION, engine.encode(),
+										 repr(snap).encode(),
+										 repr(ComparableSegment.rounding).encode())))
+		if not isinstance(segments, SegmentArray):
+			segments = SegmentArray.fromSegments(segments)
+		for column in segments.columns():
+			key.update(column.tobytes())
+		return os.path.join(self.directory, key.hexdigest() + _SUFFIX)
+
+	def size(self):
+		'''
+		Returns the number of bytes taken by the entries.
+		'''
+		return sum(size for path, mtime, size in self._entries())
+
+	def clear(self):
+		'''
+		Removes all the entries.
+		'''
+		for path, mtime, size in self._entries():
+			os.remove(path)
+
+	def _store(self, path, res):
+		'''
+		Writes the entry res at path, then evicts the least recently
+		used entries until they fit in max_size.
+		The file is written under a temporary name and then renamed, so
+		that concurrent readers never see a partial entry.
+		'''
+		fd, temporary = tempfile.mkstemp(dir=self.directory)
+		os.close(fd)
+		try:
+			writeIntersections(temporary, res)
+			os.replace(temporary, path)
+		except BaseException:
+			os.remove(temporary)
+			raise
+		entries = sorted(self._entries(), key=lambda e: e[1])
+		total = sum(size for p, mtime, size in entries)
+		for p, mtime, size in entries:
+			if total <= self.max_size:
+				break
+			try:
+				os.remove(p)
+			except FileNotFoundError:
+				pass
+			total -= size
+
+	def _entries(self):
+		'''
+		Returns the list of the entries, as tuples (path, mtime, size).
+		'''
+		res = []
+		for entry in os.scandir(self.directory):
+			if entry.name.endswith(_SUFFIX):
+				try:
+					stat = entry.stat()
+				except FileNotFoundError:
+					continue
+				res.append((entry.path, stat.st_mtime, stat.st_size))
+		return res
@@ -12,8 +12,17 @@ class Segment(object):
 
 	Note that the equation of the line that contains the segment is
 	y = gradient * x + yIntercept
+
+	Segments are hashed by their endpoints, consistently with __eq__,
+	so they must not be modified once initialized. They have no
+	__dict__, only the slots of their coordinates.
 	'''
 
+	__slots__ = ('x1', 'y1', 'x2', 'y2')
+
+	# Kinds of intersection returned by batchIntersectionWith
+	NO_INTERSECTION, POINT, OVERLAP = 0, 1, 2
+
 	def __init__(self, x1, y1, x2, y2):
 		'''
 		x1, y1, x2, y2 must be numbers.
@@ -30,15 +39,21 @@ class Segment(object):
 	def __eq__(self, other):
 		'''
 		Returns true if and only if self and other are equal segments.
-		Two segments are equals if they have the exact same endpoints
+		Two segments are equals if they have the exact same endpoints.
+		A segment is never equal to an object which is not a Segment.
 		'''
-		if other == None:
+		if other is None:
 			return False
 		elif not isinstance(other, Segment):
-			raise TypeError()
-		else:
-			return ((self.x1, self.y1, self.x2, self.y2) == 
-					(other.x1,other.y1,other.x2,other.y2))
+			return NotImplemented
+		return ((self.x1, self.y1, self.x2, self.y2) == 
+				(other.x1,other.y1,other.x2,other.y2))
+
+	def __hash__(self):
+		'''
+		Returns the hash of the endpoints of self.
+		'''
+		return hash((self.x1, self.y1, self.x2, self.y2))
 
 	def __str__(self):
 		'''
@@ -156,4 +171,112 @@ class Segment(object):
 				y = alpha*y1 + (1-alpha)*y2
 				return (x, y)
 			else:
-				return None
\ No newline at end of file
+				return None
+
+	@staticmethod
+	def batchIntersectionWith(segments, others):
+		'''
+		Computes the intersections between segments[i] and others[i]
+		for every i, with NumPy. segments and others can each be a
+		SegmentArray, a list of Segments or a single Segment, which is
+		then intersected with every segment of the other argument.
+
+		Returns a tuple of NumPy arrays (kind, x, y, x2, y2), where
+		kind[i] is one of Segment.NO_INTERSECTION, Segment.POINT and
+		Segment.OVERLAP, and :
+		- (x[i], y[i]) is the intersection point if it is a point
+		- [(x[i], y[i]);(x2[i], y2[i])] is the intersection if it is
+		a segment.
+		Unused coordinates are NaN.
+
+		Results are the same as the ones of intersectionWith, as the
+		same floating point operations are performed in the same order.
+		'''
+		import numpy as np
+		x1, y1, x2, y2 = Segment._batchColumns(segments)
+		x3, y3, x4, y4 = Segment._batchColumns(others)
+		x1, y1, x2, y2, x3, y3, x4, y4 = np.broadcast_arrays(
+			x1, y1, x2, y2, x3, y3, x4, y4)
+		n = x1.shape[0]
+		kind = np.zeros(n, dtype=np.int8)
+		rx, ry = np.full(n, np.nan), np.full(n, np.nan)
+		rx2, ry2 = np.full(n, np.nan), np.full(n, np.nan)
+
+		with np.errstate(divide='ignore', invalid='ignore'):
+			gradient_ratio = (y1-y2)*(x3-x4) - (x1-x2)*(y3-y4)
+			parallel = gradient_ratio == 0
+
+			# Non parallel segments : barycentric coordinates
+			alpha = ((y3-y4)*(x2-x4) - (x3-x4)*(y2-y4)) / gradient_ratio
+			beta = ((y1-y2)*(x2-x4) - (x1-x2)*(y2-y4)) / gradient_ratio
+			hit = (~parallel & (0 <= alpha) & (alpha <= 1) &
+				   (0 <= beta) & (beta <= 1))
+			kind[hit] = Segment.POINT
+			rx[hit] = alpha[hit]*x1[hit] + (1-alpha[hit])*x2[hit]
+			ry[hit] = alpha[hit]*y1[hit] + (1-alpha[hit])*y2[hit]
+
+			# Parallel segments : keeps the ones on the same line
+			vert = x1 == x2
+			intercept = y1 - ((y2-y1) / (x2-x1))*x1
+			other_intercept = y3 - ((y4-y3) / (x4-x3))*x3
+			same_line = parallel & np.where(vert, x1 == x3,
+											intercept == other_intercept)
+			# Computes the endpoints of the intersection by projecting
+			# the segments' endpoints on one another.
+			ep1x, ep1y = Segment._batchProjection(x1, y1, x2, y2, x3, y3)
+			alt_x, alt_y = Segment._batchProjection(x3, y3, x4, y4, x1, y1)
+			missing = np.isnan(ep1x)
+			ep1x[missing], ep1y[missing] = alt_x[missing], alt_y[missing]
+			ep2x, ep2y = Segment._batchProjection(x1, y1, x2, y2, x4, y4)
+			alt_x, alt_y = Segment._batchProjection(x3, y3, x4, y4, x2, y2)
+			missing = np.isnan(ep2x)
+			ep2x[missing], ep2y[missing] = alt_x[missing], alt_y[missing]
+			same_line &= ~(np.isnan(ep1x) | np.isnan(ep2x))
+
+		point = same_line & (ep1x == ep2x) & (ep1y == ep2y)
+		kind[point] = Segment.POINT
+		rx[point], ry[point] = ep1x[point], ep1y[point]
+		overlap = same_line & ~point
+		kind[overlap] = Segment.OVERLAP
+		# Orders the endpoints of overlaps as Segment.__init__ does
+		first = (ep1x < ep2x) | ((ep1x == ep2x) & (ep1y < ep2y))
+		rx[overlap] = np.where(first, ep1x, ep2x)[overlap]
+		ry[overlap] = np.where(first, ep1y, ep2y)[overlap]
+		rx2[overlap] = np.where(first, ep2x, ep1x)[overlap]
+		ry2[overlap] = np.where(first, ep2y, ep1y)[overlap]
+		return kind, rx, ry, rx2, ry2
+
+	@staticmethod
+	def _batchColumns(segments):
+		'''
+		Returns the coordinates x1, y1, x2, y2 of segments as 4 NumPy
+		arrays, segments being a Segment, a list of Segments or any
+		object with a columns() method such as SegmentArray.
+		'''
+		import numpy as np
+		if isinstance(segments, Segment):
+			return tuple(np.array([c], dtype=np.float64) for c in 
+						 (segments.x1, segments.y1, segments.x2, segments.y2))
+		elif hasattr(segments, 'columns'):
+			return tuple(np.asarray(c, dtype=np.float64) 
+						 for c in segments.columns())
+		else:
+			coordinates = np.array([(s.x1, s.y1, s.x2, s.y2) for s in segments],
+								   dtype=np.float64).reshape(-1, 4)
+			return tuple(coordinates[:, k] for k in range(4))
+
+	@staticmethod
+	def _batchProjection(x1, y1, x2, y2, xp, yp):
+		'''
+		Vectorized version of orthogonalProjectionOf : returns the
+		coordinates of the projections of points (xp, yp) on segments
+		[(x1, y1);(x2, y2)] as 2 arrays, which are NaN where the
+		projection does not exist.
+		'''
+		import numpy as np
+		ABx, ABy = x2 - x1, y2 - y1
+		APx, APy = xp - x1, yp - y1
+		ratio = (ABx*APx + ABy*APy) / (ABx**2 + ABy**2)
+		inside = (0 <= ratio) & (ratio <= 1)
+		return (np.where(inside, x1 + ratio*ABx, np.nan),
+				np.where(inside, y1 + ratio*ABy, np.nan))
@@ -0,0 +1,155 @@
+from array import array
+from ComparableSegment import ComparableSegment
+
+class RowSegment(ComparableSegment):
+	'''
+	This class represents the ComparableSegment of a row of a
+	SegmentArray, which knows the index row of the row.
+	'''
+
+	__slots__ = ('row',)
+
+	def __init__(self, x1, y1, x2, y2, row=None):
+		'''
+		See ComparableSegment.__init__
+		'''
+		ComparableSegment.__init__(self, x1, y1, x2, y2)
+		self.row = row
+
+class SegmentArray(object):
+	'''
+	This class represents a set of N segments stored column-wise, in 4
+	contiguous arrays of float64 named x1, y1, x2 and y2.
+	The i-th segment of the set is [(x1[i], y1[i]);(x2[i], y2[i])].
+
+	Just like a Segment, each row is normalized when the set is
+	initialized, so that (x1[i], y1[i]) is the left endpoint and
+	(x2[i], y2[i]) the right endpoint of the i-th segment.
+
+	Storing coordinates this way costs 32 bytes per segment, where a
+	list of ComparableSegments costs an object of about 230 bytes per
+	segment. ComparableSegments are only created on demand, when
+	indexing or iterating over the set.
+
+	Note that a segment is identified by its index i in the set, which
+	is what intersectionsList reports when given a SegmentArray. The
+	sweep reads the endpoints of the rows from the columns, and only
+	creates the RowSegment of a row while the sweep line crosses it
+	(see EventQueue).
+
+	A SegmentArray can also wrap packed rows without copying them (see
+	fromBuffer), in which case its columns are strided memoryviews
+	rather than arrays.
+	'''
+
+	def __init__(self, x1=(), y1=(), x2=(), y2=(), normalize=True):
+		'''
+		Initializes a new set of segments from 4 sequences of numbers
+		of the same length.
+		If normalize is true, rows are reordered so that the left
+		endpoint comes first, and a ValueError is raised if one of the
+		rows is a point. Only pass normalize=False for data which is
+		known to be normalized already.
+		'''
+		self.x1, self.y1 = array('d', x1), array('d', y1)
+		self.x2, self.y2 = array('d', x2), array('d', y2)
+		if not (len(self.x1) == len(self.y1) == len(self.x2) == len(self.y2)):
+			raise ValueError('Columns must have the same length')
+		if normalize:
+			self.normalize()
+
+	@classmethod
+	def fromCoordinates(cls, rows):
+		'''
+		Returns a new SegmentArray from an iterable of rows
+		(x1, y1, x2, y2).
+		'''
+		x1, y1, x2, y2 = array('d'), array('d'), array('d'), array('d')
+		for row in rows:
+			x1.append(row[0])
+			y1.append(row[1])
+			x2.append(row[2])
+			y2.append(row[3])
+		return cls(x1, y1, x2, y2)
+
+	@classmethod
+	def fromSegments(cls, segments):
+		'''
+		Returns a new SegmentArray containing the coordinates of an
+		iterable of Segments.
+		'''
+		return cls.fromCoordinates((s.x1, s.y1, s.x2, s.y2) for s in segments)
+
+	@classmethod
+	def fromBuffer(cls, buffer):
+		'''
+		Returns a new SegmentArray sharing the memory of a buffer (e.g.
+		a bytearray or an mmap) of packed rows (x1, y1, x2, y2) of
+		native float64. Its columns are strided memoryviews over the
+		buffer, so nothing is copied, and rows are not normalized : they
+		must already be.
+		'''
+		view = memoryview(buffer).cast('B')
+		if len(view) % 32 != 0:
+			raise ValueError('Buffer size is not a multiple of 32 bytes')
+		view = view.cast('d')
+		res = cls.__new__(cls)
+		res.x1, res.y1, res.x2, res.y2 = (view[k::4] for k in range(4))
+		return res
+
+	def normalize(self):
+		'''
+		Reorders the endpoints of every row so that (x1, y1) is the left
+		endpoint, like Segment.__init__ does.
+		Raises ValueError if one of the rows is a point.
+		'''
+		x1, y1, x2, y2 = self.x1, self.y1, self.x2, self.y2
+		# Finds the rows whose endpoints are in the wrong order in a
+		# single pass, then swaps them.
+		swapped = [i for i in range(len(x1))
+				   if (x1[i], y1[i]) >= (x2[i], y2[i])]
+		for i in swapped:
+			if (x1[i], y1[i]) == (x2[i], y2[i]):
+				raise ValueError(
+					'Invalid coordinates (segment {} is a point)'.format(i))
+			x1[i], x2[i] = x2[i], x1[i]
+			y1[i], y2[i] = y2[i], y1[i]
+
+	def __len__(self):
+		'''
+		Returns the number of segments in self.
+		'''
+		return len(self.x1)
+
+	def __getitem__(self, i):
+		'''
+		Returns a new ComparableSegment corresponding to the i-th row.
+		'''
+		return ComparableSegment(self.x1[i], self.y1[i], self.x2[i], self.y2[i])
+
+	def rowSegment(self, i):
+		'''
+		Returns a new RowSegment corresponding to the i-th row.
+		'''
+		return RowSegment(self.x1[i], self.y1[i], self.x2[i], self.y2[i], i)
+
+	def __iter__(self):
+		'''
+		Iterates over the rows of self, creating a ComparableSegment
+		for each of them.
+		'''
+		for row in zip(self.x1, self.y1, self.x2, self.y2):
+			yield ComparableSegment(*row)
+
+	def __str__(self):
+		'''
+		Returns a human readable string describing self.
+		'''
+		return 'SegmentArray of {} segments'.format(len(self))
+
+	def columns(self):
+		'''
+		Returns the 4 arrays x1, y1, x2, y2. For performance purposes,
+		they are not copied.
+		'''
+		return self.x1, self.y1, self.x2, self.y2
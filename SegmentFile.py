@@ -0,0 +1,126 @@
+'''
+Binary files of segments and of intersections.
+
+A segment file is a 16 bytes header, made of the magic number
+SEGMENT_MAGIC and the number N of segments as a little endian uint64,
+followed by N rows of 4 little endian float64 x1, y1, x2, y2, each row
+being normalized as Segment.__init__ does.
+
+An intersection file is a header made of INTERSECTION_MAGIC and the
+number of intersections, followed by rows of 2 little endian int64
+i, j and 4 little endian float64 x, y, x2, y2, describing the
+intersection between the segments of indices i and j : the point
+(x, y) if x2 and y2 are NaN, the segment [(x, y);(x2, y2)] otherwise.
+'''
+import sys
+import mmap
+import struct
+from array import array
+from Segment import Segment
+from SegmentArray import SegmentArray
+
+SEGMENT_MAGIC = b'BOSEGS01'
+INTERSECTION_MAGIC = b'BOINTS01'
+
+_HEADER = struct.Struct('<8sQ')
+_SEGMENT = struct.Struct('<4d')
+_INTERSECTION = struct.Struct('<2q4d')
+_NAN = float('nan')
+
+def writeSegments(path, segments):
+	'''
+	Writes segments, a SegmentArray or an iterable of Segments, to a
+	segment file, and returns the number of segments written.
+	'''
+	if isinstance(segments, SegmentArray):
+		rows = zip(*segments.columns())
+	else:
+		rows = ((s.x1, s.y1, s.x2, s.y2) for s in segments)
+	return _writeRecords(path, SEGMENT_MAGIC, _SEGMENT, rows)
+
+def readSegments(path):
+	'''
+	Returns a SegmentArray of the segments of a segment file.
+
+	The file is memory-mapped and the SegmentArray reads its rows in
+	place (see SegmentArray.fromBuffer) : opening a file costs the same
+	whatever its size, ComparableSegments are only created when rows
+	are accessed, and processes reading the same file share the pages
+	of the system's cache.
+	'''
+	with open(path, 'rb') as f:
+		count = _readHeader(f, SEGMENT_MAGIC, _SEGMENT.size, path)
+		if count == 0:
+			return SegmentArray()
+		data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+	rows = memoryview(data)[_HEADER.size:_HEADER.size + count*_SEGMENT.size]
+	if sys.byteorder != 'little':
+		rows = array('d', rows.tobytes())
+		rows.byteswap()
+	return SegmentArray.fromBuffer(rows)
+
+def writeIntersections(path, intersections):
+	'''
+	Writes intersections to an intersection file, and returns the
+	number of intersections written. intersections is an iterable of
+	tuples ((i, j), inter) such as the ones intersectionsList returns
+	for a SegmentArray, which is consumed as it is written.
+	'''
+	def rows():
+		for (i, j), inter in intersections:
+			if isinstance(inter, Segment):
+				yield (i, j, inter.x1, inter.y1, inter.x2, inter.y2)
+			else:
+				yield (i, j, inter[0], inter[1], _NAN, _NAN)
+	return _writeRecords(path, INTERSECTION_MAGIC, _INTERSECTION, rows())
+
+def readIntersections(path):
+	'''
+	Returns the list of the intersections of an intersection file, as
+	tuples ((i, j), inter) where inter is either a point (x, y) or a
+	Segment.
+	'''
+	with open(path, 'rb') as f:
+		count = _readHeader(f, INTERSECTION_MAGIC, _INTERSECTION.size, path)
+		data = f.read(count*_INTERSECTION.size)
+	res = []
+	for i, j, x, y, x2, y2 in _INTERSECTION.iter_unpack(data):
+		if x2 != x2:
+			res.append(((i, j), (x, y)))
+		else:
+			res.append(((i, j), Segment(x, y, x2, y2)))
+	return res
+
+def _writeRecords(path, magic, record, rows):
+	'''
+	Writes a header and the packed rows to a file. The number of rows
+	is written in the header once they all are, so rows can be any
+	iterable.
+	'''
+	count = 0
+	with open(path, 'wb') as f:
+		f.write(_HEADER.pack(magic, 0))
+		pack, write = record.pack, f.write
+		for row in rows:
+			write(pack(*row))
+			count += 1
+		f.seek(0)
+		f.write(_HEADER.pack(magic, count))
+	return count
+
+def _readHeader(f, magic, size, path):
+	'''
+	Reads the header of a file, and returns the number of records it
+	announces. Raises a ValueError if the file is not of the expected
+	kind, or is truncated.
+	'''
+	header = f.read(_HEADER.size)
+	if len(header) != _HEADER.size or header[:8] != magic:
+		raise ValueError('{} is not a {} file'.format(
+			path, 'segment' if magic == SEGMENT_MAGIC else 'intersection'))
+	count = _HEADER.unpack(header)[1]
+	f.seek(0, 2)
+	if f.tell() < _HEADER.size + count*size:
+		raise ValueError('{} is truncated'.format(path))
+	f.seek(_HEADER.size)
+	return count
@@ -0,0 +1,328 @@
+from random import Random
+from ComparableSegment import ComparableSegment
+
+# Maximum height of the nodes, enough for 2**MAX_HEIGHT segments
+MAX_HEIGHT = 32
+
+class _Node(object):
+	'''
+	Node of a SkipListSweepLine, holding a segment, and for each of
+	its levels, the next and previous nodes at this level and the
+	number of level 0 links between self and the next node.
+	'''
+
+	__slots__ = ('seg', 'next', 'prev', 'width')
+
+	def __init__(self, seg, height):
+		self.seg = seg
+		self.next = [None] * height
+		self.prev = [None] * height
+		self.width = [0] * height
+
+class SkipListSweepLine(object):
+	'''
+	This class represents the sweep line of the Bentley-Ottmann
+	algorithm, with the same interface as SweepLine, on top of an
+	indexable skip list instead of a SortedList.
+
+	Inserting a segment returns its node, which is kept as a handle,
+	in a dict indexed by the id of the segment. Finding a segment thus
+	needs neither a bisection nor comparisons, which SweepLine needs
+	and which only work if ComparableSegment.currentX has the right
+	value :
+	- the segments below and above a segment are found in O(1), the
+	lowest level of the skip list being a doubly linked list
+	- a segment is removed in O(log(N)), its nodes being unlinked
+	from their neighbours at each level
+	- segments are reordered by swapping the segments of their nodes
+	- the position of a segment, used to order segments, is found in
+	O(log(N)) by summing the widths of the links up to the head
+
+	Only inserting a segment, or looking for a y-coordinate, compares
+	segments, descending the levels of the skip list in O(log(N)).
+	'''
+
+	def __init__(self):
+		'''
+		Initializes an empty sweep line.
+		'''
+		self.head = _Node(None, MAX_HEIGHT)
+		# Number of levels in use
+		self.height = 1
+		self.head.width[0] = 1
+		self.size = 0
+		# Nodes, indexed by the id of their segments
+		self.nodes = {}
+		# Heights of the nodes are drawn from a private generator, so
+		# that runs can be reproduced
+		self.random = Random(0)
+		# x-coordinate of the sweep line's current position
+		self.x = 0
+
+	def isEmpty(self):
+		'''
+		Returns true if and only if the sweep line is empty.
+		'''
+		return self.size == 0
+
+	def __len__(self):
+		'''
+		Returns the number of segments in the sweep line.
+		'''
+		return self.size
+
+	def __iter__(self):
+		'''
+		Iterates over the segments of the sweep line, from the lowest
+		to the highest.
+		'''
+		node = self.head.next[0]
+		while node != None:
+			yield node.seg
+			node = node.next[0]
+
+	def addSegment(self, seg, x=None):
+		'''
+		Adds seg to the sweep line, at x-coordinate x (by default, the
+		x-coordinate of seg's left endpoint), after the segments equal
+		to it, and returns its node, which is also kept in self.nodes.
+		'''
+		if x == None:
+			x = seg.x1
+		self.x = x
+		ComparableSegment.currentX = x
+		height = self._randomHeight()
+		if height > self.height:
+			for level in range(self.height, height):
+				self.head.width[level] = self.size + 1
+			self.height = height
+		# Finds the last node before seg at each level, and its rank
+		chain, ranks = [None] * self.height, [0] * self.height
+		node, rank = self.head, 0
+		for level in range(self.height - 1, -1, -1):
+			succ = node.next[level]
+			while succ != None and not seg < succ.seg:
+				rank += node.width[level]
+				node, succ = succ, succ.next[level]
+			chain[level], ranks[level] = node, rank
+		# Links the new node, at rank ranks[0] + 1
+		new = _Node(seg, height)
+		rank = ranks[0] + 1
+		for level in range(height):
+			prev = chain[level]
+			succ = prev.next[level]
+			new.next[level], new.prev[level] = succ, prev
+			if succ != None:
+				succ.prev[level] = new
+			prev.next[level] = new
+			new.width[level] = ranks[level] + prev.width[level] + 1 - rank
+			prev.width[level] = rank - ranks[level]
+		for level in range(height, self.height):
+			chain[level].width[level] += 1
+		self.size += 1
+		self.nodes[id(seg)] = new
+		return new
+
+	def removeSegment(self, seg):
+		'''
+		Removes seg from the sweep line.
+		'''
+		node = self._nodeOf(seg)
+		del self.nodes[id(seg)]
+		height = len(node.next)
+		for level in range(height):
+			prev, succ = node.prev[level], node.next[level]
+			prev.next[level] = succ
+			if succ != None:
+				succ.prev[level] = prev
+			prev.width[level] += node.width[level] - 1
+		# Shortens the links passing over the node
+		prev = node.prev[height - 1]
+		for level in range(height, self.height):
+			while len(prev.next) <= level:
+				prev = prev.prev[len(prev.next) - 1]
+			prev.width[level] -= 1
+		self.size -= 1
+
+	def removeSegments(self, segments):
+		'''
+		Removes segments from the sweep line.
+		'''
+		for seg in segments:
+			self.removeSegment(seg)
+
+	def segmentBelow(self, seg):
+		'''
+		Returns the segment just below seg in the sweep line, or None
+		if seg is the lowest one.
+		'''
+		return self._nodeOf(seg).prev[0].seg
+
+	def segmentAbove(self, seg):
+		'''
+		Returns the segment just above seg in the sweep line, or None
+		if seg is the highest one.
+		'''
+		succ = self._nodeOf(seg).next[0]
+		return succ.seg if succ != None else None
+
+	def segmentsAround(self, y, x):
+		'''
+		Returns a tuple (below, above) containing the highest segment
+		of the sweep line whose y-coordinate at x-coordinate x is lower
+		than y, and the lowest one whose y-coordinate is greater or
+		equal to y. Each of them is None if it does not exist.
+		'''
+		self.x = x
+		node = self._lastBelow(y, x)
+		succ = node.next[0]
+		return (node.seg, succ.seg if succ != None else None)
+
+	def order(self, segments):
+		'''
+		Returns the list of segments, which must be in the sweep line,
+		sorted by increasing position in the sweep line.
+		'''
+		return sorted(segments, key=self._rankOf)
+
+	def belowSegments(self, seg):
+		'''
+		See SweepLine.belowSegments
+		'''
+		res = []
+		ComparableSegment.currentX = self.x
+		node = self._nodeOf(seg).prev[0]
+		while node.seg != None:
+			if node.seg.isBelow(seg):
+				res.append(node.seg)
+				node = node.prev[0]
+				break
+			node = node.prev[0]
+		while res and node.seg != None and not node.seg.isBelow(res[0]):
+			res.append(node.seg)
+			node = node.prev[0]
+		return res
+
+	def aboveSegments(self, seg):
+		'''
+		See SweepLine.aboveSegments
+		'''
+		res = []
+		ComparableSegment.currentX = self.x
+		node = self._nodeOf(seg).next[0]
+		while node != None:
+			if seg.isBelow(node.seg):
+				res.append(node.seg)
+				node = node.next[0]
+				break
+			node = node.next[0]
+		while res and node != None and not res[0].isBelow(node.seg):
+			res.append(node.seg)
+			node = node.next[0]
+		return res
+
+	def sameLevelAs(self, seg):
+		'''
+		See SweepLine.sameLevelAs
+		'''
+		ComparableSegment.currentX = self.x
+		start = self._nodeOf(seg)
+		res = [seg]
+		node = start.next[0]
+		while node != None and not seg.isBelow(node.seg):
+			res.append(node.seg)
+			node = node.next[0]
+		node = start.prev[0]
+		while node.seg != None and not node.seg.isBelow(seg):
+			res.append(node.seg)
+			node = node.prev[0]
+		return res
+
+	def betweenY(self, y_inf, y_sup, x):
+		'''
+		Returns a list of all the segments intersecting the sweep line
+		between y-coordinates y_inf and y_sup included, at
+		x-coordinate x, in O(log(N) + K), K being the number of
+		segments returned.
+		'''
+		self.x = x
+		ComparableSegment.currentX = x
+		res = []
+		node = self._lastBelow(y_inf, x).next[0]
+		while node != None and node.seg.yAtX(x) <= y_sup:
+			res.append(node.seg)
+			node = node.next[0]
+		return res
+
+	def firstAtOrAbove(self, y, x):
+		'''
+		Returns the index of the first segment of the sweep line whose
+		y-coordinate at x-coordinate x is greater or equal to y, or
+		the length of the sweep line if there is none.
+		'''
+		return self._rank(self._lastBelow(y, x))
+
+	def revertOrder(self, x, segments):
+		'''
+		Reverse the order of segments in the sweep line, at coord (x, y),
+		by swapping the segments of their nodes.
+		'''
+		self.x = x
+		nodes = sorted((self._nodeOf(seg) for seg in segments), key=self._rank)
+		ordered = [node.seg for node in nodes]
+		for node, seg in zip(nodes, reversed(ordered)):
+			node.seg = seg
+			self.nodes[id(seg)] = node
+
+	def _nodeOf(self, seg):
+		'''
+		Returns the node of seg, raising ValueError if seg is not in the
+		sweep line.
+		'''
+		node = self.nodes.get(id(seg))
+		if node == None:
+			raise ValueError('Segment is not in the sweep line')
+		return node
+
+	def _rankOf(self, seg):
+		'''
+		Returns the position of seg in the sweep line, starting from 1.
+		'''
+		return self._rank(self._nodeOf(seg))
+
+	def _rank(self, node):
+		'''
+		Returns the position of node in the sweep line, starting from 1,
+		summing the widths of the links from the head to node along its
+		highest levels.
+		'''
+		rank = 0
+		while node is not self.head:
+			level = len(node.next) - 1
+			node = node.prev[level]
+			rank += node.width[level]
+		return rank
+
+	def _lastBelow(self, y, x):
+		'''
+		Returns the node of the highest segment whose y-coordinate at x
+		is lower than y, or the head if there is none.
+		'''
+		node = self.head
+		for level in range(self.height - 1, -1, -1):
+			succ = node.next[level]
+			while succ != None and succ.seg.yAtX(x) < y:
+				node, succ = succ, succ.next[level]
+		return node
+
+	def _randomHeight(self):
+		'''
+		Returns the height of a new node, which is h with probability
+		2**-h.
+		'''
+		bits = self.random.getrandbits(MAX_HEIGHT - 1)
+		height = 1
+		while bits & 1:
+			height += 1
+			bits >>= 1
+		return height
@@ -1,4 +1,4 @@
-from math import floor
+from bisect import bisect_left
 from sortedcontainers import SortedList
 from ComparableSegment import ComparableSegment
 
@@ -23,6 +23,13 @@ class SweepLine(object):
 	module, which has several advantages that you can discover by browsing
 	its page. It allows O(log(N)) insertion, deletion and swapping, and I
 	find it to be faster in practice.
+
+	Segments are looked up by bisection, then by identity around the
+	bisection point (see _indexOf), as comparisons are ambiguous
+	between segments crossing at the sweep line. Lookups are thus in
+	O(log(N)) as long as rounding errors do not make the bisection land
+	far from the segment. SkipListSweepLine keeps a handle on the node
+	of each segment instead, and never needs lookups.
 	'''
 
 	def __init__(self):
@@ -30,6 +37,8 @@ class SweepLine(object):
 		Initializes an empty sweep line.
 		'''
 		self.l = SortedList()
+		# x-coordinate of the sweep line's current position
+		self.x = 0
 
 	def isEmpty(self):
 		'''
@@ -37,18 +46,80 @@ class SweepLine(object):
 		'''
 		return len(self.l) == 0
 
-	def addSegment(self, seg):
+	def __len__(self):
+		'''
+		Returns the number of segments in the sweep line.
+		'''
+		return len(self.l)
+
+	def __iter__(self):
+		'''
+		Iterates over the segments of the sweep line, from the lowest
+		to the highest.
+		'''
+		return iter(self.l)
+
+	def addSegment(self, seg, x=None):
 		'''
-		Adds seg to the sweep line.
+		Adds seg to the sweep line, at x-coordinate x (by default, the
+		x-coordinate of seg's left endpoint).
 		'''
-		ComparableSegment.currentX = seg.x1 
+		if x == None:
+			x = seg.x1
+		self.x = x
+		ComparableSegment.currentX = x
 		self.l.add(seg)
 
 	def removeSegment(self, seg):
 		'''
 		Removes seg from the sweep line.
 		'''
-		self.l.remove(seg)
+		del self.l[self._indexOf(seg)]
+
+	def removeSegments(self, segments):
+		'''
+		Removes segments from the sweep line. Their indices are looked
+		up together (see _indicesOf), which is faster than removing
+		them one by one when they go through the same point.
+		'''
+		for i in sorted(self._indicesOf(segments).values(), reverse=True):
+			del self.l[i]
+
+	def segmentBelow(self, seg):
+		'''
+		Returns the segment just below seg in the sweep line, or None
+		if seg is the lowest one.
+		'''
+		i = self._indexOf(seg)
+		return self.l[i-1] if i > 0 else None
+
+	def segmentAbove(self, seg):
+		'''
+		Returns the segment just above seg in the sweep line, or None
+		if seg is the highest one.
+		'''
+		i = self._indexOf(seg)
+		return self.l[i+1] if i+1 < len(self.l) else None
+
+	def segmentsAround(self, y, x):
+		'''
+		Returns a tuple (below, above) containing the highest segment
+		of the sweep line whose y-coordinate at x-coordinate x is lower
+		than y, and the lowest one whose y-coordinate is greater or
+		equal to y. Each of them is None if it does not exist.
+		'''
+		self.x = x
+		i = self.firstAtOrAbove(y, x)
+		return (self.l[i-1] if i > 0 else None,
+				self.l[i] if i < len(self.l) else None)
+
+	def order(self, segments):
+		'''
+		Returns the list of segments, which must be in the sweep line,
+		sorted by increasing position in the sweep line.
+		'''
+		index = self._indicesOf(segments)
+		return sorted(segments, key=lambda seg: index[id(seg)])
 
 	def belowSegments(self, seg):
 		'''
@@ -61,7 +132,8 @@ class SweepLine(object):
 		'''
 		res = []
 		# i = index of seg
-		i = self.l.index(seg)
+		ComparableSegment.currentX = self.x
+		i = self._indexOf(seg)
 		# Passes segments which have same y-coordinate and gradient
 		# to find s_below
 		while i-1 >= 0:
@@ -91,7 +163,8 @@ class SweepLine(object):
 		'''
 		res = []
 		# i = index of seg
-		i = self.l.index(seg)
+		ComparableSegment.currentX = self.x
+		i = self._indexOf(seg)
 		# Passes segments which have same y-coordinate and gradient
 		# to find s_above
 		while i+1 < len(self.l):
@@ -117,7 +190,8 @@ class SweepLine(object):
 		both false, i.e. all the segments with same y-coordinate at 
 		ComparableSegment.currentX and gradient as seg.
 		'''
-		i = self.l.index(seg)
+		ComparableSegment.currentX = self.x
+		i = self._indexOf(seg)
 		res = [self.l[i]]
 		# Looks for same level segments above
 		j = i + 1
@@ -135,33 +209,94 @@ class SweepLine(object):
 		'''
 		Returns a list of all the segments intersecting the sweep line
 		between y-coordinates y_inf and y_sup included, at 
-		x-coordinate x
+		x-coordinate x.
+
+		As segments are sorted by y-coordinate at x, the first of them
+		is found by bisection, so this runs in O(log(N) + K), K being
+		the number of segments returned.
 		'''
+		self.x = x
 		ComparableSegment.currentX = x
 		res = []
-		i = 0
-		# Passes segments whose y-coordinate is < y_inf
-		while i < len(self.l) and self.l[i].yAtX(x) < y_inf:
-			i += 1
-		while i < len(self.l) and self.l[i].yAtX(x) <= y_sup:
-			res.append(self.l[i])
-			i += 1
-
+		for seg in self.l.islice(self.firstAtOrAbove(y_inf, x)):
+			if seg.yAtX(x) > y_sup:
+				break
+			res.append(seg)
 		return res
 
+	def firstAtOrAbove(self, y, x):
+		'''
+		Returns the index of the first segment of the sweep line whose
+		y-coordinate at x-coordinate x is greater or equal to y, or 
+		the length of the sweep line if there is none.
+		'''
+		return bisect_left(self.l, y, key=lambda seg: seg.yAtX(x))
+
 	def revertOrder(self, x, segments):
 		'''
 		Reverse the order of segments in the sweep line, at coord (x, y).
+		The segments must be adjacent in the sweep line and cross at
+		(x, y), so that their order just after the crossing, by
+		gradient, is the reverse of their order before : they are
+		removed, pinned at (x, y), and inserted back.
 		'''
-		indices = []
-		for seg in segments:
-			ComparableSegment.currentX = seg.x1
-			indices.append(self.l.index(seg))
-		# Update segments currentX so that the swap keep sort order
+		self.x = x
+		indices = sorted((self._indexOf(seg) for seg in segments), reverse=True)
+		removed = [self.l.pop(i) for i in indices]
+		if removed == []:
+			return
+		y = removed[-1].yAtX(x)
 		ComparableSegment.currentX = x
-		# Swaps the segments
-		for i in range(floor(len(segments)/2)):
-			i1 = indices[i]
-			i2 = indices[-i-1]
-			self.l[i1] = segments[-i-1]
-			self.l[i2] = segments[i]
\ No newline at end of file
+		for seg in removed:
+			seg.pin(x, y)
+			self.l.add(seg)
+
+	def _indexOf(self, seg):
+		'''
+		Returns the index of seg in the sweep line, at its current
+		position. This runs in O(log(N) + D), D being the distance
+		between the bisection point and seg, which is only large when
+		rounding errors make many segments compare inconsistently with
+		seg, and then up to N.
+		'''
+		ComparableSegment.currentX = self.x
+		return self._indexNear(seg, self.l.bisect_left(seg))
+
+	def _indicesOf(self, segments):
+		'''
+		Returns a dict of the indices of segments in the sweep line,
+		indexed by their ids. Segments going through the same point
+		compare as equal when they have the same gradient, and
+		_indexOf then looks for each of them among all the others :
+		instead, they are all looked for at increasing distance from the
+		lowest of their bisection points. This runs in
+		O(K*log(N) + D), K being the number of segments and D their
+		span in the sweep line.
+		'''
+		res = {}
+		if len(segments) == 0:
+			return res
+		ComparableSegment.currentX = self.x
+		missing = set(map(id, segments))
+		i = min(self.l.bisect_left(seg) for seg in segments)
+		for d in range(len(self.l) + 1):
+			for j in ((i,) if d == 0 else (i + d, i - d)):
+				if 0 <= j < len(self.l) and id(self.l[j]) in missing:
+					missing.discard(id(self.l[j]))
+					res[id(self.l[j])] = j
+			if len(missing) == 0:
+				return res
+		raise ValueError('Segment is not in the sweep line')
+
+	def _indexNear(self, seg, i):
+		'''
+		Returns the index of seg in the sweep line, looking for it
+		at increasing distance from index i. Unlike SortedList.index,
+		this does not rely on comparisons, which are ambiguous between
+		segments crossing at ComparableSegment.currentX.
+		'''
+		for d in range(len(self.l) + 1):
+			for j in (i - d, i + d):
+				if 0 <= j < len(self.l) and self.l[j] is seg:
+					return j
+		raise ValueError('Segment is not in the sweep line')
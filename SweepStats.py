@@ -0,0 +1,177 @@
+from time import perf_counter
+
+class SweepStats(object):
+	'''
+	This class collects statistics about a run of the sweep, when
+	passed as stats to intersectionsList, iterIntersections or
+	countIntersections :
+	- events : number of events processed
+	- event_kinds : number of events containing left endpoints, right
+	endpoints, inner intersections, low and high endpoints of vertical
+	segments, indexed by 'left', 'right', 'inner', 'low' and 'high'
+	- peak_sweep_line, peak_queue : greatest numbers of segments in the
+	sweep line and of events in the queue, after an event
+	- comparisons : number of comparisons between segments (__lt__ and
+	isBelow calls)
+	- intersection_tests, intersection_hits : number of calls to
+	intersectionWith, and of those which found an intersection
+	- intersections : number of intersections reported
+	- times : time (s) spent in each block of the main loop, indexed by
+	'queue' (popping events), 'vertical' (vertical low endpoints),
+	'report' (segments passing through events), 'update' (sweep line
+	update), 'schedule' (following intersections) and 'output'
+	(consuming the intersections)
+
+	If callback is not None, callback(stats) is called every every
+	events, and once at the end of the run, so that the statistics can
+	be streamed while the sweep runs.
+
+	Comparisons and intersection tests are counted by sweeping copies
+	of the segments (see counted), whose classes are subclasses of the
+	segments' classes counting the calls in self. The classes of the
+	segments are never patched : only the observed run is counted,
+	whatever other sweeps run meanwhile, and sweeps without a SweepStats
+	are not slowed down.
+	'''
+
+	def __init__(self, callback=None, every=1000):
+		'''
+		Initializes empty statistics.
+		'''
+		self.callback, self.every = callback, every
+		self.events = 0
+		self.event_kinds = dict.fromkeys(('left', 'right', 'inner', 'low', 'high'), 0)
+		self.peak_sweep_line, self.peak_queue = 0, 0
+		self.comparisons = 0
+		self.intersection_tests, self.intersection_hits = 0, 0
+		self.intersections = 0
+		self.times = dict.fromkeys(('queue', 'vertical', 'report', 'update',
+									'schedule', 'output'), 0)
+		self._last = None
+		# Counting subclasses, indexed by the classes they derive from
+		self._classes = {}
+
+	def hitRate(self):
+		'''
+		Returns the ratio of intersectionWith calls which found an
+		intersection, or None if there was none.
+		'''
+		if self.intersection_tests == 0:
+			return None
+		return self.intersection_hits / self.intersection_tests
+
+	def asDict(self):
+		'''
+		Returns the statistics as a dictionary, which can be saved as
+		JSON.
+		'''
+		return {'events': self.events,
+				'event_kinds': dict(self.event_kinds),
+				'peak_sweep_line': self.peak_sweep_line,
+				'peak_queue': self.peak_queue,
+				'comparisons': self.comparisons,
+				'intersection_tests': self.intersection_tests,
+				'intersection_hits': self.intersection_hits,
+				'intersections': self.intersections,
+				'times': dict(self.times)}
+
+	def __str__(self):
+		'''
+		Returns a human readable string describing the statistics.
+		'''
+		rate = self.hitRate()
+		return ('{} events ({}), peak sizes : {} segments in the sweep line,'
+				' {} events in the queue\n'
+				'{} comparisons, {} intersection tests ({} hit rate), '
+				'{} intersections\n'
+				'times : {}').format(
+			self.events,
+			', '.join('{} {}'.format(n, k) for k, n in self.event_kinds.items()),
+			self.peak_sweep_line, self.peak_queue,
+			self.comparisons, self.intersection_tests,
+			'no' if rate == None else '{:.1%}'.format(rate),
+			self.intersections,
+			', '.join('{} {:.3f} s'.format(k, t) for k, t in self.times.items()))
+
+	def start(self):
+		'''
+		Starts observing a run.
+		'''
+		self._last = perf_counter()
+
+	def counted(self, segments):
+		'''
+		Returns a tuple (copies, original), copies being the list of
+		copies of segments whose comparisons (__lt__ and isBelow) and
+		intersection tests are counted in self, and original a dict
+		mapping the id of each copy to its segment.
+		'''
+		copies, original = [], {}
+		for seg in segments:
+			cls = self._classes.get(type(seg))
+			if cls == None:
+				cls = self._classes[type(seg)] = self._countingClass(type(seg))
+			copy = cls(seg.x1, seg.y1, seg.x2, seg.y2)
+			original[id(copy)] = seg
+			copies.append(copy)
+		return copies, original
+
+	def _countingClass(self, cls):
+		'''
+		Returns a subclass of cls counting the calls to its __lt__,
+		isBelow and intersectionWith methods in self.
+		'''
+		stats = self
+		class Counting(cls):
+			__slots__ = ()
+			def __lt__(seg, other):
+				stats.comparisons += 1
+				return cls.__lt__(seg, other)
+			def isBelow(seg, other):
+				stats.comparisons += 1
+				return cls.isBelow(seg, other)
+			def intersectionWith(seg, other):
+				stats.intersection_tests += 1
+				inter = cls.intersectionWith(seg, other)
+				if inter != None:
+					stats.intersection_hits += 1
+				return inter
+		Counting.__name__ = Counting.__qualname__ = cls.__name__
+		return Counting
+
+	def stop(self):
+		'''
+		Stops observing the run, and calls the callback a last time.
+		'''
+		if self.callback != None:
+			self.callback(self)
+
+	def lap(self, block):
+		'''
+		Adds the time elapsed since the last lap to the time spent in
+		block.
+		'''
+		now = perf_counter()
+		self.times[block] += now - self._last
+		self._last = now
+
+	def startEvent(self, event):
+		'''
+		Counts an event which was just popped from the queue.
+		'''
+		self.events += 1
+		for kind, segments in (('left', event.left), ('right', event.right),
+							   ('inner', event.inner_inter),
+							   ('low', event.low), ('high', event.high)):
+			if segments:
+				self.event_kinds[kind] += 1
+
+	def endEvent(self, queue_size, sweep_line_size):
+		'''
+		Records the sizes of the queue and of the sweep line after an
+		event, and calls the callback every every events.
+		'''
+		self.peak_queue = max(self.peak_queue, queue_size)
+		self.peak_sweep_line = max(self.peak_sweep_line, sweep_line_size)
+		if self.callback != None and self.events % self.every == 0:
+			self.callback(self)
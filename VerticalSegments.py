@@ -0,0 +1,77 @@
+from sortedcontainers import SortedKeyList
+
+class VerticalSegments(object):
+	'''
+	This class represents the set of vertical segments being swept in
+	the Bentley-Ottmann algorithm, i.e. whose low endpoint was reached
+	but not their high endpoint.
+
+	Segments are kept in a SortedKeyList, sorted by x-coordinate, then
+	by y-interval, so that insertion and removal run in O(log(N)), and
+	the segments overlapping a y-interval at some x-coordinate are
+	found by bisection.
+
+	Removal relies on the identity of segments, rather than on
+	Segment.__eq__, so that equal segments can be swept together.
+	Equal segments are sorted by order of insertion, so that they are
+	reported in the same order whatever their addresses in memory.
+	'''
+
+	def __init__(self):
+		'''
+		Initializes an empty set of vertical segments.
+		'''
+		self.l = SortedKeyList(key=self._key)
+		# Insertion numbers of the segments, indexed by their ids
+		self.numbers = {}
+		self.count = 0
+
+	def _key(self, seg):
+		return (seg.x1, seg.y1, seg.y2, self.numbers[id(seg)])
+
+	def __len__(self):
+		'''
+		Returns the number of vertical segments being swept.
+		'''
+		return len(self.l)
+
+	def __iter__(self):
+		'''
+		Iterates over the vertical segments being swept, sorted by
+		x-coordinate and low endpoint.
+		'''
+		return iter(self.l)
+
+	def add(self, seg):
+		'''
+		Adds the vertical segment seg.
+		'''
+		self.numbers[id(seg)] = self.count
+		self.count += 1
+		self.l.add(seg)
+
+	def remove(self, seg):
+		'''
+		Removes the vertical segment seg, which must have been added.
+		'''
+		if id(seg) in self.numbers:
+			i = self.l.bisect_key_left(self._key(seg))
+			if i < len(self.l) and self.l[i] is seg:
+				del self.l[i]
+				del self.numbers[id(seg)]
+				return
+		raise ValueError('{} is not being swept'.format(seg))
+
+	def overlapping(self, x, y_inf, y_sup):
+		'''
+		Iterates over the vertical segments at x-coordinate x which
+		overlap the interval [y_inf, y_sup].
+
+		Segments starting above y_sup are skipped by bisection, so in
+		the sweep, where all the segments being swept reach the current
+		event, this runs in O(log(N) + K), K being the number of
+		segments returned.
+		'''
+		for seg in self.l.irange_key((x,), (x, y_sup, float('inf'), float('inf'))):
+			if seg.y2 >= y_inf:
+				yield seg
@@ -0,0 +1,9 @@
+'''
+Benchmarks of the Bentley-Ottmann implementation.
+They must be run from the root of the repository :
+
+python -m benchmark run -o results.json
+python -m benchmark compare baseline.json results.json
+python -m benchmark.comparisons
+python -m benchmark.sweeplines
+'''
@@ -0,0 +1,53 @@
+'''
+Command line interface of the benchmarks :
+
+python -m benchmark run [-w WORKLOAD ...] [-s SIZE ...] [--stats] [-o results.json]
+python -m benchmark compare baseline.json results.json [-t THRESHOLD]
+
+compare exits with status 1 if a regression is found.
+'''
+import sys
+import argparse
+from benchmark import scaling
+from benchmark.workloads import WORKLOADS
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(prog='python -m benchmark')
+	commands = parser.add_subparsers(dest='command', required=True)
+	run = commands.add_parser('run', help='measure the workloads')
+	run.add_argument('-w', '--workloads', nargs='+', choices=sorted(WORKLOADS),
+					 default=sorted(WORKLOADS))
+	run.add_argument('-s', '--sizes', nargs='+', type=int,
+					 default=[100, 300, 1000])
+	run.add_argument('--seed', type=int, default=0)
+	run.add_argument('--timeout', type=float, default=600,
+					 help='maximum duration of a run in seconds (default 600)')
+	run.add_argument('--stats', action='store_true',
+					 help='also record statistics of the sweep')
+	run.add_argument('-o', '--output', help='JSON file to write results to')
+	compare = commands.add_parser('compare', 
+								  help='flag regressions against a baseline')
+	compare.add_argument('baseline')
+	compare.add_argument('results')
+	compare.add_argument('-t', '--threshold', type=float, default=0.2,
+						 help='tolerated relative growth (default 0.2)')
+	args = parser.parse_args(argv)
+
+	if args.command == 'run':
+		report = scaling.run(args.workloads, args.sizes, args.seed, args.timeout,
+							 stats=args.stats)
+		if args.output:
+			scaling.save(report, args.output)
+		return 0
+	else:
+		regressions = scaling.compare(scaling.load(args.baseline),
+									  scaling.load(args.results),
+									  args.threshold)
+		for r in regressions:
+			print(r)
+		if not regressions:
+			print('No regression')
+		return 1 if regressions else 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,96 @@
+'''
+Counts the divisions performed by ComparableSegment comparisons while
+sorting segments in a sweep line, with and without cached comparison
+keys.
+
+Each call to Segment.yAtX or Segment.gradient performs one division,
+so divisions are counted by counting calls to these 2 methods.
+
+Usage : python -m benchmark.comparisons [number of segments]
+'''
+import sys
+from random import Random
+from time import perf_counter
+from sortedcontainers import SortedList
+from Segment import Segment
+from ComparableSegment import ComparableSegment
+
+class UncachedSegment(ComparableSegment):
+	'''
+	ComparableSegment as it was before comparison keys were cached :
+	every comparison recomputes both y-coordinates and gradients.
+	'''
+
+	def __lt__(self, other):
+		x = ComparableSegment.currentX
+		return ((self.yAtX(x), Segment.gradient(self), 
+				 self.x1, self.y1, self.x2, self.y2) < 
+				(other.yAtX(x), Segment.gradient(other), 
+				 other.x1, other.y1, other.x2, other.y2))
+
+	def isBelow(self, other):
+		x = ComparableSegment.currentX
+		return ((self.yAtX(x), Segment.gradient(self)) < 
+				(other.yAtX(x), Segment.gradient(other)))
+
+class DivisionCounter(object):
+	'''
+	Counts calls to Segment.yAtX and Segment.gradient while active.
+	'''
+
+	def __enter__(self):
+		self.count = 0
+		self.yAtX, self.gradient = Segment.yAtX, Segment.gradient
+		def yAtX(seg, x):
+			self.count += 1
+			return self.yAtX(seg, x)
+		def gradient(seg):
+			self.count += 1
+			return self.gradient(seg)
+		Segment.yAtX, Segment.gradient = yAtX, gradient
+		return self
+
+	def __exit__(self, *args):
+		Segment.yAtX, Segment.gradient = self.yAtX, self.gradient
+
+def randomCoordinates(n, seed=0):
+	'''
+	Returns n random segments crossing the vertical band 
+	0.4 <= x <= 0.6, as tuples (x1, y1, x2, y2).
+	'''
+	rand = Random(seed)
+	return [(rand.uniform(0, 0.4), rand.random(), 
+			 rand.uniform(0.6, 1), rand.random()) for i in range(n)]
+
+def workload(cls, coordinates, positions=5):
+	'''
+	Sorts the segments in a sweep line at several x-coordinates, and
+	compares each of them with its neighbour, as the sweep does.
+	Returns (number of divisions, elapsed time).
+	'''
+	with DivisionCounter() as counter:
+		start = perf_counter()
+		segments = [cls(*c) for c in coordinates]
+		for k in range(positions):
+			ComparableSegment.currentX = 0.4 + 0.2*k/positions
+			line = SortedList()
+			for seg in segments:
+				line.add(seg)
+			for i in range(len(line) - 1):
+				line[i].isBelow(line[i+1])
+				line.index(line[i])
+		elapsed = perf_counter() - start
+	return counter.count, elapsed
+
+def main(n=10000):
+	coordinates = randomCoordinates(n)
+	before, before_time = workload(UncachedSegment, coordinates)
+	after, after_time = workload(ComparableSegment, coordinates)
+	print('Sorting {} segments at 5 positions of the sweep line'.format(n))
+	print('Without cache : {} divisions in {:.3f} s'.format(before, before_time))
+	print('With cache    : {} divisions in {:.3f} s'.format(after, after_time))
+	print('Divisions reduced by x{:.1f}, speed up : x{:.2f}'.format(
+		before/after, before_time/after_time))
+
+if __name__ == '__main__':
+	main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,155 @@
+'''
+Runs intersectionsList on the workloads of benchmark.workloads for
+increasing sizes, and compares the results with a baseline.
+'''
+import json
+import platform
+import tracemalloc
+import multiprocessing
+from time import perf_counter
+from ComparableSegment import ComparableSegment
+from EventQueue import EventQueue
+from BentleyOttmann import intersectionsList
+from SweepStats import SweepStats
+from benchmark.workloads import WORKLOADS
+
+class EventCounter(object):
+	'''
+	Counts the events popped from any EventQueue while active.
+	'''
+
+	def __enter__(self):
+		self.count = 0
+		self.nextEvent = EventQueue.nextEvent
+		def nextEvent(queue):
+			self.count += 1
+			return self.nextEvent(queue)
+		EventQueue.nextEvent = nextEvent
+		return self
+
+	def __exit__(self, *args):
+		EventQueue.nextEvent = self.nextEvent
+
+def measure(workload, n, seed=0, stats=False):
+	'''
+	Runs intersectionsList on the workload of size n, and returns a
+	dictionary with the wall time (s), number of events processed,
+	number of intersections found and peak memory (bytes) of the run.
+	If the run raises an exception, it is recorded in 'error'.
+	If stats is true, the sweep is also run with a SweepStats, whose
+	statistics are recorded in 'stats'.
+	'''
+	coordinates = WORKLOADS[workload](n, seed)
+	res = {'workload': workload, 'size': n}
+	try:
+		segments = [ComparableSegment(*c) for c in coordinates]
+		with EventCounter() as counter:
+			start = perf_counter()
+			intersections = intersectionsList(segments, 'sweep')
+			res['time'] = perf_counter() - start
+		res['events'] = counter.count
+		res['intersections'] = len(intersections)
+		del intersections
+		# Memory is measured in a second run, as tracing allocations 
+		# slows the sweep down.
+		segments = [ComparableSegment(*c) for c in coordinates]
+		tracemalloc.start()
+		try:
+			intersections = intersectionsList(segments, 'sweep')
+			res['peak_memory'] = tracemalloc.get_traced_memory()[1]
+		finally:
+			tracemalloc.stop()
+		del intersections
+		if stats:
+			sweep_stats = SweepStats()
+			segments = [ComparableSegment(*c) for c in coordinates]
+			intersectionsList(segments, 'sweep', sweep_stats)
+			res['stats'] = sweep_stats.asDict()
+	except Exception as e:
+		res['error'] = '{}: {}'.format(type(e).__name__, e)
+	return res
+
+def isolatedMeasure(workload, n, seed=0, timeout=None, stats=False):
+	'''
+	Same as measure, but runs in a new process so that runs do not
+	share memory, and records an error if the run takes more than
+	timeout seconds.
+	'''
+	with multiprocessing.Pool(1) as pool:
+		pending = pool.apply_async(measure, (workload, n, seed, stats))
+		try:
+			return pending.get(timeout)
+		except multiprocessing.TimeoutError:
+			return {'workload': workload, 'size': n,
+					'error': 'timeout after {} s'.format(timeout)}
+
+def run(workloads, sizes, seed=0, timeout=None, verbose=True, stats=False):
+	'''
+	Measures every workload at every size, and returns a report
+	which can be saved as JSON. If stats is true, the statistics of
+	the sweep are recorded as well (see measure).
+	'''
+	results = []
+	for workload in workloads:
+		for n in sizes:
+			res = isolatedMeasure(workload, n, seed, timeout, stats)
+			if verbose:
+				print(formatResult(res))
+			results.append(res)
+	return {'python': platform.python_version(),
+			'machine': platform.machine(),
+			'seed': seed,
+			'results': results}
+
+def formatResult(res):
+	'''
+	Returns a human readable line describing a result of measure.
+	'''
+	head = '{:>10} {:>8}'.format(res['workload'], res['size'])
+	if 'error' in res:
+		return head + '  failed : ' + res['error']
+	line = head + ' {:>9.3f} s {:>9} events {:>9} inter. {:>9.1f} KiB'.format(
+		res['time'], res['events'], res['intersections'], 
+		res['peak_memory'] / 1024)
+	if 'stats' in res:
+		stats = res['stats']
+		line += '\n{:>19} {} comparisons, {} intersection tests, peak sweep line {}'.format(
+			'', stats['comparisons'], stats['intersection_tests'],
+			stats['peak_sweep_line'])
+	return line
+
+def compare(baseline, report, threshold=0.2):
+	'''
+	Compares a report with a baseline report, and returns a list of
+	regressions as human readable strings. A run regresses if :
+	- its time or peak memory grew by more than threshold (a ratio)
+	- it finds a different number of intersections
+	- it fails while the baseline run did not.
+	'''
+	reference = {(r['workload'], r['size']): r for r in baseline['results']}
+	regressions = []
+	for res in report['results']:
+		key = (res['workload'], res['size'])
+		ref = reference.get(key)
+		if ref == None or 'error' in ref:
+			continue
+		name = '{} {}'.format(*key)
+		if 'error' in res:
+			regressions.append('{} : fails ({})'.format(name, res['error']))
+			continue
+		if res['intersections'] != ref['intersections']:
+			regressions.append('{} : {} intersections instead of {}'.format(
+				name, res['intersections'], ref['intersections']))
+		for metric in ('time', 'peak_memory'):
+			if res[metric] > ref[metric] * (1 + threshold):
+				regressions.append('{} : {} x{:.2f}'.format(
+					name, metric, res[metric] / ref[metric]))
+	return regressions
+
+def load(path):
+	with open(path) as f:
+		return json.load(f)
+
+def save(report, path):
+	with open(path, 'w') as f:
+		json.dump(report, f, indent=1)
@@ -0,0 +1,93 @@
+'''
+Compares the sweep line backends : SweepLine, on top of a SortedList,
+and SkipListSweepLine, on top of a skip list with node handles.
+
+The first part counts the comparisons between segments and measures
+the time of the operations the sweep performs on a sweep line of n
+segments : neighbour lookups, removals and reinsertions. The second
+part measures whole sweeps of the workloads with each backend.
+
+Usage : python -m benchmark.sweeplines [number of segments]
+'''
+import sys
+from random import Random
+from time import perf_counter
+from ComparableSegment import ComparableSegment
+from SweepLine import SweepLine
+from SkipListSweepLine import SkipListSweepLine
+from BentleyOttmann import countIntersections
+from benchmark.comparisons import randomCoordinates
+from benchmark.workloads import WORKLOADS
+
+BACKENDS = (('SortedList', SweepLine), ('skip list', SkipListSweepLine))
+
+class ComparisonCounter(object):
+	'''
+	Counts calls to ComparableSegment.__lt__ and isBelow while active.
+	'''
+
+	def __enter__(self):
+		self.count = 0
+		self.lt, self.isBelow = ComparableSegment.__lt__, ComparableSegment.isBelow
+		def lt(seg, other):
+			self.count += 1
+			return self.lt(seg, other)
+		def isBelow(seg, other):
+			self.count += 1
+			return self.isBelow(seg, other)
+		ComparableSegment.__lt__, ComparableSegment.isBelow = lt, isBelow
+		return self
+
+	def __exit__(self, *args):
+		ComparableSegment.__lt__, ComparableSegment.isBelow = self.lt, self.isBelow
+
+def operations(cls, segments, rounds=3, seed=0):
+	'''
+	Fills a sweep line of class cls with segments at x = 0.5, then for
+	each segment, looks up its neighbours, removes it and inserts it
+	back, rounds times. Returns (number of comparisons during the
+	rounds, elapsed time of the rounds).
+	'''
+	rand = Random(seed)
+	line = cls()
+	for seg in segments:
+		line.addSegment(seg, 0.5)
+	order = list(segments)
+	with ComparisonCounter() as counter:
+		start = perf_counter()
+		for r in range(rounds):
+			rand.shuffle(order)
+			for seg in order:
+				line.segmentBelow(seg)
+				line.segmentAbove(seg)
+				line.removeSegment(seg)
+				line.addSegment(seg, 0.5)
+		elapsed = perf_counter() - start
+	return counter.count, elapsed
+
+def sweep(cls, coordinates):
+	'''
+	Returns the time of a whole sweep of coordinates with a sweep line
+	of class cls.
+	'''
+	segments = [ComparableSegment(*c) for c in coordinates]
+	start = perf_counter()
+	countIntersections(segments, engine='sweep', sweep_line=cls)
+	return perf_counter() - start
+
+def main(n=10000):
+	segments = [ComparableSegment(*c) for c in randomCoordinates(n)]
+	print('Neighbours, removal and insertion of each of {} segments, 3 times'.format(n))
+	for name, cls in BACKENDS:
+		count, elapsed = operations(cls, segments)
+		print('{:<10} : {} comparisons in {:.3f} s'.format(name, count, elapsed))
+	size = max(n // 10, 1)
+	print('Sweeps of {} segments'.format(size))
+	for workload in sorted(WORKLOADS):
+		coordinates = WORKLOADS[workload](size)
+		times = ['{} {:.3f} s'.format(name, sweep(cls, coordinates))
+				 for name, cls in BACKENDS]
+		print('{:<10} : {}'.format(workload, ', '.join(times)))
+
+if __name__ == '__main__':
+	main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,68 @@
+'''
+Reproducible workloads for intersectionsList. Each workload is a
+function of the number of segments n and of a random seed, which
+returns a list of n tuples (x1, y1, x2, y2).
+'''
+from math import cos, sin, pi
+from random import Random
+
+def uniform(n, seed=0):
+	'''
+	n segments with endpoints uniformly distributed in [0,1]x[0,1],
+	scaled down so that each segment crosses about 10 others.
+	'''
+	rand = Random(seed)
+	length = min(1, (10 / max(n, 1))**0.5)
+	res = []
+	for i in range(n):
+		x, y = rand.random(), rand.random()
+		angle = rand.uniform(0, pi)
+		res.append((x, y, x + length*cos(angle), y + length*sin(angle)))
+	return res
+
+def grid(n, seed=0):
+	'''
+	n/2 horizontal and n/2 vertical segments forming a dense grid,
+	where every horizontal crosses every vertical. It does not depend
+	on seed.
+	'''
+	half = n // 2
+	res = [(0, i + 0.5, half, i + 0.5) for i in range(half)]
+	res.extend((i + 0.5, 0, i + 0.5, half) for i in range(n - half))
+	return res
+
+def star(n, seed=0):
+	'''
+	n segments of random directions, all going through (0, 0).
+	'''
+	rand = Random(seed)
+	res = []
+	for i in range(n):
+		angle = rand.uniform(0, pi)
+		r1, r2 = rand.uniform(0.5, 1), rand.uniform(0.5, 1)
+		res.append((-r1*cos(angle), -r1*sin(angle), r2*cos(angle), r2*sin(angle)))
+	return res
+
+def collinear(n, seed=0):
+	'''
+	n overlapping segments on 10 parallel lines.
+	'''
+	rand = Random(seed)
+	res = []
+	for i in range(n):
+		line = i % 10
+		x1 = rand.randint(0, n)
+		x2 = x1 + rand.randint(1, 10)
+		res.append((x1, x1 + line, x2, x2 + line))
+	return res
+
+def slivers(n, seed=0):
+	'''
+	n long and almost parallel segments, crossing each other with
+	very small angles.
+	'''
+	rand = Random(seed)
+	return [(0, rand.random(), 1000, rand.random()) for i in range(n)]
+
+WORKLOADS = {'uniform': uniform, 'grid': grid, 'star': star, 
+			 'collinear': collinear, 'slivers': slivers}
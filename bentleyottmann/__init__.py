@@ -0,0 +1,14 @@
+'''
+Entry point of the Bentley-Ottmann implementation, re-exporting the
+functions computing intersections, the cache of their results and
+the sweep line backends.
+The command line interface must be run from the root of the
+repository :
+
+python -m bentleyottmann segments.txt > intersections.ndjson
+'''
+from BentleyOttmann import intersectionsList, iterIntersections,\
+	countIntersections, intersectionsArray, intersectionsBetween, hasIntersection
+from ResultCache import ResultCache
+from SweepLine import SweepLine
+from SkipListSweepLine import SkipListSweepLine
@@ -0,0 +1,161 @@
+'''
+Command line interface computing the intersections of a set of
+segments :
+
+python -m bentleyottmann [INPUT] [-f {ndjson,csv,binary}] [-o OUTPUT]
+                         [-e ENGINE] [--snap PIXEL] [--count] [--stats]
+
+INPUT is either a segment file (see SegmentFile), or a text file with
+one segment x1 y1 x2 y2 per line, numbers being separated by spaces or
+commas (empty lines and lines starting with # are skipped). It is read
+from stdin if omitted or '-'.
+
+Intersections are written as soon as they are found, as NDJSON objects
+{"i": 0, "j": 1, "x": 1.0, "y": 1.0}, or CSV rows i,j,x,y,x2,y2, i and
+j being the line numbers (starting from 0) of the segments, and x2, y2
+being only set when the segments overlap along [(x, y);(x2, y2)]. The
+binary format is the intersection file of SegmentFile, and requires
+OUTPUT.
+
+With --snap, the sweep runs in tolerance mode, snapping the endpoints
+of segments and the intersections to a grid of pixels of the given
+size. The crossings in a pixel are merged into a single event, and the
+segments going through it are rerouted through it (see
+BentleyOttmann._sweep).
+'''
+import sys
+import json
+import argparse
+from SegmentArray import SegmentArray
+from SweepStats import SweepStats
+from SegmentFile import SEGMENT_MAGIC, readSegments, writeIntersections
+from BentleyOttmann import iterIntersections, countIntersections
+
+# Number of records written at once
+BATCH = 4096
+
+def readInput(path, stdin=None):
+	'''
+	Returns a SegmentArray of the segments of a segment file or of a
+	text file, path being '-' for stdin.
+	'''
+	if path != '-':
+		with open(path, 'rb') as f:
+			binary = f.read(len(SEGMENT_MAGIC)) == SEGMENT_MAGIC
+		if binary:
+			return readSegments(path)
+		with open(path) as f:
+			return parseText(f)
+	return parseText(stdin or sys.stdin)
+
+def parseText(lines):
+	'''
+	Returns a SegmentArray of the segments of an iterable of text
+	lines x1 y1 x2 y2.
+	'''
+	def rows():
+		for number, line in enumerate(lines, 1):
+			line = line.strip()
+			if line == '' or line.startswith('#'):
+				continue
+			fields = line.replace(',', ' ').split()
+			if len(fields) != 4:
+				raise ValueError('line {} : expected 4 numbers, got {}'.format(
+					number, len(fields)))
+			yield tuple(map(float, fields))
+	return SegmentArray.fromCoordinates(rows())
+
+def ndjsonRecord(i, j, inter):
+	'''
+	Returns the NDJSON line describing an intersection.
+	'''
+	record = {'i': i, 'j': j}
+	if isinstance(inter, tuple):
+		record['x'], record['y'] = inter
+	else:
+		record['x'], record['y'] = inter.x1, inter.y1
+		record['x2'], record['y2'] = inter.x2, inter.y2
+	return json.dumps(record) + '\n'
+
+def csvRecord(i, j, inter):
+	'''
+	Returns the CSV row describing an intersection.
+	'''
+	if isinstance(inter, tuple):
+		return '{},{},{!r},{!r},,\n'.format(i, j, *inter)
+	return '{},{},{!r},{!r},{!r},{!r}\n'.format(i, j, inter.x1, inter.y1,
+												  inter.x2, inter.y2)
+
+def writeRecords(out, intersections, record):
+	'''
+	Writes intersections to the text stream out, using record to
+	format each of them, BATCH records at a time.
+	'''
+	batch = []
+	for (i, j), inter in intersections:
+		batch.append(record(i, j, inter))
+		if len(batch) == BATCH:
+			out.write(''.join(batch))
+			batch.clear()
+	out.write(''.join(batch))
+
+def main(argv=None, stdin=None, stdout=None, stderr=None):
+	stdout, stderr = stdout or sys.stdout, stderr or sys.stderr
+	parser = argparse.ArgumentParser(prog='python -m bentleyottmann')
+	parser.add_argument('input', nargs='?', default='-',
+						help='segment file or text file (default stdin)')
+	parser.add_argument('-f', '--format', choices=('ndjson', 'csv', 'binary'),
+						default='ndjson')
+	parser.add_argument('-o', '--output', help='file to write to (default stdout)')
+	parser.add_argument('-e', '--engine', default='sweep',
+						choices=('auto', 'sweep', 'grid', 'parallel'))
+	parser.add_argument('--snap', type=float, metavar='PIXEL',
+						help='snap to a grid of pixels of this size')
+	parser.add_argument('--count', action='store_true',
+						help='only write the number of intersections')
+	parser.add_argument('--stats', action='store_true',
+						help='write statistics of the sweep to stderr')
+	args = parser.parse_args(argv)
+	if args.format == 'binary' and args.output == None and not args.count:
+		parser.error('the binary format requires --output')
+	if args.stats and args.engine not in ('auto', 'sweep'):
+		parser.error('--stats requires the sweep engine')
+	if args.snap != None and args.engine not in ('auto', 'sweep'):
+		parser.error('--snap requires the sweep engine')
+
+	try:
+		segments = readInput(args.input, stdin)
+	except (OSError, ValueError) as e:
+		print('error : {}'.format(e), file=stderr)
+		return 1
+	stats = SweepStats() if args.stats else None
+
+	if args.count:
+		count = countIntersections(segments, engine=args.engine, stats=stats,
+								   snap=args.snap)
+		if args.output == None:
+			print(count, file=stdout)
+		else:
+			with open(args.output, 'w') as out:
+				print(count, file=out)
+	else:
+		intersections = iterIntersections(segments, args.engine, stats, args.snap)
+		if args.format == 'binary':
+			writeIntersections(args.output, intersections)
+		else:
+			record = ndjsonRecord if args.format == 'ndjson' else csvRecord
+			out = stdout if args.output == None else open(args.output, 'w')
+			try:
+				if args.format == 'csv':
+					out.write('i,j,x,y,x2,y2\n')
+				writeRecords(out, intersections, record)
+				out.flush()
+			finally:
+				if out is not stdout:
+					out.close()
+	if stats != None:
+		print(stats, file=stderr)
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
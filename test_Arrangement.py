@@ -0,0 +1,109 @@
+import unittest
+from random import Random
+from ComparableSegment import ComparableSegment
+from Arrangement import Arrangement
+
+class TestArrangement(unittest.TestCase):
+
+	def setUp(self):
+		self.s1 = ComparableSegment(0, 0, 2, 2)
+		self.s2 = ComparableSegment(0, 2, 2, 0)
+		self.s3 = ComparableSegment(1, -1, 1, 3)
+		self.s4 = ComparableSegment(5, 0, 6, 0)
+		self.arrangement = Arrangement([self.s1, self.s2, self.s3, self.s4])
+
+	def pairs(self, intersections):
+		return {frozenset((id(seg), id(other))) for (seg, other), inter
+				in intersections}
+
+	# __init__
+
+	def test__init__(self):
+		self.assertEqual(len(self.arrangement), 4)
+		self.assertEqual(self.pairs(self.arrangement.intersectionsList()),
+						 {frozenset((id(a), id(b))) for a, b in
+						  ((self.s1, self.s2), (self.s1, self.s3), (self.s2, self.s3))})
+
+	def test__init__empty(self):
+		arrangement = Arrangement()
+		self.assertEqual(arrangement.add(self.s1), [])
+		self.assertEqual(arrangement.add(self.s2), [((self.s2, self.s1), (1, 1))])
+
+	# add
+
+	def test_add(self):
+		s5 = ComparableSegment(5.5, -1, 5.5, 1)
+		self.assertEqual(self.arrangement.add(s5), [((s5, self.s4), (5.5, 0))])
+		self.assertIn(s5, self.arrangement)
+		self.assertEqual(self.arrangement.intersectionsOf(self.s4), [(s5, (5.5, 0))])
+
+	def test_add_twice(self):
+		with self.assertRaises(ValueError):
+			self.arrangement.add(self.s1)
+
+	def test_add_equal_segment(self):
+		s5 = ComparableSegment(5, 0, 6, 0)
+		res = self.arrangement.add(s5)
+		self.assertEqual(len(res), 1)
+		self.assertIs(res[0][0][1], self.s4)
+
+	def test_add_long_segment(self):
+		arrangement = Arrangement()
+		short = ComparableSegment(0, 0, 0.001, 0.001)
+		arrangement.add(short)
+		long = ComparableSegment(-1000, 0.0005, 1000, 0.0005)
+		self.assertEqual(self.pairs(arrangement.add(long)),
+						 {frozenset((id(long), id(short)))})
+		self.assertLess(len(arrangement.cells), 10)
+		arrangement.remove(long)
+		arrangement.remove(short)
+		self.assertEqual((arrangement.cells, arrangement.long), ({}, {}))
+
+	def test_add_long_segment_fixed_cell_size(self):
+		arrangement = Arrangement([self.s1, self.s2], cell_size=0.5)
+		long = ComparableSegment(-1000, 1, 1000, 1)
+		self.assertEqual(self.pairs(arrangement.add(long)),
+						 {frozenset((id(long), id(self.s1))),
+						  frozenset((id(long), id(self.s2)))})
+		self.assertIn(id(long), arrangement.long)
+		s5 = ComparableSegment(500, 0, 500, 2)
+		self.assertEqual(arrangement.add(s5), [((s5, long), (500, 1))])
+		self.assertEqual(arrangement.cell_size, 0.5)
+
+	# remove
+
+	def test_remove(self):
+		self.arrangement.remove(self.s3)
+		self.assertNotIn(self.s3, self.arrangement)
+		self.assertEqual(self.pairs(self.arrangement.intersectionsList()),
+						 {frozenset((id(self.s1), id(self.s2)))})
+		self.assertEqual(self.arrangement.intersectionsOf(self.s1), [(self.s2, (1, 1))])
+
+	def test_remove_absent(self):
+		with self.assertRaises(ValueError):
+			self.arrangement.remove(ComparableSegment(0, 0, 2, 2))
+
+	# random edits
+
+	def test_random_edits(self):
+		rand = Random(0)
+		def randomSegment():
+			x, y = rand.random()*10, rand.random()*10
+			return ComparableSegment(x, y, x + rand.random()*3, y + rand.random()*3 - 1.5)
+		segments = [randomSegment() for i in range(50)]
+		arrangement = Arrangement(segments)
+		for i in range(100):
+			if rand.random() < 0.5:
+				seg = randomSegment()
+				segments.append(seg)
+				arrangement.add(seg)
+			else:
+				arrangement.remove(segments.pop(rand.randrange(len(segments))))
+		expected = {frozenset((id(segments[i]), id(segments[j])))
+					for i in range(len(segments)) for j in range(i)
+					if segments[i].intersectionWith(segments[j]) != None}
+		self.assertEqual(self.pairs(arrangement.intersectionsList()), expected)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -1,6 +1,15 @@
 import unittest
+from math import cos, sin, pi, hypot
+from random import Random
+from unittest import mock
 from ComparableSegment import ComparableSegment
-from BentleyOttmann import intersectionsList
+from IntegerSegment import IntegerSegment
+from EventQueue import EventQueue
+from SegmentArray import SegmentArray
+from SweepStats import SweepStats
+from GridIntersections import preferGrid
+from BentleyOttmann import intersectionsList, iterIntersections, countIntersections,\
+	intersectionsArray, intersectionsBetween, hasIntersection, POINT, OVERLAP
 
 class TestBentleyOttman(unittest.TestCase):
 
@@ -59,6 +68,430 @@ class TestBentleyOttman(unittest.TestCase):
 		self.assertEqual(intersectionsList([s1, s2]),
 						 [((s1, s2), ComparableSegment(1, 1, 2, 2))])
 
+	# iterIntersections
+
+	def test_iterIntersections_is_lazy(self):
+		s1 = ComparableSegment(0, 0, 1, 1)
+		s2 = ComparableSegment(1, 1, 2, 0)
+		s3 = ComparableSegment(2, 0, 3, 1)
+		s4 = ComparableSegment(3, 1, 3, 2)
+		it = iterIntersections([s1, s2, s3, s4])
+		self.assertEqual(next(it), ((s1, s2), (1, 1)))
+		self.assertEqual(list(it), [((s2, s3), (2, 0)), ((s4, s3), (3, 1))])
+
+	def test_iterIntersections_same_as_list(self):
+		segments = [ComparableSegment(0, 0, 1, 1), ComparableSegment(0, 0, 2, 1),
+					ComparableSegment(1, 1, 1, 3), ComparableSegment(2, 1, 3, 0)]
+		self.assertEqual(list(iterIntersections(segments)),
+						 intersectionsList(segments))
+
+	# engines
+
+	def test_engines_same_pairs(self):
+		segments = [ComparableSegment(0, i + 0.5, 10, i + 0.5) for i in range(10)]
+		segments += [ComparableSegment(i + 0.5, 0, i + 0.5, 10) for i in range(10)]
+		def pairs(engine):
+			return {frozenset((id(seg), id(other))) for (seg, other), inter
+					in intersectionsList(segments, engine)}
+		self.assertEqual(len(pairs('sweep')), 100)
+		self.assertEqual(pairs('grid'), pairs('sweep'))
+		self.assertEqual(pairs('auto'), pairs('sweep'))
+
+	def test_default_engine_is_sweep(self):
+		rand = Random(0)
+		segments = []
+		for i in range(200):
+			x, y = rand.random(), rand.random()
+			segments.append(ComparableSegment(x, y, x + rand.uniform(0.001, 0.02),
+											  y + rand.uniform(-0.02, 0.02)))
+		self.assertTrue(preferGrid(segments))
+		self.assertEqual(intersectionsList(segments),
+						 intersectionsList(segments, 'sweep'))
+
+	def test_unknown_engine(self):
+		with self.assertRaises(ValueError):
+			intersectionsList([], 'magic')
+
+	# sweep
+
+	def bruteForcePairs(self, segments):
+		return {(i, j) for i in range(len(segments))
+				for j in range(i + 1, len(segments))
+				if segments[i].intersectionWith(segments[j]) != None}
+
+	def sweepPairs(self, segments):
+		index = {id(s): i for i, s in enumerate(segments)}
+		pairs = [tuple(sorted((index[id(seg)], index[id(other)])))
+				 for (seg, other), inter in intersectionsList(segments, 'sweep')]
+		self.assertEqual(len(pairs), len(set(pairs)))
+		return set(pairs)
+
+	def randomSegments(self, rand, n, coordinate, segment_class=ComparableSegment):
+		segments = []
+		while len(segments) < n:
+			c = [coordinate() for i in range(4)]
+			if c[:2] != c[2:]:
+				segments.append(segment_class(*c))
+		return segments
+
+	def test_sweep__random(self):
+		rand = Random(0)
+		for i in range(30):
+			segments = self.randomSegments(rand, 30, rand.random)
+			self.assertEqual(self.sweepPairs(segments), 
+							 self.bruteForcePairs(segments))
+
+	def test_sweep__random_degenerate(self):
+		rand = Random(1)
+		for i in range(30):
+			segments = self.randomSegments(rand, 20, lambda: rand.randint(0, 6))
+			self.assertEqual(self.sweepPairs(segments), 
+							 self.bruteForcePairs(segments))
+
+	def test_sweep__random_exact(self):
+		rand = Random(2)
+		for i in range(30):
+			segments = self.randomSegments(rand, 20, lambda: rand.randint(0, 6),
+										   IntegerSegment)
+			self.assertEqual(self.sweepPairs(segments), 
+							 self.bruteForcePairs(segments))
+
+	def test_sweep__crossing_at_right_endpoint(self):
+		s1 = ComparableSegment(0, 0, 2, 2)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		self.assertEqual(intersectionsList([s1, s2], 'sweep'), [((s1, s2), (2, 2))])
+
+	def test_sweep__left_endpoint_on_segment(self):
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(2, 2, 4, 0)
+		self.assertEqual(intersectionsList([s1, s2], 'sweep'), [((s1, s2), (2, 2))])
+
+	def test_sweep__concurrent_segments(self):
+		segments = [ComparableSegment(-1, -g, 1, g) for g in (-2, -1, 0, 1, 2)]
+		res = intersectionsList(segments, 'sweep')
+		self.assertEqual(len(res), 10)
+		self.assertTrue(all(inter == (0, 0) for pair, inter in res))
+
+	def test_sweep__equal_segments(self):
+		s1, s2 = ComparableSegment(0, 0, 2, 2), ComparableSegment(0, 0, 2, 2)
+		s3 = ComparableSegment(0, 2, 2, 0)
+		self.assertEqual(self.sweepPairs([s1, s2, s3]), {(0, 1), (0, 2), (1, 2)})
+
+	def test_sweep__fan_of_left_endpoints(self):
+		# Only the highest segment of the fan crosses s4, which was in
+		# the sweep line before the fan
+		segments = [ComparableSegment(0, 0, 10, 1), ComparableSegment(0, 0, 10, 5),
+					ComparableSegment(0, 0, 10, 3), ComparableSegment(-1, 6, 9, 3)]
+		self.assertEqual(self.sweepPairs(segments), {(0, 1), (0, 2), (1, 2), (1, 3)})
+
+	def test_sweep__adjacent_after_removal(self):
+		# s0 and s1 only become adjacent once s2 leaves the sweep line
+		segments = [ComparableSegment(0, 0, 10, 10), ComparableSegment(0, 10, 10, 0),
+					ComparableSegment(0, 5, 1, 5)]
+		self.assertEqual(intersectionsList(segments, 'sweep'),
+						 [((segments[0], segments[1]), (5, 5))])
+
+	def test_sweep__crossing_at_right_endpoint_of_upper_segment(self):
+		s1 = ComparableSegment(0, 4, 2, 2)
+		s2 = ComparableSegment(0, 0, 4, 4)
+		self.assertEqual(self.sweepPairs([s1, s2]), {(0, 1)})
+		self.assertEqual(intersectionsList([s1, s2], 'sweep')[0][1], (2, 2))
+
+	def test_sweep__left_endpoints_on_segment(self):
+		# s1 and s2 start on s0, s0 being above s1 but not adjacent to it
+		segments = [ComparableSegment(0, 0, 4, 4), ComparableSegment(2, 2, 4, 0),
+					ComparableSegment(2, 2, 4, 2)]
+		self.assertEqual(self.sweepPairs(segments), {(0, 1), (0, 2), (1, 2)})
+
+	def test_sweep__collinear_overlaps(self):
+		s1, s2 = ComparableSegment(0, 0, 4, 4), ComparableSegment(1, 1, 3, 3)
+		s3 = ComparableSegment(2, 2, 6, 6)
+		res = intersectionsList([s1, s2, s3], 'sweep')
+		self.assertEqual(self.sweepPairs([s1, s2, s3]), {(0, 1), (0, 2), (1, 2)})
+		self.assertIn(((s1, s2), ComparableSegment(1, 1, 3, 3)), res)
+
+	def test_sweep__shared_left_endpoint_reported_once(self):
+		segments = [ComparableSegment(0, 3, 3, 1), ComparableSegment(0, 3, 3, 4),
+					ComparableSegment(0, 3, 2, 1)]
+		res = intersectionsList(segments, 'sweep')
+		self.assertEqual(len(res), 3)
+		self.assertEqual(self.sweepPairs(segments), {(0, 1), (0, 2), (1, 2)})
+
+	def test_sweep__collinear_pairs_examined_once(self):
+		segments = [ComparableSegment(i, 2*i, 30 + i, 60 + 2*i) for i in range(30)]
+		calls = []
+		intersectionWith = ComparableSegment.intersectionWith
+		def record(seg, other):
+			calls.append((seg, other))
+			return intersectionWith(seg, other)
+		with mock.patch.object(ComparableSegment, 'intersectionWith', record):
+			res = intersectionsList(segments, 'sweep')
+		self.assertEqual(len(res), 30*29 // 2)
+		self.assertEqual(len(calls), len(res))
+
+	def test_sweep__queue_size_is_linear(self):
+		rand = Random(3)
+		segments = self.randomSegments(rand, 100, rand.random)
+		sizes = []
+		nextEvent = EventQueue.nextEvent
+		def recordSize(queue):
+			sizes.append(len(queue.queue))
+			return nextEvent(queue)
+		with mock.patch.object(EventQueue, 'nextEvent', recordSize):
+			count = countIntersections(segments, engine='sweep')
+		self.assertGreater(count, 1000)
+		self.assertLess(max(sizes), len(segments))
+
+	def test_sweep__barely_collinear_reported_once(self):
+		s1 = ComparableSegment(0.4, 0.30000000000000004, 0.7000000000000001, 0.9)
+		s2 = ComparableSegment(0.4, 0.30000000000000004, 0.6000000000000001,
+							   0.7000000000000001)
+		self.assertEqual(len(intersectionsList([s1, s2], 'sweep')), 1)
+
+	# snap
+
+	def snapped(self, segments, snap):
+		'''
+		Returns a dict mapping the ids of segments to their snapped
+		copies, for those which are not snapped to a point.
+		'''
+		res = {}
+		for s in segments:
+			c = [round(c / snap) * snap for c in (s.x1, s.y1, s.x2, s.y2)]
+			if c[:2] != c[2:]:
+				res[id(s)] = ComparableSegment(*c)
+		return res
+
+	def test_snap__near_misses(self):
+		# The snapped lines are not concurrent, but cross in few pixels
+		rand = Random(5)
+		noise = lambda: rand.uniform(-0.12, 0.12)
+		star = [ComparableSegment(-1 + noise(), -g + noise(), 1 + noise(), g + noise())
+				for g in (-2, -1, 0, 1, 2)]
+		snap = 0.1
+		snapped = list(self.snapped(star, snap).values())
+		self.assertEqual(len(snapped), 5)
+		self.assertEqual(len({inter for pair, inter in intersectionsList(snapped)}), 10)
+		exact, stats = SweepStats(), SweepStats()
+		intersectionsList(star, stats=exact)
+		res = intersectionsList(star, stats=stats, snap=snap)
+		self.assertEqual(len(res), 10)
+		pixels = {inter for pair, inter in res}
+		self.assertEqual(stats.event_kinds['inner'], len(pixels))
+		self.assertLess(len(pixels), exact.event_kinds['inner'])
+
+	def test_snap__crossings_merged(self):
+		# Crossings of noisy lines near (5, 5) are merged by pixel : they
+		# all share the event of their pixel
+		rand = Random(7)
+		lines = []
+		for k in range(6):
+			x, y = 5 + rand.uniform(-0.1, 0.1), 5 + rand.uniform(-0.1, 0.1)
+			dx, dy = 4*cos(k*pi/6 + 0.1), 4*sin(k*pi/6 + 0.1)
+			lines.append(ComparableSegment(x - dx, y - dy, x + dx, y + dy))
+		stats = SweepStats()
+		res = intersectionsList(lines, stats=stats, snap=0.25)
+		self.assertEqual(len(res), 15)
+		self.assertEqual({inter for pair, inter in res}, {(5, 4.75)})
+		self.assertEqual(stats.event_kinds['inner'], 1)
+
+	def test_snap__random(self):
+		# Intersections are reported at grid points, once per pair, and
+		# near both snapped segments, which are only moved by the hot
+		# pixels they go through
+		rand = Random(6)
+		snap = 0.125
+		for i in range(20):
+			segments = self.randomSegments(rand, 20, rand.random)
+			snapped = self.snapped(segments, snap)
+			pairs = []
+			for (seg, other), inter in intersectionsList(segments, snap=snap):
+				pairs.append(frozenset((id(seg), id(other))))
+				points = ([inter] if isinstance(inter, tuple) else
+						  [(inter.x1, inter.y1), (inter.x2, inter.y2)])
+				for x, y in points:
+					self.assertTrue(x / snap == round(x / snap) and y / snap == round(y / snap))
+					for s in (snapped[id(seg)], snapped[id(other)]):
+						self.assertLess(abs((s.x2 - s.x1)*(y - s.y1) - (s.y2 - s.y1)*(x - s.x1)) /
+										hypot(s.x2 - s.x1, s.y2 - s.y1), 2*snap)
+			self.assertEqual(len(pairs), len(set(pairs)))
+
+	def test_snap__tiny(self):
+		# With a tiny snap, the pairs are those of the snapped segments
+		rand = Random(6)
+		snap = 1e-9
+		for i in range(10):
+			segments = self.randomSegments(rand, 20, rand.random)
+			snapped = self.snapped(segments, snap)
+			index = {id(s): i for i, s in enumerate(snapped.values())}
+			pairs = {tuple(sorted((index[id(snapped[id(seg)])], index[id(snapped[id(other)])])))
+					 for (seg, other), inter in intersectionsList(segments, snap=snap)}
+			self.assertEqual(pairs, self.sweepPairs(list(snapped.values())))
+
+	def test_snap__degenerate_segment(self):
+		segments = [ComparableSegment(0, 0, 0.001, 0.001), ComparableSegment(-1, 0, 1, 0)]
+		self.assertEqual(intersectionsList(segments), [((segments[1], segments[0]), (0, 0))])
+		self.assertEqual(intersectionsList(segments, snap=0.1), [])
+
+	def test_snap__invalid(self):
+		segments = [ComparableSegment(0, 0, 1, 1)]
+		with self.assertRaises(ValueError):
+			intersectionsList(segments, 'grid', snap=0.1)
+		with self.assertRaises(ValueError):
+			intersectionsList(segments, snap=0)
+
+	# countIntersections
+
+	def test_countIntersections(self):
+		segments = [ComparableSegment(0, i + 0.5, 10, i + 0.5) for i in range(10)]
+		segments += [ComparableSegment(i + 0.5, 0, i + 0.5, 10) for i in range(3)]
+		for engine in ('sweep', 'grid', 'auto'):
+			self.assertEqual(countIntersections(segments, engine=engine), 30)
+
+	def test_countIntersections__per_segment(self):
+		segments = [ComparableSegment(0, 0, 1, 1), ComparableSegment(0, 0, 2, 1),
+					ComparableSegment(1, 1, 1, 3), ComparableSegment(2, 1, 3, 0)]
+		counts = countIntersections(segments, per_segment=True)
+		self.assertEqual(list(counts), [2, 2, 1, 1])
+		self.assertEqual(sum(counts), 2*len(intersectionsList(segments)))
+
+	def test_countIntersections__segment_array(self):
+		array = SegmentArray.fromCoordinates([(0, 0, 2, 2), (0, 2, 2, 0),
+											  (3, 0, 4, 0)])
+		self.assertEqual(countIntersections(array), 1)
+		self.assertEqual(list(countIntersections(array, True)), [1, 1, 0])
+
+	def test_countIntersections__successive_overlaps(self):
+		# Segments which left the sweep line are freed, and their ids
+		# reused by the next ones
+		rows = []
+		for k in range(500):
+			rows += [(3*k, 0, 3*k + 2, 0), (3*k + 1, 0, 3*k + 2, 0)]
+		self.assertEqual(countIntersections(SegmentArray.fromCoordinates(rows)), 500)
+
+	def test_countIntersections__empty(self):
+		self.assertEqual(countIntersections([]), 0)
+		self.assertEqual(list(countIntersections([], True)), [])
+
+	# intersectionsArray
+
+	def test_intersectionsArray(self):
+		array = SegmentArray.fromCoordinates([(0, 0, 2, 2), (0, 2, 2, 0),
+											  (1, 1, 3, 3), (3, 0, 4, 0)])
+		res = intersectionsArray(array, 'sweep')
+		expected = intersectionsList(array, 'sweep')
+		self.assertEqual(len(res), len(expected))
+		for row, ((i, j), inter) in zip(res, expected):
+			self.assertEqual((row['i'], row['j']), (i, j))
+			if row['kind'] == OVERLAP:
+				self.assertEqual(inter, ComparableSegment(*(float(row[f]) for f in
+															('x', 'y', 'x2', 'y2'))))
+			else:
+				self.assertEqual((row['x'], row['y']), inter)
+				self.assertNotEqual(row['x2'], row['x2'])
+		self.assertEqual(sorted(res['kind']), [POINT, POINT, OVERLAP])
+
+	def test_intersectionsArray__engines(self):
+		rand = Random(7)
+		segments = self.randomSegments(rand, 40, rand.random)
+		pairs = lambda res: sorted(map(sorted, zip(res['i'].tolist(), res['j'].tolist())))
+		self.assertEqual(pairs(intersectionsArray(segments, 'grid')),
+						 pairs(intersectionsArray(segments, 'sweep')))
+
+	def test_intersectionsArray__empty(self):
+		res = intersectionsArray([])
+		self.assertEqual(len(res), 0)
+		self.assertEqual(res.dtype.names, ('i', 'j', 'kind', 'x', 'y', 'x2', 'y2'))
+
+	# intersectionsBetween
+
+	def test_intersectionsBetween(self):
+		red = [ComparableSegment(0, i + 0.5, 10, i + 0.5) for i in range(5)]
+		red.append(ComparableSegment(9.5, 0, 9.5, 10))
+		blue = [ComparableSegment(i + 0.5, 0, i + 0.5, 10) for i in range(3)]
+		res = intersectionsBetween(red, blue)
+		self.assertEqual(len(res), 15)
+		for (r, b), inter in res:
+			self.assertIn(r, red)
+			self.assertIn(b, blue)
+			self.assertNotEqual(r.intersectionWith(b), None)
+
+	def test_intersectionsBetween__same_colour_crossings(self):
+		r1, r2 = ComparableSegment(0, 0, 4, 4), ComparableSegment(0, 4, 4, 0)
+		b1 = ComparableSegment(1, 0, 1, 4)
+		res = intersectionsBetween([r1, r2], [b1])
+		self.assertEqual(sorted(inter for pair, inter in res), [(1, 1), (1, 3)])
+		for (r, b), inter in res:
+			self.assertIn(r, (r1, r2))
+			self.assertIs(b, b1)
+
+	def test_intersectionsBetween__segment_array(self):
+		red = SegmentArray.fromCoordinates([(0, 0, 2, 2), (0, 2, 2, 0)])
+		blue = SegmentArray.fromCoordinates([(3, 0, 4, 0), (1, 0, 1, 3)])
+		self.assertEqual(intersectionsBetween(red, blue),
+						 [((0, 1), (1, 1)), ((1, 1), (1, 1))])
+
+	def test_intersectionsBetween__shared_segment(self):
+		s = ComparableSegment(0, 0, 1, 1)
+		with self.assertRaises(ValueError):
+			intersectionsBetween([s], [s])
+
+	# hasIntersection
+
+	def polygon(self, points):
+		return [ComparableSegment(*points[i - 1], *points[i])
+				for i in range(len(points))]
+
+	def test_hasIntersection_simple_polygon(self):
+		square = self.polygon([(0, 0), (2, 0), (2, 2), (1, 3), (0, 2)])
+		self.assertEqual(hasIntersection(square), None)
+
+	def test_hasIntersection_bowtie(self):
+		bowtie = self.polygon([(0, 0), (2, 2), (2, 0), (0, 2)])
+		(seg, other), inter = hasIntersection(bowtie)
+		self.assertEqual(inter, (1, 1))
+		self.assertEqual({id(seg), id(other)}, {id(bowtie[1]), id(bowtie[3])})
+
+	def test_hasIntersection_shared_endpoints(self):
+		polyline = [ComparableSegment(0, 0, 1, 1), ComparableSegment(1, 1, 2, 0)]
+		self.assertEqual(hasIntersection(polyline), None)
+		self.assertEqual(hasIntersection(polyline, False),
+						 ((polyline[0], polyline[1]), (1, 1)))
+
+	def test_hasIntersection_collinear_edges(self):
+		straight = [ComparableSegment(0, 0, 1, 0), ComparableSegment(1, 0, 2, 0)]
+		self.assertEqual(hasIntersection(straight), None)
+		backwards = [ComparableSegment(0, 0, 2, 0), ComparableSegment(1, 0, 2, 0)]
+		self.assertNotEqual(hasIntersection(backwards), None)
+
+	def test_hasIntersection_vertex_on_edge(self):
+		ring = self.polygon([(0, 0), (4, 0), (4, 4), (2, 0), (0, 4)])
+		self.assertEqual(hasIntersection(ring)[1], (2, 0))
+
+	def test_hasIntersection_vertical(self):
+		segments = [ComparableSegment(1, 0, 1, 2), ComparableSegment(0, 2, 2, 2),
+					ComparableSegment(1, 2, 1, 3)]
+		self.assertEqual(hasIntersection(segments), ((segments[0], segments[1]), (1, 2)))
+		self.assertEqual(hasIntersection([segments[0], segments[2]]), None)
+
+	def test_hasIntersection_random(self):
+		rand = Random(4)
+		for i in range(100):
+			segments = self.randomSegments(rand, rand.randint(2, 6),
+										   lambda: rand.randint(0, 6))
+			res = hasIntersection(segments, False)
+			self.assertEqual(res != None, self.bruteForcePairs(segments) != set())
+			if res != None:
+				(seg, other), inter = res
+				self.assertNotEqual(seg.intersectionWith(other), None)
+
+	def test_hasIntersection_segment_array(self):
+		array = SegmentArray.fromCoordinates([(3, 0, 4, 0), (0, 0, 2, 2),
+											  (0, 2, 2, 0)])
+		self.assertEqual(hasIntersection(array), ((2, 1), (1, 1)))
+		self.assertEqual(hasIntersection([]), None)
+
+
 
 
 if __name__ == '__main__':
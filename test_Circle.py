@@ -0,0 +1,88 @@
+import unittest
+from random import Random
+from Circle import Circle
+from Segment import Segment
+from SegmentArray import SegmentArray
+
+class TestCircle(unittest.TestCase):
+
+	# intersectionWithSegment
+
+	def test_intersectionWithSegment(self):
+		c = Circle(0, 0, 1)
+		self.assertEqual(c.intersectionWithSegment(Segment(-2, 0, 2, 0)),
+						 [(-1, 0), (1, 0)])
+		self.assertEqual(c.intersectionWithSegment(Segment(-2, 1, 2, 1)), [(0, 1)])
+		self.assertEqual(c.intersectionWithSegment(Segment(-2, 2, 2, 2)), [])
+
+	# intersectSegments
+
+	def scalarIntersections(self, circles, segments, eps=0.001):
+		return [(i, j, x, y) for i, c in enumerate(circles)
+				for j, s in enumerate(segments)
+				for x, y in c.intersectionWithSegment(s, eps)]
+
+	def batchIntersections(self, circles, segments, eps=0.001):
+		circle, segment, x, y = Circle.intersectSegments(circles, segments, eps)
+		return list(zip(circle.tolist(), segment.tolist(), x.tolist(), y.tolist()))
+
+	def test_intersectSegments(self):
+		circles = [Circle(0, 0, 1), Circle(5, 5, 1)]
+		segments = [Segment(-2, 0, 2, 0), Segment(-2, 1, 2, 1),
+					Segment(4, 4, 6, 6), Segment(0, 5, 1, 5)]
+		res = self.batchIntersections(circles, segments)
+		self.assertEqual(res[:3], [(0, 0, -1, 0), (0, 0, 1, 0), (0, 1, 0, 1)])
+		self.assertEqual([(i, j) for i, j, x, y in res[3:]], [(1, 2), (1, 2)])
+		for (i, j, x, y), expected in zip(res[3:], (5 - 0.5**0.5, 5 + 0.5**0.5)):
+			self.assertAlmostEqual(x, expected)
+			self.assertAlmostEqual(y, expected)
+		self.assertEqual(res, self.scalarIntersections(circles, segments))
+
+	def test_intersectSegments_integers(self):
+		rand = Random(0)
+		circles = [Circle(rand.randint(0, 10), rand.randint(0, 10),
+						  rand.randint(0, 5)) for i in range(20)]
+		segments = []
+		while len(segments) < 50:
+			c = [rand.randint(0, 12) for i in range(4)]
+			if c[:2] != c[2:]:
+				segments.append(Segment(*c))
+		for eps in (0, 0.001, 10):
+			self.assertEqual(self.batchIntersections(circles, segments, eps),
+							 self.scalarIntersections(circles, segments, eps))
+
+	def test_intersectSegments_floats(self):
+		rand = Random(1)
+		circles = [Circle(rand.random()*10, rand.random()*10, rand.random()*3)
+				   for i in range(30)]
+		segments = [Segment(*(rand.random()*12 for i in range(4)))
+					for i in range(100)]
+		res = self.batchIntersections(circles, segments)
+		expected = self.scalarIntersections(circles, segments)
+		self.assertEqual(len(res), len(expected))
+		for (i, j, x, y), (ei, ej, ex, ey) in zip(res, expected):
+			self.assertEqual((i, j), (ei, ej))
+			self.assertAlmostEqual(x, ex)
+			self.assertAlmostEqual(y, ey)
+
+	def test_intersectSegments_tangent_eps(self):
+		# The tangent point lies outside the bounding box of the circle
+		# when eps is large.
+		circle = Circle(0, 0, 1)
+		segment = Segment(-0.1, 1.01, 0.1, 1.01)
+		for eps in (0.001, 0.01):
+			self.assertEqual(self.batchIntersections([circle], [segment], eps),
+							 self.scalarIntersections([circle], [segment], eps))
+
+	def test_intersectSegments_arrays(self):
+		import numpy as np
+		circles = np.array([(0, 0, 1), (5, 5, 1)], dtype=float)
+		segments = SegmentArray.fromCoordinates([(4, 5, 6, 5), (-2, 0, 2, 0)])
+		self.assertEqual(self.batchIntersections(circles, segments),
+						 [(0, 1, -1, 0), (0, 1, 1, 0), (1, 0, 4, 5), (1, 0, 6, 5)])
+		circle, segment, x, y = Circle.intersectSegments([], segments)
+		self.assertEqual(len(circle), 0)
+
+
+if __name__ == '__main__':
+	unittest.main()
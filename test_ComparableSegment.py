@@ -3,6 +3,14 @@ from ComparableSegment import ComparableSegment
 
 class TestComparableSegment(unittest.TestCase):
 
+	# __init__
+
+	def test__init__slots(self):
+		s = ComparableSegment(0, 0, 1, 1)
+		with self.assertRaises(AttributeError):
+			s.__dict__
+		self.assertEqual(len({s, ComparableSegment(1, 1, 0, 0)}), 1)
+
 	# __lt__
 
 	def test__lt__different_y_coordinates(self):
@@ -63,6 +71,40 @@ class TestComparableSegment(unittest.TestCase):
 		ComparableSegment.currentX = 2
 		self.assertFalse(s2.isBelow(s1) or s1.isBelow(s2))
 
+	# cached comparison keys
+
+	def test__gradient__cached(self):
+		s = ComparableSegment(0, 1, 2, 2)
+		self.assertEqual((s.gradient(), s.yIntercept()), (0.5, 1))
+
+	def test__gradient__vertical(self):
+		s = ComparableSegment(0, 0, 0, 1)
+		with self.assertRaises(ZeroDivisionError):
+			s.gradient()
+		with self.assertRaises(ZeroDivisionError):
+			s.yIntercept()
+
+	def test__currentY__follows_currentX(self):
+		s = ComparableSegment(0, 0, 2, 2)
+		ComparableSegment.currentX = 1
+		self.assertEqual(s.currentY(), 1)
+		ComparableSegment.currentX = 2
+		self.assertEqual(s.currentY(), 2)
+		ComparableSegment.currentX = 3
+		self.assertEqual(s.currentY(), None)
+
+	# pin
+
+	def test__pin(self):
+		s1 = ComparableSegment(0, 0.1, 0.3, 0.4)
+		s2 = ComparableSegment(0.1, 0.2, 0.3, 0.2)
+		s1.pin(0.1, 0.2)
+		s2.pin(0.1, 0.2)
+		ComparableSegment.currentX = 0.1
+		self.assertEqual(s1.currentY(), 0.2)
+		self.assertTrue(s2 < s1)
+		self.assertFalse(s1 < s2)
+
 
 
 
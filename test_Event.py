@@ -29,6 +29,24 @@ class TestEvent(unittest.TestCase):
 		e2 = None
 		self.assertNotEqual(e1, e2)
 
+	def test__eq__other_type(self):
+		self.assertNotEqual(Event(0, 0), (0, 0))
+
+	def test__hash(self):
+		self.assertEqual(len({Event(0, 0), Event(0, 0), Event(0, 1)}), 2)
+
+	# isEmpty
+
+	def test__isEmpty(self):
+		e = Event(0, 0)
+		self.assertTrue(e.isEmpty())
+		self.assertEqual(e.peek('left'), ())
+		e.addSegment(ComparableSegment(0, 0, 1, 1))
+		self.assertFalse(e.isEmpty())
+		self.assertEqual(len(e.peek('left')), 1)
+		self.assertEqual([e.peek(name) for name in ('right', 'inner_inter', 'low', 'high')],
+						 [(), (), (), ()])
+
 	# __cmp__
 
 	def test__cmp_different_x(self):
@@ -2,6 +2,7 @@ import unittest
 from ComparableSegment import ComparableSegment
 from Event import Event
 from EventQueue import EventQueue
+from SegmentArray import SegmentArray, RowSegment
 
 class TestEventQueue(unittest.TestCase):
 
@@ -71,6 +72,52 @@ class TestEventQueue(unittest.TestCase):
 						 ([], [s1, s4], [], [], []))
 		self.assertTrue(q.isEmpty())
 
+	def test__init__sorted_lists(self):
+		segments = [ComparableSegment(0, 0, 4, g) for g in (3, -1, 2, 0, 1, -2)]
+		q = EventQueue(segments)
+		e = q.nextEvent()
+		self.assertEqual(e.left, sorted(segments, key=lambda s: s.gradient()))
+		self.assertEqual(len(q), 6)
+
+	def test__init__rows(self):
+		rows = SegmentArray.fromCoordinates([(0, 1, 2, 2), (0, 0, 1, 1),
+											 (1, 1, 1, 3), (0, 0, 2, 2)])
+		segments = list(rows)
+		events = []
+		q, r = EventQueue(segments), EventQueue(rows)
+		self.assertEqual(len(r), len(q))
+		while not q.isEmpty():
+			e, f = q.nextEvent(), r.nextEvent()
+			self.assertEqual((f.x, f.y), (e.x, e.y))
+			for name in Event.LISTS:
+				self.assertEqual(getattr(f, name), getattr(e, name))
+			for s in f.left + f.low:
+				self.assertTrue(isinstance(s, RowSegment))
+				self.assertEqual(s, segments[s.row])
+		self.assertTrue(r.isEmpty())
+
+	def test__init__rows_created_lazily(self):
+		rows = SegmentArray.fromCoordinates([(i, 0, i + 1.5, 1) for i in range(10)])
+		q = EventQueue(rows)
+		self.assertEqual(q.active, {})
+		e = q.nextEvent()
+		self.assertEqual(list(q.active), [0])
+		self.assertIs(q.active[0], e.left[0])
+		for i in range(5):
+			q.nextEvent()
+		# The first segments ended, and were forgotten
+		self.assertEqual(sorted(q.active), [2, 3])
+
+	def test__addCrossing__rows_at_endpoint(self):
+		rows = SegmentArray.fromCoordinates([(0, 0, 2, 2), (0, 4, 4, 0)])
+		q = EventQueue(rows)
+		s1, s2 = q.nextEvent().left[0], q.nextEvent().left[0]
+		q.addCrossing(s1, s2, 2, 2)
+		e = q.nextEvent()
+		self.assertEqual((e.x, e.y), (2, 2))
+		self.assertEqual((e.right, e.inner_inter), ([s1], [s2]))
+		self.assertEqual(len(q), 1)
+
 	# addIntersectingSegment
 
 	def test__addIntersectingSegment__valid(self):
@@ -97,6 +144,109 @@ class TestEventQueue(unittest.TestCase):
 						 ([], [s2], [], [], []))
 		self.assertTrue(q.isEmpty())
 
+	def test__addIntersectingSegment__between_endpoints(self):
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		s3 = ComparableSegment(1, 5, 3, 5)
+		q = EventQueue([s1, s2, s3])
+		q.addIntersectingSegment(s1, 2, 2)
+		q.addIntersectingSegment(s2, 2, 2)
+		self.assertEqual(len(q), 7)
+		points = []
+		while not q.isEmpty():
+			e = q.nextEvent()
+			points.append((e.x, e.y))
+		self.assertEqual(points, [(0, 0), (0, 4), (1, 5), (2, 2), (3, 5),
+								  (4, 0), (4, 4)])
+
+	def test__addIntersectingSegment__equal_segments(self):
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 0, 4, 4)
+		q = EventQueue([s1, s2])
+		for s in (s1, s2, s1):
+			q.addIntersectingSegment(s, 2, 2)
+		q.nextEvent()
+		e = q.nextEvent()
+		self.assertEqual(sorted(map(id, e.inner_inter)), sorted(map(id, [s1, s2])))
+
+	# addCrossing
+
+	def test__addCrossing(self):
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		q = EventQueue([s1, s2])
+		q.addCrossing(s1, s2, 2, 2)
+		self.assertEqual(len(q), 5)
+		q.nextEvent()
+		q.nextEvent()
+		e = q.nextEvent()
+		self.assertEqual((e.x, e.y), (2, 2))
+		self.assertEqual(sorted(map(id, e.inner_inter)), sorted(map(id, [s1, s2])))
+
+	def test__addCrossing__at_endpoint(self):
+		s1 = ComparableSegment(0, 0, 2, 2)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		q = EventQueue([s1, s2])
+		q.addCrossing(s1, s2, 2, 2)
+		self.assertEqual(len(q), 4)
+		q.nextEvent()
+		q.nextEvent()
+		e = q.nextEvent()
+		self.assertEqual((e.x, e.y), (2, 2))
+		self.assertEqual((e.right, e.inner_inter), ([s1], [s2]))
+
+	# cancelCrossing
+
+	def test__cancelCrossing(self):
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		q = EventQueue([s1, s2])
+		q.addCrossing(s1, s2, 2, 2)
+		q.cancelCrossing(s2, s1)
+		self.assertEqual(len(q), 4)
+		points = []
+		while not q.isEmpty():
+			e = q.nextEvent()
+			points.append((e.x, e.y))
+		self.assertEqual(points, [(0, 0), (0, 4), (4, 0), (4, 4)])
+
+	def test__cancelCrossing__other_crossing_at_same_point(self):
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		s3 = ComparableSegment(0, 2, 4, 2)
+		q = EventQueue([s1, s2, s3])
+		q.addCrossing(s1, s3, 2, 2)
+		q.addCrossing(s3, s2, 2, 2)
+		q.cancelCrossing(s1, s3)
+		self.assertEqual(len(q), 7)
+		for i in range(3):
+			q.nextEvent()
+		e = q.nextEvent()
+		self.assertEqual((e.x, e.y), (2, 2))
+		self.assertEqual(sorted(map(id, e.inner_inter)), sorted(map(id, [s2, s3])))
+
+	def test__cancelCrossings(self):
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		s3 = ComparableSegment(0, 1, 4, 3)
+		q = EventQueue([s1, s2, s3])
+		q.addCrossing(s1, s3, 2, 2)
+		q.addCrossing(s3, s2, 8/3, 7/3)
+		q.cancelCrossings(s3)
+		self.assertEqual(len(q), 6)
+		self.assertEqual(q.crossings, {})
+
+	def test__cancelCrossing__reached(self):
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		q = EventQueue([s1, s2])
+		q.addCrossing(s1, s2, 2, 2)
+		for i in range(3):
+			e = q.nextEvent()
+		q.cancelCrossing(s1, s2)
+		self.assertEqual(len(e.inner_inter), 2)
+		self.assertEqual(len(q), 2)
+
 	def test__addIntersectingSegment__invalid(self):
 		s1 = ComparableSegment(0, 0, 1, 1)
 		q = EventQueue([s1])
@@ -0,0 +1,91 @@
+import unittest
+from random import Random
+from ComparableSegment import ComparableSegment
+from GridIntersections import (iterGridIntersections, gridIntersectionsList,
+							   averageLength, medianLength, preferGrid)
+
+def bruteForce(segments):
+	res = []
+	for i in range(len(segments)):
+		for j in range(i + 1, len(segments)):
+			inter = segments[i].intersectionWith(segments[j])
+			if inter != None:
+				res.append(((segments[i], segments[j]), inter))
+	return res
+
+def key(segments, intersections):
+	index = {id(s): i for i, s in enumerate(segments)}
+	return sorted((index[id(seg)], index[id(other)]) 
+				  for (seg, other), inter in intersections)
+
+def randomSegments(n, length, seed=0):
+	rand = Random(seed)
+	res = []
+	for i in range(n):
+		x, y = rand.random(), rand.random()
+		res.append(ComparableSegment(x, y, x + rand.uniform(-length, length),
+									 y + rand.uniform(-length, length)))
+	return res
+
+class TestGridIntersections(unittest.TestCase):
+
+	# iterGridIntersections
+
+	def test__empty(self):
+		self.assertEqual(gridIntersectionsList([]), [])
+
+	def test__is_generator(self):
+		s1 = ComparableSegment(0, 0, 1, 1)
+		s2 = ComparableSegment(0, 1, 1, 0)
+		it = iterGridIntersections([s1, s2])
+		self.assertEqual(next(it), ((s1, s2), (0.5, 0.5)))
+
+	def test__same_as_brute_force(self):
+		segments = randomSegments(300, 0.05)
+		self.assertEqual(key(segments, gridIntersectionsList(segments)),
+						 key(segments, bruteForce(segments)))
+
+	def test__long_segments_reported_once(self):
+		segments = randomSegments(100, 0.5, seed=1)
+		self.assertEqual(key(segments, gridIntersectionsList(segments, 0.01)),
+						 key(segments, bruteForce(segments)))
+
+	def test__overlaps_and_verticals(self):
+		segments = [ComparableSegment(0, 0, 4, 4), ComparableSegment(1, 1, 3, 3),
+					ComparableSegment(2, 0, 2, 5), ComparableSegment(2, 4, 2, 6),
+					ComparableSegment(0, 4, 4, 4)]
+		self.assertEqual(key(segments, gridIntersectionsList(segments, 0.5)),
+						 key(segments, bruteForce(segments)))
+
+	# averageLength
+
+	def test__averageLength(self):
+		segments = [ComparableSegment(0, 0, 3, 4), ComparableSegment(0, 0, 0, 1)]
+		self.assertEqual(averageLength(segments), 3)
+
+	# medianLength
+
+	def test__medianLength(self):
+		segments = [ComparableSegment(0, 0, 3, 4), ComparableSegment(0, 0, 0, 1),
+					ComparableSegment(0, 0, 100, 0)]
+		self.assertEqual(medianLength(segments), 5)
+
+	# preferGrid
+
+	def test__preferGrid__short_segments(self):
+		self.assertTrue(preferGrid(randomSegments(1000, 0.01)))
+
+	def test__preferGrid__long_segments(self):
+		self.assertFalse(preferGrid(randomSegments(1000, 0.5)))
+
+	def test__preferGrid__one_long_segment(self):
+		segments = randomSegments(1000, 0.01)
+		segments.append(ComparableSegment(0, 0, 1, 1))
+		self.assertFalse(preferGrid(segments))
+
+	def test__preferGrid__few_segments(self):
+		self.assertFalse(preferGrid(randomSegments(10, 0.01)))
+
+
+if __name__ == '__main__':
+	unittest.main()
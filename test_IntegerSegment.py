@@ -0,0 +1,156 @@
+import unittest
+from fractions import Fraction
+from Segment import Segment
+from ComparableSegment import ComparableSegment
+from IntegerSegment import IntegerSegment
+from EventQueue import EventQueue
+from BentleyOttmann import intersectionsList
+
+class TestIntegerSegment(unittest.TestCase):
+
+	# __init__
+
+	def test__init__valid_args_wrong_order(self):
+		s = IntegerSegment(1, 1, 0, 0)
+		self.assertEqual((s.x1, s.y1, s.x2, s.y2), (0, 0, 1, 1))
+
+	def test__init__float_args(self):
+		with self.assertRaises(TypeError):
+			s = IntegerSegment(0, 0, 1.5, 1)
+
+	# gradient, yIntercept, yAtX
+
+	def test__gradient(self):
+		s = IntegerSegment(0, 1, 3, 2)
+		self.assertEqual(s.gradient(), Fraction(1, 3))
+		self.assertEqual(s.yIntercept(), 1)
+
+	def test__gradient__vertical(self):
+		s = IntegerSegment(0, 0, 0, 1)
+		with self.assertRaises(ZeroDivisionError):
+			s.gradient()
+
+	def test__yAtX(self):
+		s = IntegerSegment(0, 0, 3, 1)
+		self.assertEqual(s.yAtX(1), Fraction(1, 3))
+		self.assertEqual(s.yAtX(Fraction(3, 2)), Fraction(1, 2))
+		self.assertEqual(s.yAtX(3), 1)
+		self.assertEqual(s.yAtX(4), None)
+
+	# __lt__, isBelow
+
+	def test__lt__different_y_coordinates(self):
+		s1 = IntegerSegment(0, 0, 2, 2)
+		s2 = IntegerSegment(0, 2, 2, 0)
+		ComparableSegment.currentX = 0
+		self.assertTrue(s1 < s2)
+		ComparableSegment.currentX = 2
+		self.assertTrue(s1 > s2)
+
+	def test__lt__different_gradient(self):
+		s1 = IntegerSegment(0, 0, 2, 2)
+		s2 = IntegerSegment(0, 2, 2, 0)
+		ComparableSegment.currentX = 1
+		self.assertTrue(s1 > s2)
+		self.assertTrue(s2.isBelow(s1))
+
+	def test__lt__rational_currentX(self):
+		s1 = IntegerSegment(0, 0, 3, 1)
+		s2 = IntegerSegment(0, 1, 3, 0)
+		ComparableSegment.currentX = Fraction(3, 2)
+		self.assertTrue(s2 < s1)
+		self.assertTrue(s2.isBelow(s1))
+		ComparableSegment.currentX = Fraction(4, 3)
+		self.assertTrue(s1 < s2)
+
+	def test__lt__equals(self):
+		s1 = IntegerSegment(0, 0, 2, 2)
+		s2 = IntegerSegment(0, 0, 2, 2)
+		ComparableSegment.currentX = 1
+		self.assertFalse(s1 < s2)
+		self.assertFalse(s2 < s1)
+
+	# intersectionWith
+
+	def test__intersectionWith__rational_point(self):
+		s1 = IntegerSegment(0, 0, 3, 1)
+		s2 = IntegerSegment(0, 1, 3, 0)
+		self.assertEqual(s1.intersectionWith(s2), (Fraction(3, 2), Fraction(1, 2)))
+
+	def test__intersectionWith__integer_point(self):
+		s1 = IntegerSegment(0, 0, 2, 2)
+		s2 = IntegerSegment(0, 2, 2, 0)
+		inter = s1.intersectionWith(s2)
+		self.assertEqual(inter, (1, 1))
+		self.assertTrue(isinstance(inter[0], int))
+
+	def test__intersectionWith__endpoint(self):
+		s1 = IntegerSegment(0, 0, 0, 2)
+		s2 = IntegerSegment(0, 1, 2, 2)
+		self.assertEqual(s1.intersectionWith(s2), (0, 1))
+
+	def test__intersectionWith__disjoint(self):
+		s1 = IntegerSegment(1, 1, 2, 2)
+		s2 = IntegerSegment(0, 1, 1, 0)
+		self.assertEqual(s1.intersectionWith(s2), None)
+
+	def test__intersectionWith__parallel(self):
+		s1 = IntegerSegment(0, 0, 1, 1)
+		s2 = IntegerSegment(0, 1, 1, 2)
+		self.assertEqual(s1.intersectionWith(s2), None)
+
+	def test__intersectionWith__overlapping(self):
+		s1 = IntegerSegment(0, 0, 2, 2)
+		s2 = IntegerSegment(1, 1, 3, 3)
+		self.assertEqual(s1.intersectionWith(s2), Segment(1, 1, 2, 2))
+
+	def test__intersectionWith__collinear_touching(self):
+		s1 = IntegerSegment(0, 0, 0, 1)
+		s2 = IntegerSegment(0, 1, 0, 3)
+		self.assertEqual(s1.intersectionWith(s2), (0, 1))
+
+	def test__intersectionWith__collinear_disjoint(self):
+		s1 = IntegerSegment(0, 0, 1, 1)
+		s2 = IntegerSegment(2, 2, 3, 3)
+		self.assertEqual(s1.intersectionWith(s2), None)
+
+	def test__intersectionWith__same_as_float(self):
+		from random import Random
+		rand = Random(0)
+		for i in range(2000):
+			c1 = [rand.randint(0, 5) for j in range(4)]
+			c2 = [rand.randint(0, 5) for j in range(4)]
+			if c1[:2] == c1[2:] or c2[:2] == c2[2:]:
+				continue
+			exact = IntegerSegment(*c1).intersectionWith(IntegerSegment(*c2))
+			approx = Segment(*c1).intersectionWith(Segment(*c2))
+			if isinstance(exact, tuple):
+				self.assertAlmostEqual(exact[0], approx[0])
+				self.assertAlmostEqual(exact[1], approx[1])
+			else:
+				self.assertEqual(exact, approx)
+
+	def test__intersectionWith__same_point_from_several_pairs(self):
+		# These 3 segments all go through (1/3, 1/3)
+		s1 = IntegerSegment(0, 0, 1, 1)
+		s2 = IntegerSegment(0, 1, 1, -1)
+		s3 = IntegerSegment(-1, 1, 1, 0)
+		points = [s1.intersectionWith(s2), s1.intersectionWith(s3),
+				  s2.intersectionWith(s3)]
+		self.assertEqual(points, [(Fraction(1, 3), Fraction(1, 3))]*3)
+		q = EventQueue([s1, s2, s3])
+		for seg in (s1, s2, s3):
+			q.addIntersectingSegment(seg, Fraction(1, 3), Fraction(1, 3))
+		self.assertEqual(len(q), 7)
+
+	# intersectionsList
+
+	def test__intersectionsList(self):
+		s1 = IntegerSegment(0, 0, 3, 1)
+		s2 = IntegerSegment(0, 1, 3, 0)
+		self.assertEqual(intersectionsList([s1, s2]),
+						 [((s1, s2), (Fraction(3, 2), Fraction(1, 2)))])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+from random import Random
+from ComparableSegment import ComparableSegment
+from SegmentArray import SegmentArray
+from BentleyOttmann import intersectionsList
+from ParallelSweep import parallelIntersectionsList, slabBoundaries, clipToSlab, \
+	_slabTasks
+
+def pairSet(segments, intersections):
+	index = {id(s): i for i, s in enumerate(segments)}
+	return {frozenset((index[id(seg)], index[id(other)]))
+			for (seg, other), inter in intersections}
+
+class TestParallelSweep(unittest.TestCase):
+
+	# slabBoundaries
+
+	def test__slabBoundaries__balanced(self):
+		segments = [ComparableSegment(i, 0, i + 1, 1) for i in range(8)]
+		self.assertEqual(slabBoundaries(segments, 4), [0, 2, 4, 6, 8])
+
+	def test__slabBoundaries__single_x(self):
+		segments = [ComparableSegment(0, i, 0, i + 1) for i in range(4)]
+		self.assertEqual(slabBoundaries(segments, 4), [0, 0])
+
+	# clipToSlab
+
+	def test__clipToSlab(self):
+		segments = [ComparableSegment(0, 0, 4, 4), ComparableSegment(2, 0, 2, 1),
+					ComparableSegment(3, 0, 4, 0), ComparableSegment(0, 1, 1, 1)]
+		self.assertEqual(clipToSlab(segments, 1, 2), 
+						 [(0, 1, 1.0, 2, 2.0), (1, 2, 0, 2, 1)])
+
+	def test__clipToSlab__horizontal_exact(self):
+		segments = [ComparableSegment(0, 6, 5, 6), ComparableSegment(0, 0.1, 3, 0.7)]
+		self.assertEqual(clipToSlab(segments, 1, 2)[0], (0, 1, 6, 2, 6))
+
+	# _slabTasks
+
+	def test__slabTasks__same_as_clipToSlab(self):
+		rand = Random(0)
+		segments = [ComparableSegment(*[rand.randint(0, 8) for k in range(4)])
+					for i in range(40)]
+		segments = [s for s in segments if (s.x1, s.y1) != (s.x2, s.y2)]
+		bounds = slabBoundaries(segments, 4)
+		tasks = _slabTasks(segments, bounds)
+		self.assertEqual(len(tasks), len(bounds) - 1)
+		for (parts, originals), lo, hi in zip(tasks, bounds, bounds[1:]):
+			self.assertEqual(parts, clipToSlab(segments, lo, hi))
+			self.assertEqual(sorted(originals), [part[0] for part in parts])
+
+	# parallelIntersectionsList
+
+	def assertSameAsSerial(self, segments, **kwargs):
+		serial = intersectionsList(segments)
+		parallel = parallelIntersectionsList(segments, **kwargs)
+		self.assertEqual(pairSet(segments, parallel), pairSet(segments, serial))
+		self.assertEqual(len(parallel), len(pairSet(segments, parallel)))
+
+	def test__grid(self):
+		segments = [ComparableSegment(0, i + 0.5, 10, i + 0.5) for i in range(10)]
+		segments += [ComparableSegment(i + 0.5, 0, i + 0.5, 10) for i in range(10)]
+		self.assertSameAsSerial(segments, workers=2, slabs=4)
+
+	def test__polyline(self):
+		segments = [ComparableSegment(i, i % 2, i + 1, (i + 1) % 2)
+					for i in range(20)]
+		self.assertSameAsSerial(segments, workers=2, slabs=5)
+
+	def test__on_boundaries(self):
+		# Boundaries are at x = 2 and x = 4
+		segments = [ComparableSegment(0, 0, 2, 0), ComparableSegment(2, 0, 3, 3),
+					ComparableSegment(2, -1, 2, 1), ComparableSegment(1, 5, 4, 5),
+					ComparableSegment(4, 5, 6, 6), ComparableSegment(4, 4, 4, 6)]
+		self.assertEqual(slabBoundaries(segments, 3), [0, 2, 4, 6])
+		self.assertSameAsSerial(segments, workers=1, slabs=3)
+
+	def test__overlap_across_boundary(self):
+		segments = [ComparableSegment(0, 0, 4, 4), ComparableSegment(1, 1, 3, 3)]
+		res = parallelIntersectionsList(segments, workers=1, slabs=2)
+		self.assertEqual(res, [((segments[0], segments[1]),
+								ComparableSegment(1, 1, 3, 3))])
+
+	def test__clipped_horizontal_touching_vertical(self):
+		# The horizontal segment must not be clipped to end at
+		# y = 6.000000000000001, missing the vertical one
+		segments = [ComparableSegment(0, 6, 5, 6), ComparableSegment(4, 0, 4, 1),
+					ComparableSegment(4, 2, 6, 2), ComparableSegment(2, 3, 2, 6),
+					ComparableSegment(-0.6824, 0.7259, 0.5676, -0.6038),
+					ComparableSegment(-0.9865, -0.0375, 0.8208, 0.0312)]
+		res = parallelIntersectionsList(segments, workers=1, slabs=3)
+		self.assertIn(frozenset((0, 3)), pairSet(segments, res))
+		self.assertSameAsSerial(segments, workers=1, slabs=3)
+
+	def test__random__same_as_brute_force(self):
+		rand = Random(1)
+		for n in range(150):
+			segments = []
+			while len(segments) < 20:
+				kind = rand.random()
+				if kind < 0.35:
+					c = [rand.randint(0, 8) for k in range(4)]
+				elif kind < 0.55:
+					x = rand.randint(0, 8)
+					c = [x, rand.randint(0, 8), x, rand.randint(0, 8)]
+				elif kind < 0.75:
+					y = rand.randint(0, 8)
+					c = [rand.randint(0, 8), y, rand.randint(0, 8), y]
+				else:
+					c = [rand.uniform(-1, 9) for k in range(4)]
+				if (c[0], c[1]) != (c[2], c[3]):
+					segments.append(ComparableSegment(*c))
+			expected = {frozenset((i, j)) for i in range(len(segments))
+						for j in range(i + 1, len(segments))
+						if segments[i].intersectionWith(segments[j]) != None}
+			for slabs in (2, 3, 5):
+				res = parallelIntersectionsList(segments, workers=1, slabs=slabs)
+				self.assertEqual(pairSet(segments, res), expected)
+
+	def test__segment_array(self):
+		a = SegmentArray.fromCoordinates([(0, 0, 1, 1), (2, 2, 3, 3),
+										  (1, 1, 2, 0)])
+		self.assertEqual(parallelIntersectionsList(a, workers=1, slabs=2),
+						 [((0, 2), (1.0, 1.0))])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,123 @@
+import os
+import unittest
+import tempfile
+from unittest import mock
+from ComparableSegment import ComparableSegment
+from IntegerSegment import IntegerSegment
+from SegmentArray import SegmentArray
+from ResultCache import ResultCache
+from BentleyOttmann import intersectionsList
+
+class TestResultCache(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.TemporaryDirectory()
+		self.cache = ResultCache(self.directory.name)
+		self.segments = [ComparableSegment(0, 0, 2, 2), ComparableSegment(0, 2, 2, 0),
+						 ComparableSegment(1, 1, 3, 3)]
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	# intersectionsList
+
+	def test_miss_then_hit(self):
+		expected = intersectionsList(self.segments)
+		self.assertEqual(self.cache.intersectionsList(self.segments), expected)
+		self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+		self.assertEqual(self.cache.intersectionsList(self.segments), expected)
+		self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+	def test_identical_segments_hit(self):
+		self.cache.intersectionsList(self.segments)
+		copies = [ComparableSegment(s.x2, s.y2, s.x1, s.y1) for s in self.segments]
+		res = self.cache.intersectionsList(copies)
+		self.assertEqual(self.cache.hits, 1)
+		self.assertTrue(all(seg in copies and other in copies for (seg, other), inter in res))
+
+	def test_segment_array(self):
+		array = SegmentArray.fromSegments(self.segments)
+		self.cache.intersectionsList(self.segments)
+		self.assertEqual(self.cache.intersectionsList(array), intersectionsList(array))
+		self.assertEqual(self.cache.hits, 1)
+
+	def test_segment_array_not_converted(self):
+		array = SegmentArray.fromSegments(self.segments)
+		expected = intersectionsList(array)
+		with mock.patch.object(SegmentArray, 'fromSegments', side_effect=AssertionError):
+			self.assertEqual(self.cache.intersectionsList(array), expected)
+			self.assertEqual(self.cache.intersectionsList(array), expected)
+		self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+		self.assertEqual(self.cache.path(array), self.cache.path(self.segments))
+
+	def test_options_are_keys(self):
+		self.cache.intersectionsList(self.segments, 'sweep')
+		self.cache.intersectionsList(self.segments, 'grid')
+		self.cache.intersectionsList(self.segments, 'sweep', snap=0.5)
+		self.assertEqual(self.cache.misses, 3)
+		self.assertEqual(len(os.listdir(self.directory.name)), 3)
+
+	def test_bypass(self):
+		self.cache.bypass = True
+		self.assertEqual(self.cache.intersectionsList(self.segments),
+						 intersectionsList(self.segments))
+		self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+		self.assertEqual(os.listdir(self.directory.name), [])
+
+	def test_exact_segments_not_cached(self):
+		segments = [IntegerSegment(0, 0, 3, 3), IntegerSegment(0, 1, 1, 0)]
+		self.assertEqual(self.cache.intersectionsList(segments),
+						 intersectionsList(segments))
+		self.assertEqual(self.cache.size(), 0)
+
+	def test_corrupt_entry(self):
+		path = self.cache.path(self.segments)
+		with open(path, 'wb') as f:
+			f.write(b'garbage')
+		self.assertEqual(self.cache.intersectionsList(self.segments),
+						 intersectionsList(self.segments))
+		self.assertEqual(self.cache.misses, 1)
+		self.cache.intersectionsList(self.segments)
+		self.assertEqual(self.cache.hits, 1)
+
+	def test_entry_evicted_before_utime(self):
+		self.cache.intersectionsList(self.segments)
+		def evicted(path, times=None):
+			os.remove(path)
+			raise FileNotFoundError(path)
+		with mock.patch('os.utime', evicted):
+			self.assertEqual(self.cache.intersectionsList(self.segments),
+							 intersectionsList(self.segments))
+		self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+		self.assertTrue(os.path.exists(self.cache.path(self.segments)))
+
+	def test_store_interrupted(self):
+		with mock.patch('ResultCache.writeIntersections', side_effect=KeyboardInterrupt):
+			with self.assertRaises(KeyboardInterrupt):
+				self.cache.intersectionsList(self.segments)
+		self.assertEqual(os.listdir(self.directory.name), [])
+
+	# eviction
+
+	def test_least_recently_used_evicted(self):
+		sets = [self.segments[:k] for k in (2, 3)] + [self.segments[1:]]
+		paths = [self.cache.path(s) for s in sets]
+		for t, segments in enumerate(sets[:2]):
+			self.cache.intersectionsList(segments)
+			os.utime(paths[t], (t, t))
+		self.cache.max_size = self.cache.size() + 1
+		self.cache.intersectionsList(sets[0])
+		self.cache.intersectionsList(sets[2])
+		self.assertTrue(os.path.exists(paths[0]))
+		self.assertFalse(os.path.exists(paths[1]))
+		self.assertTrue(os.path.exists(paths[2]))
+
+	def test_clear(self):
+		self.cache.intersectionsList(self.segments)
+		self.assertGreater(self.cache.size(), 0)
+		self.cache.clear()
+		self.assertEqual(self.cache.size(), 0)
+
+
+if __name__ == '__main__':
+	unittest.main()
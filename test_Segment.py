@@ -37,6 +37,23 @@ class TestSegment(unittest.TestCase):
 		s2 = None
 		self.assertNotEqual(s1, s2)
 
+	def test__eq__other_type(self):
+		s1 = Segment(0, 0, 1, 1)
+		self.assertNotEqual(s1, (0, 0, 1, 1))
+		self.assertFalse(s1 == 'segment')
+
+	# __hash__
+
+	def test__hash__equal_segments(self):
+		s1 = Segment(0, 0, 1, 1)
+		s2 = Segment(1, 1, 0, 0)
+		self.assertEqual(hash(s1), hash(s2))
+		self.assertEqual(len({s1, s2, Segment(0, 0, 2, 2)}), 2)
+
+	def test__slots(self):
+		with self.assertRaises(AttributeError):
+			Segment(0, 0, 1, 1).__dict__
+
 	# __str__
 
 	def test__str(self):
@@ -179,6 +196,58 @@ class TestSegment(unittest.TestCase):
 		s2 = Segment(0, 0, 1, 1)
 		self.assertEqual(s1.intersectionWith(s2), (1, 1))
 
+	# batchIntersectionWith
+
+	def assertBatchMatchesScalar(self, segments, others):
+		kind, x, y, x2, y2 = Segment.batchIntersectionWith(segments, others)
+		for i, (s1, s2) in enumerate(zip(segments, others)):
+			inter = s1.intersectionWith(s2)
+			if inter == None:
+				self.assertEqual(kind[i], Segment.NO_INTERSECTION)
+			elif isinstance(inter, Segment):
+				self.assertEqual(kind[i], Segment.OVERLAP)
+				self.assertEqual((x[i], y[i], x2[i], y2[i]),
+								 (inter.x1, inter.y1, inter.x2, inter.y2))
+			else:
+				self.assertEqual(kind[i], Segment.POINT)
+				self.assertEqual((x[i], y[i]), inter)
+
+	def test__batchIntersectionWith__special_cases(self):
+		pairs = [((0, 0, 2, 2), (1, 1, 3, 3)), ((0, 0, 1, 1), (1, 1, 2, 2)),
+				 ((0, 0, 1, 1), (2, 2, 3, 3)), ((0, 0, 1, 1), (0, 1, 1, 2)),
+				 ((0, 0, 0, 2), (0, 1, 0, 3)), ((0, 0, 0, 1), (0, 1, 0, 3)),
+				 ((0, 0, 0, 1), (1, 0, 1, 1)), ((0, 0, 0, 2), (0, 1, 2, 2)),
+				 ((0, 0, 2, 2), (0, 1, 1, 0)), ((1, 1, 2, 2), (0, 1, 1, 0)),
+				 ((0, 0, 4, 0), (1, 0, 2, 0)), ((1, 0, 1, 2), (2, 2, 4, 4))]
+		segments = [Segment(*p[0]) for p in pairs]
+		others = [Segment(*p[1]) for p in pairs]
+		self.assertBatchMatchesScalar(segments, others)
+		self.assertBatchMatchesScalar(others, segments)
+
+	def test__batchIntersectionWith__random(self):
+		from random import Random
+		rand = Random(0)
+		def randomSegment():
+			# Small integer coordinates make parallel, collinear and
+			# vertical cases frequent
+			coordinates = [rand.randint(0, 4) for i in range(3)]
+			coordinates.append(rand.choice([rand.randint(0, 4), rand.random()]))
+			if coordinates[:2] == coordinates[2:]:
+				coordinates[3] += 1
+			return Segment(*coordinates)
+		segments = [randomSegment() for i in range(2000)]
+		others = [randomSegment() for i in range(2000)]
+		self.assertBatchMatchesScalar(segments, others)
+
+	def test__batchIntersectionWith__one_against_many(self):
+		s = Segment(0, 0, 2, 2)
+		others = [Segment(0, 2, 2, 0), Segment(3, 0, 3, 1), Segment(1, 1, 3, 3)]
+		kind, x, y, x2, y2 = Segment.batchIntersectionWith(s, others)
+		self.assertEqual(list(kind), [Segment.POINT, Segment.NO_INTERSECTION,
+									  Segment.OVERLAP])
+		self.assertEqual((x[0], y[0]), (1, 1))
+		self.assertEqual((x[2], y[2], x2[2], y2[2]), (1, 1, 2, 2))
+
 
 if __name__ == '__main__':
 	unittest.main()
\ No newline at end of file
@@ -0,0 +1,100 @@
+import unittest
+from ComparableSegment import ComparableSegment
+from random import Random
+from SegmentArray import SegmentArray, RowSegment
+from BentleyOttmann import intersectionsList, countIntersections, hasIntersection
+
+class TestSegmentArray(unittest.TestCase):
+
+	# __init__
+
+	def test__init__empty(self):
+		a = SegmentArray()
+		self.assertEqual(len(a), 0)
+
+	def test__init__normalizes(self):
+		a = SegmentArray([0, 1, 0], [0, 1, 1], [1, 0, 0], [1, 0, 0])
+		self.assertEqual(list(a.x1), [0, 0, 0])
+		self.assertEqual(list(a.y1), [0, 0, 0])
+		self.assertEqual(list(a.x2), [1, 1, 0])
+		self.assertEqual(list(a.y2), [1, 1, 1])
+
+	def test__init__invalid_args(self):
+		with self.assertRaises(ValueError) as cm:
+			a = SegmentArray([0, 1], [0, 1], [1, 1], [1, 1])
+		self.assertTrue('Invalid coordinates (segment 1 is a point)'
+						in cm.exception.args)
+
+	def test__init__different_lengths(self):
+		with self.assertRaises(ValueError):
+			a = SegmentArray([0, 1], [0], [1, 2], [1, 2])
+
+	# fromCoordinates, fromSegments
+
+	def test__fromCoordinates(self):
+		a = SegmentArray.fromCoordinates([(1, 1, 0, 0), (0, 0, 0, 1)])
+		self.assertEqual(list(a), [ComparableSegment(0, 0, 1, 1),
+								   ComparableSegment(0, 0, 0, 1)])
+
+	def test__fromSegments(self):
+		segments = [ComparableSegment(0, 0, 1, 1), ComparableSegment(0, 1, 2, 0)]
+		a = SegmentArray.fromSegments(segments)
+		self.assertEqual(list(a), segments)
+
+	# __getitem__
+
+	def test__getitem(self):
+		a = SegmentArray.fromCoordinates([(1, 1, 0, 0), (0, 2, 3, 0)])
+		s = a[1]
+		self.assertTrue(isinstance(s, ComparableSegment))
+		self.assertEqual(s, ComparableSegment(0, 2, 3, 0))
+
+	# rowSegment
+
+	def test__rowSegment(self):
+		a = SegmentArray.fromCoordinates([(1, 1, 0, 0), (0, 2, 3, 0)])
+		s = a.rowSegment(1)
+		self.assertTrue(isinstance(s, RowSegment))
+		self.assertEqual(s, ComparableSegment(0, 2, 3, 0))
+		self.assertEqual(s.row, 1)
+
+	# intersectionsList
+
+	def test__intersectionsList__reports_indices(self):
+		a = SegmentArray.fromCoordinates([(0, 0, 1, 1), (2, 2, 3, 3),
+										  (1, 1, 2, 0)])
+		self.assertEqual(intersectionsList(a), [((0, 2), (1, 1))])
+
+	def test__intersectionsList__vertical(self):
+		a = SegmentArray.fromCoordinates([(1, 0, 1, 2), (0, 1, 1, 1)])
+		self.assertEqual(intersectionsList(a), [((0, 1), (1, 1))])
+
+	def test__intersectionsList__same_as_segments(self):
+		rand = Random(0)
+		for n in range(20):
+			rows = [(rand.randint(0, 5), rand.randint(0, 5),
+					 rand.randint(0, 5), rand.randint(0, 5)) for i in range(20)]
+			rows = [r for r in rows if r[:2] != r[2:]]
+			a = SegmentArray.fromCoordinates(rows)
+			segments = list(a)
+			index = {id(s): i for i, s in enumerate(segments)}
+			self.assertEqual(intersectionsList(a, engine='sweep'),
+							 [((index[id(s)], index[id(t)]), inter) for (s, t), inter
+							  in intersectionsList(segments, engine='sweep')])
+			self.assertEqual(list(countIntersections(a, True, engine='sweep')),
+							 list(countIntersections(segments, True, engine='sweep')))
+
+	def test__intersectionsList__engines(self):
+		a = SegmentArray.fromCoordinates([(0, 0, 2, 2), (0, 2, 2, 0), (3, 0, 3, 3)])
+		for engine in ('grid', 'parallel'):
+			self.assertEqual(intersectionsList(a, engine), [((0, 1), (1, 1))])
+
+	# hasIntersection
+
+	def test__hasIntersection(self):
+		a = SegmentArray.fromCoordinates([(0, 0, 2, 0), (2, 0, 2, 2), (1, 1, 3, 1)])
+		self.assertEqual(hasIntersection(a), ((1, 2), (2, 1)))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,77 @@
+import os
+import unittest
+import tempfile
+from ComparableSegment import ComparableSegment
+from Segment import Segment
+from SegmentArray import SegmentArray
+from SegmentFile import writeSegments, readSegments, writeIntersections,\
+	readIntersections
+from BentleyOttmann import intersectionsList, iterIntersections
+
+class TestSegmentFile(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.TemporaryDirectory()
+		self.path = os.path.join(self.directory.name, 'segments.bin')
+		self.array = SegmentArray.fromCoordinates([(0, 0, 2, 2), (2, 0, 0, 2),
+												   (1, -1, 1, 3), (1, 1, 3, 3)])
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	# writeSegments / readSegments
+
+	def test_roundtrip(self):
+		self.assertEqual(writeSegments(self.path, self.array), 4)
+		self.assertEqual(os.path.getsize(self.path), 16 + 4*32)
+		res = readSegments(self.path)
+		self.assertEqual(len(res), 4)
+		self.assertEqual([tuple(c) for c in res.columns()],
+						 [tuple(c) for c in self.array.columns()])
+		self.assertEqual(res[1], ComparableSegment(0, 2, 2, 0))
+
+	def test_roundtrip_segments(self):
+		segments = [ComparableSegment(0, 0, 1, 1), Segment(3, 1, 2, 0)]
+		writeSegments(self.path, segments)
+		self.assertEqual(list(readSegments(self.path)), segments)
+
+	def test_read_is_lazy(self):
+		writeSegments(self.path, self.array)
+		res = readSegments(self.path)
+		self.assertIsInstance(res.x1, memoryview)
+		self.assertEqual(intersectionsList(res), intersectionsList(self.array))
+
+	def test_read_empty(self):
+		writeSegments(self.path, [])
+		self.assertEqual(len(readSegments(self.path)), 0)
+
+	def test_read_invalid(self):
+		with open(self.path, 'wb') as f:
+			f.write(b'not a segment file')
+		with self.assertRaises(ValueError):
+			readSegments(self.path)
+
+	def test_read_truncated(self):
+		writeSegments(self.path, self.array)
+		with open(self.path, 'r+b') as f:
+			f.truncate(16 + 3*32)
+		with self.assertRaises(ValueError):
+			readSegments(self.path)
+
+	# writeIntersections / readIntersections
+
+	def test_intersections_roundtrip(self):
+		expected = intersectionsList(self.array)
+		self.assertTrue(any(isinstance(inter, Segment) for pair, inter in expected))
+		count = writeIntersections(self.path, iterIntersections(self.array))
+		self.assertEqual(count, len(expected))
+		self.assertEqual(readIntersections(self.path), expected)
+
+	def test_intersections_wrong_kind(self):
+		writeSegments(self.path, self.array)
+		with self.assertRaises(ValueError):
+			readIntersections(self.path)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,244 @@
+import unittest
+from random import Random
+from unittest import mock
+from SweepLine import SweepLine
+from SkipListSweepLine import SkipListSweepLine
+from ComparableSegment import ComparableSegment
+from BentleyOttmann import intersectionsList, countIntersections, hasIntersection
+
+class TestSkipListSweepLine(unittest.TestCase):
+
+	def assertConsistent(self, line):
+		'''
+		Checks the links and widths of every level of line.
+		'''
+		nodes = [line.head]
+		node = line.head.next[0]
+		while node != None:
+			self.assertIs(line.nodes[id(node.seg)], node)
+			nodes.append(node)
+			node = node.next[0]
+		self.assertEqual(len(nodes) - 1, len(line))
+		for level in range(line.height):
+			ranks = [r for r, node in enumerate(nodes) if len(node.next) > level]
+			for r, succ in zip(ranks, ranks[1:] + [len(nodes)]):
+				node = nodes[r]
+				self.assertEqual(node.width[level], succ - r)
+				if succ < len(nodes):
+					self.assertIs(node.next[level], nodes[succ])
+					self.assertIs(nodes[succ].prev[level], node)
+				else:
+					self.assertIs(node.next[level], None)
+
+	def fill(self, segments):
+		line = SkipListSweepLine()
+		for seg in segments:
+			line.addSegment(seg)
+		return line
+
+	# __init__
+
+	def test__init__empty(self):
+		line = SkipListSweepLine()
+		self.assertTrue(line.isEmpty())
+		self.assertEqual(list(line), [])
+
+	# addSegment
+
+	def test__addSegment__ordered(self):
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(50)]
+		shuffled = segments[:]
+		Random(1).shuffle(shuffled)
+		line = self.fill(shuffled)
+		self.assertEqual(list(line), segments)
+		self.assertConsistent(line)
+
+	def test__addSegment__equal(self):
+		s1 = ComparableSegment(0, 0, 2, 2)
+		s2 = ComparableSegment(0, 0, 2, 2)
+		line = self.fill([s1, s2])
+		self.assertIs(line.segmentAbove(s1), s2)
+		self.assertIs(line.segmentBelow(s2), s1)
+
+	def test__addSegment__at_x(self):
+		line = SkipListSweepLine()
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		line.addSegment(s1)
+		line.addSegment(s2, 3)
+		self.assertEqual(line.order([s1, s2]), [s2, s1])
+		self.assertIs(line.segmentAbove(s2), s1)
+
+	def test__addSegment__returns_node(self):
+		line = SkipListSweepLine()
+		seg = ComparableSegment(0, 0, 4, 4)
+		node = line.addSegment(seg)
+		self.assertIs(node.seg, seg)
+		self.assertIs(line.nodes[id(seg)], node)
+
+	# removeSegment
+
+	def test__removeSegment(self):
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(20)]
+		line = self.fill(segments)
+		for seg in segments[::3]:
+			line.removeSegment(seg)
+			self.assertConsistent(line)
+		self.assertEqual(list(line), [s for i, s in enumerate(segments) if i % 3])
+		self.assertIs(line.segmentAbove(segments[2]), segments[4])
+
+	def test__removeSegments(self):
+		segments = [ComparableSegment(0, 0, 4, 4) for i in range(10)]
+		line = self.fill(segments)
+		line.removeSegments(segments[::2])
+		self.assertEqual(list(line), segments[1::2])
+		self.assertConsistent(line)
+
+	def test__removeSegment__absent(self):
+		line = self.fill([ComparableSegment(0, 0, 1, 1)])
+		with self.assertRaises(ValueError):
+			line.removeSegment(ComparableSegment(0, 0, 1, 1))
+
+	# segmentBelow, segmentAbove
+
+	def test__segmentBelow_segmentAbove(self):
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(3)]
+		line = self.fill(segments)
+		self.assertIs(line.segmentBelow(segments[0]), None)
+		self.assertIs(line.segmentBelow(segments[2]), segments[1])
+		self.assertIs(line.segmentAbove(segments[0]), segments[1])
+		self.assertIs(line.segmentAbove(segments[2]), None)
+
+	def test__segmentBelow__without_currentX(self):
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		line = self.fill([s1, s2])
+		ComparableSegment.currentX = 3
+		self.assertIs(line.segmentAbove(s1), s2)
+		self.assertIs(line.segmentBelow(s2), s1)
+
+	# segmentsAround, firstAtOrAbove
+
+	def test__segmentsAround(self):
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(3)]
+		line = self.fill(segments)
+		self.assertEqual(line.segmentsAround(1.5, 0), (segments[1], segments[2]))
+		self.assertEqual(line.segmentsAround(1, 0), (segments[0], segments[1]))
+		self.assertEqual(line.segmentsAround(-1, 0), (None, segments[0]))
+		self.assertEqual(line.segmentsAround(5, 0), (segments[2], None))
+
+	def test_firstAtOrAbove(self):
+		line = self.fill([ComparableSegment(0, i, 4, i + 1) for i in range(10)])
+		self.assertEqual(line.firstAtOrAbove(-1, 2), 0)
+		self.assertEqual(line.firstAtOrAbove(3, 2), 3)
+		self.assertEqual(line.firstAtOrAbove(3.5, 2), 3)
+		self.assertEqual(line.firstAtOrAbove(3.6, 2), 4)
+		self.assertEqual(line.firstAtOrAbove(11, 2), 10)
+
+	# betweenY
+
+	def test_betweenY(self):
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(10)]
+		line = self.fill(segments)
+		self.assertEqual(line.betweenY(2.5, 5.5, 2), segments[2:6])
+		self.assertEqual(line.betweenY(20, 30, 2), [])
+
+	# sameLevelAs, belowSegments, aboveSegments
+
+	def test__sameLevelAs(self):
+		s1 = ComparableSegment(0, 0, 2, 2)
+		s2 = ComparableSegment(1, 1, 2, 2)
+		s3 = ComparableSegment(0, 1, 2, 3)
+		line = self.fill([s1, s2])
+		line.addSegment(s3, 1)
+		self.assertEqual(sorted(map(id, line.sameLevelAs(s2))), sorted([id(s1), id(s2)]))
+		self.assertEqual(line.sameLevelAs(s3), [s3])
+		self.assertEqual(line.aboveSegments(s1), [s3])
+		self.assertEqual(sorted(map(id, line.belowSegments(s3))), sorted([id(s1), id(s2)]))
+
+	# order
+
+	def test__order(self):
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(5)]
+		line = self.fill(segments)
+		self.assertEqual(line.order(segments[::-1]), segments)
+		self.assertEqual(line.order([segments[3], segments[1]]),
+						 [segments[1], segments[3]])
+
+	# revertOrder
+
+	def test__revertOrder__3_segments(self):
+		s1 = ComparableSegment(0, 0, 1, 1)
+		s2 = ComparableSegment(0, 0.5, 1, 0.5)
+		s3 = ComparableSegment(0, 1, 1, 0)
+		line = self.fill([s1, s2, s3])
+		line.revertOrder(0.5, [s1, s2, s3])
+		self.assertEqual(list(line), [s3, s2, s1])
+		self.assertIs(line.segmentAbove(s3), s2)
+		self.assertIs(line.segmentBelow(s3), None)
+		self.assertEqual(line.aboveSegments(s1), [])
+		self.assertEqual(line.belowSegments(s1), [s2])
+		self.assertConsistent(line)
+
+	# same behaviour as SweepLine
+
+	def test__random_operations__as_SweepLine(self):
+		rand = Random(0)
+		lines = SweepLine(), SkipListSweepLine()
+		inside = []
+		for step in range(2000):
+			if inside and rand.random() < 0.4:
+				seg = inside.pop(rand.randrange(len(inside)))
+				for line in lines:
+					line.removeSegment(seg)
+			else:
+				seg = ComparableSegment(0, rand.randint(0, 50), 10, rand.randint(0, 50))
+				inside.append(seg)
+				for line in lines:
+					line.addSegment(seg, 5)
+			if inside and step % 10 == 0:
+				seg = rand.choice(inside)
+				y = rand.uniform(-1, 51)
+				self.assertEqual(*[[id(s) for s in line] for line in lines])
+				self.assertIs(*[line.segmentAbove(seg) for line in lines])
+				self.assertIs(*[line.segmentBelow(seg) for line in lines])
+				self.assertEqual(*[line.firstAtOrAbove(y, 5) for line in lines])
+		self.assertConsistent(lines[1])
+
+	# as the sweep line of the Bentley-Ottmann algorithm
+
+	def test__sweep__same_intersections(self):
+		rand = Random(2)
+		for n in range(10):
+			segments = [ComparableSegment(rand.randint(0, 10), rand.randint(0, 20),
+										  rand.randint(11, 20), rand.randint(0, 20))
+						for j in range(30)]
+			self.assertEqual(
+				intersectionsList(segments, engine='sweep',
+								  sweep_line=SkipListSweepLine),
+				intersectionsList(segments, engine='sweep'))
+
+	def test__hasIntersection(self):
+		rand = Random(3)
+		for n in range(20):
+			segments = [ComparableSegment(rand.randint(0, 10), rand.randint(0, 20),
+										  rand.randint(11, 20), rand.randint(0, 20))
+						for j in range(8)]
+			self.assertEqual(hasIntersection(segments, sweep_line=SkipListSweepLine),
+							 hasIntersection(segments))
+		segments = [ComparableSegment(0, 0, 1, 1), ComparableSegment(2, 0, 3, 1)]
+		with mock.patch.object(SkipListSweepLine, 'addSegment', autospec=True,
+							   side_effect=SkipListSweepLine.addSegment) as add:
+			self.assertEqual(hasIntersection(segments, sweep_line=SkipListSweepLine),
+							 None)
+		self.assertEqual(add.call_count, 2)
+
+	def test__sweep__other_engine(self):
+		segments = [ComparableSegment(0, 0, 2, 2), ComparableSegment(0, 2, 2, 0)]
+		self.assertEqual(countIntersections(segments, sweep_line=SkipListSweepLine), 1)
+		with self.assertRaises(ValueError):
+			countIntersections(segments, engine='grid', sweep_line=SkipListSweepLine)
+
+
+if __name__ == '__main__':
+	unittest.main()
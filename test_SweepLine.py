@@ -103,6 +103,22 @@ class TestSweepLine(unittest.TestCase):
 		self.assertEqual(line.aboveSegments(s3), [s1])
 		self.assertEqual(line.belowSegments(s3), [])
 
+	def test__removeSegments__equal(self):
+		line = SweepLine()
+		segments = [ComparableSegment(0, 0, 4, 4) for i in range(10)]
+		other = ComparableSegment(0, 1, 4, 1)
+		for seg in segments + [other]:
+			line.addSegment(seg)
+		line.removeSegments(segments[::2])
+		self.assertEqual([id(s) for s in line],
+						 [id(s) for s in segments[1::2]] + [id(other)])
+
+	def test__removeSegments__absent(self):
+		line = SweepLine()
+		line.addSegment(ComparableSegment(0, 0, 1, 1))
+		with self.assertRaises(ValueError):
+			line.removeSegments([ComparableSegment(0, 0, 1, 1)])
+
 	def test__remove__multiple_equals(self):
 		line = SweepLine()
 		s1 = ComparableSegment(0, 0, 3, 3)
@@ -209,6 +225,83 @@ class TestSweepLine(unittest.TestCase):
 		line.addSegment(s3)
 		self.assertEqual(line.betweenY(1.5, 1.75, 0), [])
 
+	def test_betweenY__many(self):
+		line = SweepLine()
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(100)]
+		for seg in segments:
+			line.addSegment(seg)
+		self.assertEqual(line.betweenY(10, 12.5, 2), segments[10:13])
+		self.assertEqual(line.betweenY(-5, -1, 2), [])
+		self.assertEqual(line.betweenY(99.5, 200, 2), segments[99:])
+
+	# firstAtOrAbove
+
+	def test_firstAtOrAbove(self):
+		line = SweepLine()
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(10)]
+		for seg in segments:
+			line.addSegment(seg)
+		self.assertEqual(line.firstAtOrAbove(-1, 2), 0)
+		self.assertEqual(line.firstAtOrAbove(3, 2), 3)
+		self.assertEqual(line.firstAtOrAbove(3.5, 2), 3)
+		self.assertEqual(line.firstAtOrAbove(3.6, 2), 4)
+		self.assertEqual(line.firstAtOrAbove(11, 2), 10)
+
+	# segmentBelow, segmentAbove
+
+	def test__segmentBelow_segmentAbove(self):
+		line = SweepLine()
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(3)]
+		for seg in segments:
+			line.addSegment(seg)
+		self.assertIs(line.segmentBelow(segments[0]), None)
+		self.assertIs(line.segmentBelow(segments[2]), segments[1])
+		self.assertIs(line.segmentAbove(segments[0]), segments[1])
+		self.assertIs(line.segmentAbove(segments[2]), None)
+
+	def test__segmentBelow__equal_segments(self):
+		line = SweepLine()
+		s1, s2 = ComparableSegment(0, 0, 4, 4), ComparableSegment(0, 0, 4, 4)
+		line.addSegment(s1)
+		line.addSegment(s2)
+		lowest, highest = line.l[0], line.l[1]
+		self.assertIs(line.segmentBelow(lowest), None)
+		self.assertIs(line.segmentBelow(highest), lowest)
+
+	# segmentsAround
+
+	def test__segmentsAround(self):
+		line = SweepLine()
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(3)]
+		for seg in segments:
+			line.addSegment(seg)
+		self.assertEqual(line.segmentsAround(1.5, 0), (segments[1], segments[2]))
+		self.assertEqual(line.segmentsAround(1, 0), (segments[0], segments[1]))
+		self.assertEqual(line.segmentsAround(-1, 0), (None, segments[0]))
+		self.assertEqual(line.segmentsAround(5, 0), (segments[2], None))
+
+	# addSegment at x
+
+	def test__addSegment__at_x(self):
+		line = SweepLine()
+		s1 = ComparableSegment(0, 0, 4, 4)
+		s2 = ComparableSegment(0, 4, 4, 0)
+		line.addSegment(s1)
+		line.addSegment(s2, 3)
+		self.assertEqual(line.order([s2, s1]), [s2, s1])
+		self.assertIs(line.segmentAbove(s2), s1)
+
+	# order
+
+	def test__order(self):
+		line = SweepLine()
+		segments = [ComparableSegment(0, i, 4, i + 1) for i in range(5)]
+		for seg in segments:
+			line.addSegment(seg)
+		self.assertEqual(line.order(segments[::-1]), segments)
+		self.assertEqual(line.order([segments[3], segments[1]]),
+						 [segments[1], segments[3]])
+
 	# revertOrder
 
 	def test__revertOrder_nothing_in_between(self):
@@ -293,6 +386,18 @@ class TestSweepLine(unittest.TestCase):
 		self.assertEqual(line.aboveSegments(s4), [s3])
 		self.assertEqual(line.belowSegments(s4), [])
 
+	def test__revertOrder__rounding_errors(self):
+		# y-coordinates at the crossing differ by rounding errors
+		segments = [ComparableSegment(0, 0.3 - 0.1*g, 1, 0.3 + 0.9*g)
+					for g in (-0.7, 0.3, 1.1)]
+		line = SweepLine()
+		for seg in segments:
+			line.addSegment(seg, 0)
+		self.assertEqual(list(map(id, line)), list(map(id, segments[::-1])))
+		line.revertOrder(0.1, segments)
+		self.assertEqual(list(map(id, line)), list(map(id, segments)))
+		self.assertIs(line.segmentAbove(segments[0]), segments[1])
+
 
 if __name__ == '__main__':
 	unittest.main()
\ No newline at end of file
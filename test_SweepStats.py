@@ -0,0 +1,127 @@
+import unittest
+from ComparableSegment import ComparableSegment
+from IntegerSegment import IntegerSegment
+from SweepStats import SweepStats
+from SegmentArray import SegmentArray
+from BentleyOttmann import intersectionsList, countIntersections, iterIntersections
+
+class SubSegment(ComparableSegment):
+	pass
+
+class TestSweepStats(unittest.TestCase):
+
+	def grid(self, segment_class=ComparableSegment):
+		segments = [segment_class(0, 2*i + 1, 20, 2*i + 1) for i in range(5)]
+		segments += [segment_class(2*i + 1, 0, 2*i + 1, 20) for i in range(5)]
+		segments.append(segment_class(0, 0, 20, 20))
+		return segments
+
+	# intersectionsList
+
+	def test_counters(self):
+		stats = SweepStats()
+		res = intersectionsList(self.grid(), stats=stats)
+		self.assertEqual(stats.intersections, len(res))
+		self.assertEqual(stats.event_kinds['low'], 5)
+		self.assertEqual(stats.event_kinds['high'], 5)
+		self.assertEqual(stats.event_kinds['left'], 6)
+		self.assertGreaterEqual(stats.events, 12)
+		self.assertEqual(stats.peak_sweep_line, 6)
+		self.assertGreater(stats.comparisons, 0)
+		self.assertGreater(stats.intersection_tests, 0)
+		self.assertTrue(0 <= stats.hitRate() <= 1)
+		self.assertTrue(all(t >= 0 for t in stats.times.values()))
+
+	def test_same_result(self):
+		segments = self.grid()
+		self.assertEqual(intersectionsList(segments, 'sweep', SweepStats()),
+						 intersectionsList(segments, 'sweep'))
+
+	def test_methods_restored(self):
+		methods = [(cls, name, cls.__dict__.get(name))
+				   for cls in (ComparableSegment, SubSegment)
+				   for name in ('__lt__', 'isBelow', 'intersectionWith')]
+		stats = SweepStats()
+		intersectionsList(self.grid() + self.grid(SubSegment), stats=stats)
+		for cls, name, method in methods:
+			self.assertIs(cls.__dict__.get(name), method)
+
+	def test_interleaved_runs(self):
+		methods = [(name, ComparableSegment.__dict__.get(name))
+				   for name in ('__lt__', 'isBelow', 'intersectionWith')]
+		alone = SweepStats()
+		intersectionsList(self.grid(), stats=alone)
+		a, b = SweepStats(), SweepStats()
+		ga = iterIntersections(self.grid(), stats=a)
+		gb = iterIntersections(self.grid(), stats=b)
+		next(ga)
+		next(gb)
+		for name, method in methods:
+			self.assertIs(ComparableSegment.__dict__.get(name), method)
+		list(ga)
+		list(gb)
+		intersectionsList(self.grid())
+		for stats in (a, b):
+			self.assertEqual(stats.comparisons, alone.comparisons)
+			self.assertEqual(stats.intersection_tests, alone.intersection_tests)
+
+	def test_reported_segments(self):
+		segments = self.grid()
+		stats = SweepStats()
+		res = intersectionsList(segments, stats=stats)
+		self.assertTrue(all(type(seg) is ComparableSegment and seg in segments
+							for pair, inter in res for seg in pair))
+		array = SegmentArray.fromSegments(segments)
+		self.assertEqual(intersectionsList(array, stats=SweepStats()),
+						 intersectionsList(array))
+
+	def test_subclass_counted_once(self):
+		stats, other = SweepStats(), SweepStats()
+		intersectionsList(self.grid(), stats=stats)
+		intersectionsList(self.grid(SubSegment), stats=other)
+		self.assertGreater(stats.comparisons, 0)
+		self.assertEqual(other.comparisons, stats.comparisons)
+		self.assertEqual(other.intersection_tests, stats.intersection_tests)
+
+	def test_exact_segments(self):
+		stats = SweepStats()
+		res = intersectionsList(self.grid(IntegerSegment), stats=stats)
+		self.assertEqual(stats.intersections, len(res))
+		self.assertGreater(stats.comparisons, 0)
+
+	def test_callback(self):
+		calls = []
+		stats = SweepStats(lambda s: calls.append(s.events), every=3)
+		intersectionsList(self.grid(), stats=stats)
+		self.assertEqual(calls[:-1], list(range(3, stats.events + 1, 3)))
+		self.assertEqual(calls[-1], stats.events)
+
+	def test_other_engine(self):
+		with self.assertRaises(ValueError):
+			intersectionsList(self.grid(), 'grid', SweepStats())
+
+	# countIntersections
+
+	def test_countIntersections(self):
+		stats = SweepStats()
+		count = countIntersections(self.grid(), stats=stats)
+		self.assertEqual(stats.intersections, count)
+
+	# asDict
+
+	def test_asDict(self):
+		stats = SweepStats()
+		intersectionsList(self.grid(), stats=stats)
+		d = stats.asDict()
+		self.assertEqual(d['events'], stats.events)
+		self.assertEqual(d['event_kinds'], stats.event_kinds)
+		self.assertIn('queue', d['times'])
+
+	# hitRate
+
+	def test_hitRate_no_test(self):
+		self.assertEqual(SweepStats().hitRate(), None)
+
+
+if __name__ == '__main__':
+	unittest.main()
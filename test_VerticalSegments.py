@@ -0,0 +1,61 @@
+import unittest
+from ComparableSegment import ComparableSegment
+from VerticalSegments import VerticalSegments
+
+class TestVerticalSegments(unittest.TestCase):
+
+	def setUp(self):
+		self.s1 = ComparableSegment(0, 0, 0, 2)
+		self.s2 = ComparableSegment(0, 1, 0, 3)
+		self.s3 = ComparableSegment(0, 4, 0, 5)
+		self.s4 = ComparableSegment(1, 0, 1, 5)
+		self.verticals = VerticalSegments()
+		for s in (self.s3, self.s1, self.s4, self.s2):
+			self.verticals.add(s)
+
+	# add
+
+	def test_add(self):
+		self.assertEqual(len(self.verticals), 4)
+		self.assertEqual([id(s) for s in self.verticals],
+						 [id(s) for s in (self.s1, self.s2, self.s3, self.s4)])
+
+	# remove
+
+	def test_remove(self):
+		self.verticals.remove(self.s2)
+		self.assertEqual([id(s) for s in self.verticals],
+						 [id(s) for s in (self.s1, self.s3, self.s4)])
+
+	def test_remove_equal_segment(self):
+		s5 = ComparableSegment(0, 0, 0, 2)
+		self.verticals.add(s5)
+		self.verticals.remove(self.s1)
+		self.assertIn(s5, list(self.verticals))
+		self.assertFalse(any(s is self.s1 for s in self.verticals))
+
+	def test_add_equal_segments_in_order(self):
+		equal = [ComparableSegment(0, 0, 0, 2) for i in range(5)]
+		verticals = VerticalSegments()
+		for s in equal:
+			verticals.add(s)
+		self.assertEqual(list(map(id, verticals)), list(map(id, equal)))
+
+	def test_remove_absent(self):
+		with self.assertRaises(ValueError):
+			self.verticals.remove(ComparableSegment(0, 0, 0, 2))
+
+	# overlapping
+
+	def test_overlapping(self):
+		self.assertEqual(list(map(id, self.verticals.overlapping(0, 1.5, 1.5))),
+						 [id(self.s1), id(self.s2)])
+		self.assertEqual(list(map(id, self.verticals.overlapping(0, 2.5, 4))),
+						 [id(self.s2), id(self.s3)])
+		self.assertEqual(list(map(id, self.verticals.overlapping(1, 5, 6))),
+						 [id(self.s4)])
+		self.assertEqual(list(self.verticals.overlapping(2, 0, 5)), [])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,68 @@
+import io
+import os
+import json
+import unittest
+import tempfile
+from SegmentArray import SegmentArray
+from SegmentFile import writeSegments, readIntersections
+from bentleyottmann.__main__ import main
+
+class TestCommandLine(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.TemporaryDirectory()
+		self.text = '0 0 2 2\n0,2,2,0\n# comment\n\n1 1 3 3\n'
+
+	def tearDown(self):
+		self.directory.cleanup()
+
+	def runMain(self, *argv, text=None):
+		stdout, stderr = io.StringIO(), io.StringIO()
+		status = main(list(argv), io.StringIO(text or self.text), stdout, stderr)
+		return status, stdout.getvalue(), stderr.getvalue()
+
+	def test_ndjson(self):
+		status, out, err = self.runMain()
+		self.assertEqual(status, 0)
+		records = sorted((r['i'], r['j'], r['x'], r['y'], r.get('x2'))
+						 for r in map(json.loads, out.splitlines()))
+		self.assertEqual(records, [(0, 1, 1, 1, None), (0, 2, 1, 1, 2),
+								   (1, 2, 1, 1, None)])
+
+	def test_csv(self):
+		status, out, err = self.runMain('-f', 'csv', '-e', 'sweep')
+		lines = out.splitlines()
+		self.assertEqual(lines[0], 'i,j,x,y,x2,y2')
+		self.assertIn('0,2,1.0,1.0,2.0,2.0', lines)
+		self.assertIn('0,1,1.0,1.0,,', lines)
+		self.assertEqual(len(lines), 4)
+
+	def test_count_and_stats(self):
+		status, out, err = self.runMain('--count', '--stats')
+		self.assertEqual(out, '3\n')
+		self.assertIn('3 intersections', err)
+
+	def test_snap(self):
+		status, out, err = self.runMain('--snap', '0.5', text='0 0 2 2.1\n0 2 2 0\n')
+		self.assertEqual(json.loads(out), {'i': 0, 'j': 1, 'x': 1.0, 'y': 1.0})
+
+	def test_segment_file(self):
+		path = os.path.join(self.directory.name, 'segments.bin')
+		writeSegments(path, SegmentArray.fromCoordinates([(0, 0, 2, 2), (0, 2, 2, 0)]))
+		status, out, err = self.runMain(path)
+		self.assertEqual(json.loads(out), {'i': 0, 'j': 1, 'x': 1.0, 'y': 1.0})
+
+	def test_binary_output(self):
+		path = os.path.join(self.directory.name, 'intersections.bin')
+		status, out, err = self.runMain('-f', 'binary', '-o', path)
+		self.assertEqual(status, 0)
+		self.assertEqual(len(readIntersections(path)), 3)
+
+	def test_invalid_input(self):
+		status, out, err = self.runMain(text='0 0 1\n')
+		self.assertEqual(status, 1)
+		self.assertIn('line 1', err)
+
+
+if __name__ == '__main__':
+	unittest.main()